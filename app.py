@@ -13,6 +13,12 @@ def build_parser() -> argparse.ArgumentParser:
     sub = parser.add_subparsers(dest="command", required=True)
 
     # Defer command registration to modular command modules
+    try:
+        from nhl_db.commands.migrate import register as register_migrate
+        register_migrate(sub)
+    except Exception:
+        pass
+
     try:
         from nhl_db.commands.teams import register as register_teams
         register_teams(sub)
@@ -37,19 +43,79 @@ def build_parser() -> argparse.ArgumentParser:
     except Exception:
         pass
 
+    try:
+        from nhl_db.commands.aggregates import register as register_aggregates
+        register_aggregates(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.standings import register as register_standings
+        register_standings(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.heatmaps import register as register_heatmaps
+        register_heatmaps(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.export import register as register_export
+        register_export(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.freshness import register as register_freshness
+        register_freshness(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.run import register as register_run
+        register_run(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.snapshots import register as register_snapshots
+        register_snapshots(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.proxy import register as register_proxy
+        register_proxy(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.spool import register as register_spool
+        register_spool(sub)
+    except Exception:
+        pass
+
+    try:
+        from nhl_db.commands.benchmark import register as register_benchmark
+        register_benchmark(sub)
+    except Exception:
+        pass
+
     return parser
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     # Initialize logging before any operations
     setup_logging()
-    logger.info("NHL Companion application started")
+    logger.debug("NHL Companion application started")
     
     try:
         parser = build_parser()
         args = parser.parse_args(argv)
         args.func(args)
-        logger.info("NHL Companion application completed successfully")
+        logger.debug("NHL Companion application completed successfully")
         return 0
     except Exception as e:
         logger.error(f"Application error: {e}", exc_info=True)
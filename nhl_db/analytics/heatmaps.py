@@ -0,0 +1,115 @@
+from typing import Dict, List, Sequence, Tuple
+
+import zlib
+
+import numpy as np
+
+# NHL rink coordinates: x in [-100, 100] ft (goal lines near +/-89), y in [-42.5, 42.5] ft
+CELL_FEET = 2.0
+X_MIN, X_MAX = -100.0, 100.0
+Y_MIN, Y_MAX = -43.0, 43.0
+X_BINS = int((X_MAX - X_MIN) / CELL_FEET)
+Y_BINS = int((Y_MAX - Y_MIN) / CELL_FEET)
+GRID_SHAPE = (X_BINS, Y_BINS)
+GRID_SHAPE_LABEL = f"{X_BINS}x{Y_BINS}"
+CELLS = X_BINS * Y_BINS
+
+SCOPE_TEAM = "team"
+SCOPE_PLAYER = "player"
+
+# Key for one stored grid: (scopeType, scopeId, playType)
+GridKey = Tuple[str, int, str]
+
+
+def attack_directions(game_ids: np.ndarray, periods: np.ndarray, team_ids: np.ndarray, xs: np.ndarray, zones: np.ndarray) -> np.ndarray:
+    """
+    +1/-1 per event: the side of the rink (sign of x) the event team attacks in that period.
+
+    Teams switch ends every period and the API reports raw rink coordinates, so
+    the direction is voted per (game, period, team): an offensive-zone event
+    votes sign(x), a defensive-zone event votes -sign(x). Ties default to +1.
+    """
+    if len(xs) == 0:
+        return np.ones(0, dtype=np.int8)
+    keys = game_ids.astype(np.int64) * 100000 + periods.astype(np.int64) * 1000 + team_ids.astype(np.int64)
+    _, inverse = np.unique(keys, return_inverse=True)
+    signs = np.sign(xs).astype(np.int64)
+    votes = np.where(zones == "O", signs, np.where(zones == "D", -signs, 0))
+    totals = np.bincount(inverse, weights=votes)
+    directions = np.where(totals < 0, -1, 1).astype(np.int8)
+    return directions[inverse]
+
+
+def normalize_coordinates(xs: np.ndarray, ys: np.ndarray, directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Rotate events 180 degrees where needed so every team attacks toward +x."""
+    d = directions.astype(np.float64)
+    return xs * d, ys * d
+
+
+def cell_indices(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Flat grid cell per (x, y); out-of-range coordinates clamp to the border cells."""
+    ix = np.clip(((xs - X_MIN) // CELL_FEET).astype(np.int64), 0, X_BINS - 1)
+    iy = np.clip(((ys - Y_MIN) // CELL_FEET).astype(np.int64), 0, Y_BINS - 1)
+    return ix * Y_BINS + iy
+
+
+def bin_by_group(group_index: np.ndarray, cells: np.ndarray, n_groups: int) -> np.ndarray:
+    """One count grid per group in a single bincount: shape (n_groups, X_BINS, Y_BINS)."""
+    flat = np.bincount(group_index * CELLS + cells, minlength=n_groups * CELLS)
+    return flat.reshape(n_groups, X_BINS, Y_BINS)
+
+
+def bin_plays(rows: Sequence[Tuple]) -> Dict[GridKey, np.ndarray]:
+    """
+    Bin play rows into per-team and per-player grids keyed by playType.
+
+    Rows are (gameId, period, teamId, primaryPlayerId, playType, zone, x, y) with
+    -1 for a missing team/player and '' for a missing zone.
+    """
+    if not rows:
+        return {}
+    game_ids, periods, team_ids, player_ids, ptypes, zones, xs, ys = (np.asarray(col) for col in zip(*rows))
+    xs = xs.astype(np.float64)
+    ys = ys.astype(np.float64)
+    team_ids = team_ids.astype(np.int64)
+    player_ids = player_ids.astype(np.int64)
+    zones = zones.astype(str)
+
+    directions = attack_directions(game_ids, periods, team_ids, xs, zones)
+    nx, ny = normalize_coordinates(xs, ys, directions)
+    cells = cell_indices(nx, ny)
+    type_labels, type_codes = np.unique(ptypes.astype(str), return_inverse=True)
+
+    out: Dict[GridKey, np.ndarray] = {}
+    for scope_type, scope_ids in ((SCOPE_TEAM, team_ids), (SCOPE_PLAYER, player_ids)):
+        mask = scope_ids >= 0
+        if not mask.any():
+            continue
+        keys = type_codes[mask].astype(np.int64) * 100000000 + scope_ids[mask]
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        grids = bin_by_group(inverse, cells[mask], len(uniq))
+        for i, key in enumerate(uniq):
+            out[(scope_type, int(key % 100000000), str(type_labels[key // 100000000]))] = grids[i]
+    return out
+
+
+def encode_grid(grid: np.ndarray) -> bytes:
+    return zlib.compress(np.ascontiguousarray(grid, dtype="<u4").tobytes(), 6)
+
+
+def decode_grid(blob: bytes, shape: Tuple[int, int] = GRID_SHAPE) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype="<u4").reshape(shape).astype(np.int64)
+
+
+def parse_shape(label: str) -> Tuple[int, int]:
+    x, y = label.lower().split("x")
+    return int(x), int(y)
+
+
+def merge_grids(existing: Dict[GridKey, np.ndarray], delta: Dict[GridKey, np.ndarray]) -> List[Tuple[GridKey, np.ndarray]]:
+    """Add `delta` onto `existing` for every key in `delta`."""
+    merged: List[Tuple[GridKey, np.ndarray]] = []
+    for key, grid in delta.items():
+        base = existing.get(key)
+        merged.append((key, grid if base is None else base + grid))
+    return merged
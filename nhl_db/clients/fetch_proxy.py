@@ -0,0 +1,201 @@
+from typing import Any, Dict, Optional, Tuple
+
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+import time
+
+import requests
+
+from .nhl_client import NhlClient, response_content_time
+from ..config import (
+    FETCH_PROXY_LIVE_TTL_SECONDS,
+    FETCH_PROXY_MAX_ENTRIES,
+    FETCH_PROXY_TTL_SECONDS,
+    NHL_WEB_UPSTREAM,
+    RECORDS_UPSTREAM,
+)
+
+logger = logging.getLogger(__name__)
+
+# Local path prefix -> upstream base URL
+UPSTREAMS: Dict[str, str] = {
+    "/web/": NHL_WEB_UPSTREAM + "/",
+    "/records/": RECORDS_UPSTREAM + "/",
+}
+
+# Paths whose bodies change every few seconds during games
+LIVE_PATH_MARKERS = ("/gamecenter/",)
+
+# How long a follower waits for the leader's upstream fetch before giving up
+FLIGHT_TIMEOUT_SECONDS = 60.0
+
+
+class ProxyResponse:
+    """One upstream response as served to local clients."""
+
+    def __init__(self, status: int, content_type: str, body: bytes, content_time: float) -> None:
+        self.status = status
+        self.content_type = content_type
+        self.body = body
+        self.content_time = content_time
+        self.stored_at = time.monotonic()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[ProxyResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+class FetchProxy:
+    """
+    Short-TTL cache in front of the NHL APIs with request coalescing (singleflight).
+
+    Concurrent requests for the same path share one upstream fetch: the first
+    caller fetches, the others wait for its result. Successful bodies are then
+    served from memory for `live_ttl_seconds` (gamecenter paths) or
+    `ttl_seconds` (everything else), so upstream traffic per path stays at
+    most one request per TTL however many local processes poll it. Upstream
+    calls go through an `NhlClient` session, so the usual rate limits,
+    retries and circuit breaker apply once, here.
+    """
+
+    def __init__(
+        self,
+        client: Optional[NhlClient] = None,
+        live_ttl_seconds: float = FETCH_PROXY_LIVE_TTL_SECONDS,
+        ttl_seconds: float = FETCH_PROXY_TTL_SECONDS,
+        max_entries: int = FETCH_PROXY_MAX_ENTRIES,
+    ) -> None:
+        self.client = client or NhlClient(bases=(NHL_WEB_UPSTREAM, RECORDS_UPSTREAM))
+        self.live_ttl_seconds = live_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "coalesced": 0, "upstream": 0, "errors": 0}
+        self._entries: "OrderedDict[str, ProxyResponse]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, path: str) -> float:
+        return self.live_ttl_seconds if any(m in path for m in LIVE_PATH_MARKERS) else self.ttl_seconds
+
+    @staticmethod
+    def upstream_url(path: str) -> Optional[str]:
+        for prefix, base in UPSTREAMS.items():
+            if path.startswith(prefix):
+                return base + path[len(prefix):]
+        return None
+
+    def get(self, path: str) -> Tuple[ProxyResponse, str]:
+        """The response for `path` and how it was served: HIT, MISS (fetched) or COALESCED."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry.stored_at < self.ttl_for(path):
+                self._entries.move_to_end(path)
+                self.counters["hits"] += 1
+                return entry, "HIT"
+            flight = self._flights.get(path)
+            leader = flight is None
+            if leader:
+                flight = self._flights[path] = _Flight()
+                self.counters["misses"] += 1
+            else:
+                self.counters["coalesced"] += 1
+
+        if not leader:
+            if not flight.done.wait(FLIGHT_TIMEOUT_SECONDS):
+                raise TimeoutError(f"Timed out waiting for the in-flight fetch of {path}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.response, "COALESCED"  # type: ignore[return-value]
+
+        try:
+            flight.response = self._fetch(path)
+            return flight.response, "MISS"
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[path]
+                if flight.response is not None and flight.response.status == 200:
+                    self._entries[path] = flight.response
+                    self._entries.move_to_end(path)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+
+    def _fetch(self, path: str) -> ProxyResponse:
+        url = self.upstream_url(path)
+        if url is None:
+            return ProxyResponse(404, "application/json", b'{"error": "unknown upstream"}', time.time())
+        with self._lock:
+            self.counters["upstream"] += 1
+        try:
+            resp = self.client.session.get(url, timeout=30)
+        except requests.exceptions.RequestException as e:
+            with self._lock:
+                self.counters["errors"] += 1
+            logger.error(f"Proxy upstream fetch failed for {url}: {e}", extra={"endpoint": url, "stage": "proxy"})
+            raise
+        if resp.status_code != 200:
+            with self._lock:
+                self.counters["errors"] += 1
+        return ProxyResponse(
+            resp.status_code,
+            resp.headers.get("Content-Type", "application/json"),
+            resp.content,
+            response_content_time(resp),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self.counters)
+            out["entries"] = len(self._entries)
+            out["in_flight"] = len(self._flights)
+        served = out["hits"] + out["misses"] + out["coalesced"]
+        out["upstream_ratio"] = round(out["upstream"] / served, 3) if served else None
+        out["http"] = self.client.stats()
+        return out
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    proxy: FetchProxy  # set on the subclass built by make_server
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/_stats":
+            self._send(200, "application/json", json.dumps(self.proxy.stats(), default=str).encode("utf-8"), {})
+            return
+        try:
+            resp, how = self.proxy.get(self.path)
+        except Exception as e:
+            self._send(502, "application/json", json.dumps({"error": str(e)}).encode("utf-8"), {"X-Cache": "ERROR"})
+            return
+        # Age lets clients date the content (see NhlClient.last_content_time) as if they fetched upstream
+        age = max(0, int(time.time() - resp.content_time))
+        self._send(resp.status, resp.content_type, resp.body, {"Age": str(age), "X-Cache": how})
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def make_server(host: str, port: int, proxy: Optional[FetchProxy] = None) -> ThreadingHTTPServer:
+    handler = type("ProxyHandler", (_ProxyHandler,), {"proxy": proxy or FetchProxy()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
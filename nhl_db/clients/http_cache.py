@@ -0,0 +1,83 @@
+from typing import Any, Optional
+
+from pathlib import Path
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Persistent cache of decoded API payloads, stored zlib-compressed in one SQLite file.
+
+    Entries are keyed by request (endpoint name plus arguments) and expire by the
+    TTL the caller passes to `get`, so each endpoint keeps its own freshness. When
+    the stored size exceeds `max_bytes`, least recently used entries are evicted.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(0, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "cacheKey TEXT PRIMARY KEY, endpoint TEXT NOT NULL, storedAt REAL NOT NULL, "
+            "accessedAt REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessedAt)")
+
+    def get(self, key: str, ttl_seconds: float) -> Optional[Any]:
+        """The cached value if stored less than `ttl_seconds` ago, else None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT storedAt, body FROM entries WHERE cacheKey = ?", (key,)).fetchone()
+            if row is None or now - row[0] > ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessedAt = ? WHERE cacheKey = ?", (now, key))
+            self.hits += 1
+        return json.loads(zlib.decompress(row[1]))
+
+    def set(self, key: str, endpoint: str, value: Any) -> None:
+        body = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (cacheKey, endpoint, storedAt, accessedAt, size, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, now, now, len(body), body),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT cacheKey, size FROM entries ORDER BY accessedAt").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE cacheKey = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,235 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import logging
+import threading
+import time
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from . import nhl_web_client, records_client
+from .http_cache import DiskCache
+from .throttle import ResilientAdapter, get_http_stats
+from ..config import (
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_PATH,
+    HTTP_CACHE_TTLS,
+    HTTP_IDLE_RECYCLE_SECONDS,
+    HTTP_POOL_SIZES,
+    NHL_WEB_BASE,
+    RECORDS_BASE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PooledAdapter(ResilientAdapter):
+    """
+    ResilientAdapter for a single host that drops its keep-alive pool after a quiet period.
+
+    Upstream load balancers silently close idle keep-alive connections; reusing one
+    of those costs a failed request and a retry. Clearing only this host's pool
+    before the first request after `idle_recycle_seconds` avoids that without
+    throwing away the whole session.
+    """
+
+    def __init__(self, idle_recycle_seconds: float, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.idle_recycle_seconds = idle_recycle_seconds
+        self.recycles = 0
+        self._last_used = time.monotonic()
+        self._recycle_lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        with self._recycle_lock:
+            now = time.monotonic()
+            if self.idle_recycle_seconds > 0 and now - self._last_used > self.idle_recycle_seconds:
+                self.poolmanager.clear()
+                self.recycles += 1
+            self._last_used = now
+        return super().send(request, **kwargs)
+
+
+def response_content_time(resp: requests.Response, received_at: Optional[float] = None) -> float:
+    received_at = time.time() if received_at is None else received_at
+    try:
+        age = max(0.0, float(resp.headers.get("Age") or 0))
+    except ValueError:
+        age = 0.0
+    return received_at - age
+
+
+class NhlClient:
+    """
+    Long-lived client for the NHL Web and Records APIs.
+
+    Wraps the `nhl_web_client` / `records_client` fetch functions around one
+    shared session: a tuned keep-alive pool per host, compressed responses
+    (gzip, plus brotli when a decoder is installed) and idle-pool recycling.
+    Slow-changing reference payloads (franchises, Records players by team, web
+    rosters) go through an optional persistent `DiskCache` with per-endpoint TTLs.
+    Safe to share between threads; services should use `get_client()`.
+    """
+
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        idle_recycle_seconds: float = HTTP_IDLE_RECYCLE_SECONDS,
+        cache: Optional[DiskCache] = None,
+        bases: Sequence[str] = (NHL_WEB_BASE, RECORDS_BASE),
+    ) -> None:
+        self.cache = cache
+        self.refresh_cache = False
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        self.session.hooks["response"].append(self._remember_response)
+        self._local = threading.local()
+        self._adapters: Dict[str, PooledAdapter] = {}
+        sizes = pool_sizes or HTTP_POOL_SIZES
+        for base in bases:
+            parsed = urlparse(base)
+            host = parsed.hostname or ""
+            if host in self._adapters:
+                # Both APIs behind the same fetch proxy share one pool
+                continue
+            size = int(sizes.get(host, 4))
+            adapter = PooledAdapter(
+                idle_recycle_seconds,
+                pool_connections=1,
+                pool_maxsize=size,
+                pool_block=True,  # cap concurrent sockets per host instead of opening throwaway ones
+            )
+            self.session.mount(f"{parsed.scheme}://{parsed.netloc}", adapter)
+            self._adapters[host] = adapter
+        # Anything else (e.g. a local proxy) still gets limits and retries
+        fallback = ResilientAdapter()
+        self.session.mount("http://", fallback)
+        self.session.mount("https://", fallback)
+
+    def _cached(self, endpoint: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """Serve `endpoint` from the disk cache while fresh; otherwise fetch and store (also when refreshing)."""
+        if self.cache is None:
+            return fetch()
+        cache_key = f"{endpoint}:{key}"
+        if not self.refresh_cache:
+            try:
+                hit = self.cache.get(cache_key, HTTP_CACHE_TTLS.get(endpoint, 0))
+            except Exception as e:
+                logger.error(f"HTTP cache read failed for {cache_key}: {e}")
+                hit = None
+            if hit is not None:
+                return hit
+        value = fetch()
+        try:
+            self.cache.set(cache_key, endpoint, value)
+        except Exception as e:
+            logger.error(f"HTTP cache write failed for {cache_key}: {e}")
+        return value
+
+    @contextmanager
+    def refreshing_cache(self, refresh: bool = True) -> Iterator[None]:
+        """Bypass cached reads (responses are still stored) for the duration of the block."""
+        previous = self.refresh_cache
+        self.refresh_cache = refresh or previous
+        try:
+            yield
+        finally:
+            self.refresh_cache = previous
+
+    # NHL Web API
+    def fetch_web_roster(self, tricode: str, season: str) -> List[Dict[str, Any]]:
+        return self._cached(
+            "web_roster",
+            f"{(tricode or '').lower()}/{season}",
+            lambda: nhl_web_client.fetch_web_roster(tricode, season, session=self.session),
+        )
+
+    def fetch_roster(self, tricode: str, season: str, team_id: int) -> List[Dict[str, Any]]:
+        return nhl_web_client.merge_records_players(self.fetch_web_roster(tricode, season), self.fetch_players_by_team(team_id))
+
+    def fetch_schedule_for_date(self, date_str: str) -> List[Dict[str, Any]]:
+        return nhl_web_client.fetch_schedule_for_date(date_str, session=self.session)
+
+    def fetch_club_schedule_season(self, tricode: str, season: str) -> List[Dict[str, Any]]:
+        return nhl_web_client.fetch_club_schedule_season(tricode, season, session=self.session)
+
+    def fetch_player_landing(self, player_id: int) -> Dict[str, Any]:
+        return nhl_web_client.fetch_player_landing(player_id, session=self.session)
+
+    def fetch_game_landing(self, game_id: int) -> Dict[str, Any]:
+        return nhl_web_client.fetch_game_landing(game_id, session=self.session)
+
+    def fetch_game_boxscore(self, game_id: int) -> Dict[str, Any]:
+        return nhl_web_client.fetch_game_boxscore(game_id, session=self.session)
+
+    def fetch_game_pbp(self, game_id: int) -> Dict[str, Any]:
+        return nhl_web_client.fetch_game_pbp(game_id, session=self.session)
+
+    # Records API
+    def fetch_franchises(self) -> List[Dict[str, Any]]:
+        return self._cached("franchises", "all", lambda: records_client.fetch_franchises(session=self.session))
+
+    def fetch_players_by_team(self, team_id: int) -> List[Dict[str, Any]]:
+        return self._cached(
+            "players_by_team",
+            str(int(team_id)),
+            lambda: records_client.fetch_players_by_team(team_id, session=self.session),
+        )
+
+    def _remember_response(self, resp: requests.Response, *args: Any, **kwargs: Any) -> None:
+        self._local.content_time = response_content_time(resp)
+
+    def last_content_time(self) -> float:
+        """
+        Wall-clock time the content of this thread's last response was generated upstream.
+
+        Used to date when the API exposed an event: a CDN-cached response is
+        `Age` seconds older than its receipt.
+        """
+        return getattr(self._local, "content_time", time.time())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host rate/throttle/breaker numbers plus pool recycle counts, and disk cache counters under "cache"."""
+        out = get_http_stats()
+        for host, adapter in self._adapters.items():
+            out.setdefault(host, {})["pool_maxsize"] = adapter._pool_maxsize
+            out[host]["idle_recycles"] = adapter.recycles
+        if self.cache is not None:
+            out["cache"] = self.cache.stats()
+        return out
+
+    def close(self) -> None:
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_CLIENT: Optional[NhlClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> NhlClient:
+    """Process-wide shared client, created on first use."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = NhlClient(cache=_open_default_cache())
+        return _CLIENT
+
+
+def _open_default_cache() -> Optional[DiskCache]:
+    if not HTTP_CACHE_ENABLED:
+        return None
+    try:
+        return DiskCache(HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES)
+    except Exception as e:
+        # The cache is an optimization only; run uncached if the file can't be opened
+        logger.error(f"HTTP cache disabled, cannot open {HTTP_CACHE_PATH}: {e}")
+        return None
@@ -2,9 +2,8 @@ from typing import Any, Dict, List, Optional
 
 import logging
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from .records_client import fetch_players_by_team
+from .throttle import ResilientAdapter
 
 from ..config import NHL_WEB_BASE
 
@@ -13,27 +12,20 @@ logger = logging.getLogger(__name__)
 
 def get_configured_session() -> requests.Session:
     """
-    Create a requests.Session with retry logic and connection pooling configured.
+    Create a requests.Session with rate limiting, retries and a circuit breaker.
     
-    This handles connection resets, timeouts, and transient server errors
-    that occur during extended application runtime.
+    All sessions share per-host state (see `throttle.ResilientAdapter`), so
+    parallel syncs and the live watcher stay within one request budget per
+    upstream host, honor Retry-After together and shed non-critical calls
+    first when an upstream degrades.
     
     Returns:
         A configured requests.Session with automatic retry capability.
     """
     session = requests.Session()
     
-    # Configure retry strategy
-    retry_strategy = Retry(
-        total=3,  # Total number of retries
-        backoff_factor=0.5,  # Exponential backoff: 0.5s, 1s, 2s
-        status_forcelist=[500, 502, 503, 504],  # Retry on server errors
-        allowed_methods=["GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS"],
-        raise_on_status=False  # Don't raise on status, let status_forcelist handle it
-    )
-    
-    # Create adapter with retry strategy
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    # Retries (jittered, Retry-After aware) are handled by the adapter, not urllib3
+    adapter = ResilientAdapter(max_attempts=4, backoff_factor=0.5)
     
     # Mount adapter for both http and https
     session.mount("http://", adapter)
@@ -42,22 +34,30 @@ def get_configured_session() -> requests.Session:
     return session
 
 
-def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
+def fetch_web_roster(tricode: str, season: str, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
     session = session or get_configured_session()
     tri = (tricode or "").lower()
-    # NHL Web roster (primary source)
     url = f"{NHL_WEB_BASE}/roster/{tri}/{season}"
     try:
         resp = session.get(url, timeout=30)
         resp.raise_for_status()
         data = resp.json() or {}
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching roster for {tricode} (team_id={team_id}), URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching roster for {tricode} season={season}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch"})
         raise
     web_players: List[Dict[str, Any]] = []
     for group in ("forwards", "defensemen", "goalies"):
         web_players.extend(data.get(group, []) or [])
+    return web_players
 
+
+def merge_records_players(web_players: List[Dict[str, Any]], records_players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge Records API players into an NHL Web roster, deduped by player id.
+
+    NHL Web entries are kept as-is; Records entries only fill players missing
+    from the web roster and are mapped to the NHL Web roster shape.
+    """
     # Build a set of player IDs present in NHL Web roster for dedupe
     web_ids = set()
     for p in web_players:
@@ -66,8 +66,6 @@ def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requ
         except Exception:
             continue
 
-    # Records API players (secondary source, fill only missing players)
-    records_players = fetch_players_by_team(team_id, session=session)
     merged: List[Dict[str, Any]] = list(web_players)
     for rp in records_players:
         try:
@@ -100,12 +98,22 @@ def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requ
             "playerTeamId": current_team_id,
         }
         merged.append(mapped)
+        web_ids.add(rid)
 
     return merged
 
 
+def fetch_roster(tricode: str, season: str, team_id: int, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
+    session = session or get_configured_session()
+    # NHL Web roster (primary source)
+    web_players = fetch_web_roster(tricode, season, session=session)
+    # Records API players (secondary source, fill only missing players)
+    records_players = fetch_players_by_team(team_id, session=session)
+    return merge_records_players(web_players, records_players)
+
+
 def fetch_schedule_for_date(date_str: str, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
-    print(f"Fetching schedule for date: {date_str}...")
+    logger.debug(f"Fetching schedule for date: {date_str}...")
     session = session or get_configured_session()
     url = f"{NHL_WEB_BASE}/schedule/{date_str}"
     try:
@@ -113,7 +121,7 @@ def fetch_schedule_for_date(date_str: str, session: Optional[requests.Session] =
         resp.raise_for_status()
         data = resp.json() or {}
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching schedule for date {date_str}, URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching schedule for date {date_str}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch"})
         raise
     games: List[Dict[str, Any]] = []
     for day in data.get("gameWeek", []) or []:
@@ -122,6 +130,33 @@ def fetch_schedule_for_date(date_str: str, session: Optional[requests.Session] =
     return games
 
 
+def fetch_club_schedule_season(tricode: str, season: str, session: Optional[requests.Session] = None) -> List[Dict[str, Any]]:
+    """Every game (preseason, regular season, playoffs) of one club's season, in schedule-game shape."""
+    session = session or get_configured_session()
+    tri = (tricode or "").lower()
+    url = f"{NHL_WEB_BASE}/club-schedule-season/{tri}/{season}"
+    try:
+        resp = session.get(url, timeout=30)
+        resp.raise_for_status()
+        data = resp.json() or {}
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching club schedule for {tricode} season={season}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch"})
+        raise
+    return list(data.get("games", []) or [])
+
+
+def fetch_player_landing(player_id: int, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+    session = session or get_configured_session()
+    url = f"{NHL_WEB_BASE}/player/{player_id}/landing"
+    try:
+        resp = session.get(url, timeout=30)
+        resp.raise_for_status()
+        return resp.json() or {}
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching player landing for player_id={player_id}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch"})
+        raise
+
+
 def fetch_game_landing(game_id: int, session: Optional[requests.Session] = None) -> Dict[str, Any]:
     session = session or get_configured_session()
     url = f"{NHL_WEB_BASE}/gamecenter/{game_id}/landing"
@@ -130,7 +165,7 @@ def fetch_game_landing(game_id: int, session: Optional[requests.Session] = None)
         resp.raise_for_status()
         return resp.json() or {}
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching game landing for game_id={game_id}, URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching game landing for game_id={game_id}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch", "game_id": game_id})
         raise
 
 
@@ -142,7 +177,7 @@ def fetch_game_boxscore(game_id: int, session: Optional[requests.Session] = None
         resp.raise_for_status()
         return resp.json() or {}
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching game boxscore for game_id={game_id}, URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching game boxscore for game_id={game_id}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch", "game_id": game_id})
         raise
 
 
@@ -154,7 +189,7 @@ def fetch_game_pbp(game_id: int, session: Optional[requests.Session] = None) ->
         resp.raise_for_status()
         return resp.json() or {}
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching game play-by-play for game_id={game_id}, URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching game play-by-play for game_id={game_id}, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch", "game_id": game_id})
         raise
 
 
@@ -33,7 +33,7 @@ def fetch_franchises(session: Optional[requests.Session] = None) -> List[Dict[st
         data = resp.json() or {}
         return data.get("data", [])
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching franchises from Records API, URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching franchises from Records API, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch"})
         raise
 
 
@@ -47,6 +47,6 @@ def fetch_players_by_team(team_id: int, session: Optional[requests.Session] = No
         data = resp.json() or {}
         return data.get("data", [])
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching players for team_id={team_id} from Records API, URL={url}: {e}", exc_info=True)
+        logger.error(f"Error fetching players for team_id={team_id} from Records API, URL={url}: {e}", exc_info=True, extra={"endpoint": url, "stage": "fetch"})
         raise
 
@@ -0,0 +1,308 @@
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import HTTP_RATE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: throttling plus transient server errors
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Paths that keep the live experience working; everything else (schedule refresh,
+# rosters, Records reference data) is shed first when an upstream degrades
+CRITICAL_PATH_MARKERS = ("/gamecenter/",)
+
+DEFAULT_RATE = (5.0, 10.0)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling an upstream whose circuit breaker is shedding this request."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked.
+
+    `pause_until` blocks every caller until a deadline, which is how a server's
+    Retry-After is applied to all requests for a host instead of one retry loop.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = max(0.01, float(rate))
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping as needed. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                else:
+                    delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause_until(self, deadline: float) -> None:
+        with self._lock:
+            if deadline > self._paused_until:
+                self._paused_until = deadline
+                self._tokens = 0.0
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker with a degraded stage between closed and open.
+
+    - closed: every call goes through
+    - degraded: failure ratio over the last `window_seconds` is high; non-critical calls are shed
+    - open: consecutive failures tripped it; every call is shed until the cooldown ends
+    - half_open: after the cooldown one probe at a time decides closed vs open
+    """
+
+    def __init__(self, window_seconds: float = 60.0, min_samples: int = 8, degrade_ratio: float = 0.25, open_after: int = 5, cooldown_seconds: float = 30.0) -> None:
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.degrade_ratio = degrade_ratio
+        self.open_after = open_after
+        self.cooldown_seconds = cooldown_seconds
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked(time.monotonic())
+
+    def _failure_ratio(self, now: float) -> float:
+        # Outcomes age out, so a shed (and therefore silent) class of calls recovers on its own
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+        if len(self._outcomes) < self.min_samples:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def _state_locked(self, now: float) -> str:
+        if self._opened_at is not None:
+            return "open" if now - self._opened_at < self.cooldown_seconds else "half_open"
+        if self._failure_ratio(now) >= self.degrade_ratio:
+            return "degraded"
+        return "closed"
+
+    def allow(self, critical: bool) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            state = self._state_locked(now)
+            if state == "closed":
+                return True
+            if state == "degraded":
+                return critical
+            if state == "half_open":
+                # One probe at a time; a probe that never reported back expires after a cooldown
+                if self._probe_started is None or now - self._probe_started >= self.cooldown_seconds:
+                    self._probe_started = now
+                    return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._outcomes.append((time.monotonic(), True))
+            self._consecutive_failures = 0
+            if self._opened_at is not None:
+                self._opened_at = None
+                self._probe_started = None
+                self._outcomes.clear()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._outcomes.append((now, False))
+            self._consecutive_failures += 1
+            if self._opened_at is not None:
+                # Failed half-open probe: start another cooldown
+                if self._state_locked(now) == "half_open":
+                    self._opened_at = now
+                self._probe_started = None
+            elif self._consecutive_failures >= self.open_after:
+                self._opened_at = now
+                logger.error(f"Circuit opened after {self._consecutive_failures} consecutive upstream failures")
+
+
+class HostState:
+    """Limiter, breaker and counters shared by every session talking to one host."""
+
+    def __init__(self, host: str, rate: float, capacity: float) -> None:
+        self.host = host
+        self.limiter = TokenBucket(rate, capacity)
+        self.breaker = CircuitBreaker()
+        self.requests_total = 0
+        self.retries = 0
+        self.throttle_events = 0
+        self.shed_calls = 0
+        self._recent: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def note_request(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.requests_total += 1
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > 60.0:
+                self._recent.popleft()
+
+    def count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 60.0:
+                self._recent.popleft()
+            recent = len(self._recent)
+            return {
+                "rate_per_sec": round(recent / 60.0, 3),
+                "rate_limit_per_sec": self.limiter.rate,
+                "requests_total": self.requests_total,
+                "retries": self.retries,
+                "throttle_events": self.throttle_events,
+                "shed_calls": self.shed_calls,
+                "breaker_state": self.breaker.state,
+            }
+
+
+_HOSTS: Dict[str, HostState] = {}
+_HOSTS_LOCK = threading.Lock()
+
+
+def get_host_state(host: str) -> HostState:
+    with _HOSTS_LOCK:
+        state = _HOSTS.get(host)
+        if state is None:
+            rate, capacity = HTTP_RATE_LIMITS.get(host, DEFAULT_RATE)
+            state = HostState(host, rate, capacity)
+            _HOSTS[host] = state
+        return state
+
+
+def get_http_stats() -> Dict[str, Dict[str, Any]]:
+    """Current request rate, throttle events and breaker state per upstream host."""
+    with _HOSTS_LOCK:
+        states = list(_HOSTS.values())
+    return {s.host: s.snapshot() for s in states}
+
+
+def format_http_stats() -> str:
+    parts = []
+    for host, st in sorted(get_http_stats().items()):
+        parts.append(
+            f"{host}: {st['rate_per_sec']}/s (limit {st['rate_limit_per_sec']}/s), "
+            f"throttled={st['throttle_events']}, retries={st['retries']}, shed={st['shed_calls']}, breaker={st['breaker_state']}"
+        )
+    return "; ".join(parts) or "no requests yet"
+
+
+def is_critical(url: str) -> bool:
+    return any(marker in url for marker in CRITICAL_PATH_MARKERS)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds from now; accepts delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that rate limits, retries and sheds load per upstream host.
+
+    Every attempt (including retries) takes a token from the host's bucket.
+    Retries use full-jitter exponential backoff so concurrent callers don't
+    retry in lockstep, and a 429/503 Retry-After pauses the whole host.
+    """
+
+    def __init__(self, max_attempts: int = 4, backoff_factor: float = 0.5, max_backoff: float = 30.0, **kwargs: Any) -> None:
+        kwargs.setdefault("max_retries", 0)
+        super().__init__(**kwargs)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        url = request.url or ""
+        host = urlparse(url).hostname or ""
+        state = get_host_state(host)
+        critical = is_critical(url)
+        attempt = 0
+        while True:
+            if not state.breaker.allow(critical):
+                state.count("shed_calls")
+                raise CircuitOpenError(f"Circuit {state.breaker.state} for {host}; shedding request to {url}", request=request)
+            state.limiter.acquire()
+            state.note_request()
+            try:
+                resp = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                state.breaker.record_failure()
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                delay = self._backoff(attempt)
+                # Attempt/delay stay out of the message so identical repeats collapse in the log rate limiter
+                logger.warning(f"Transient error calling {url}, retrying: {e}", extra={"endpoint": url, "stage": "retry"})
+            else:
+                if resp.status_code not in RETRY_STATUSES:
+                    state.breaker.record_success()
+                    return resp
+                state.breaker.record_failure()
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if resp.status_code == 429:
+                    state.count("throttle_events")
+                if retry_after is not None:
+                    # Jitter the host-wide pause so separate processes don't resume together
+                    state.limiter.pause_until(time.monotonic() + retry_after + random.uniform(0, 1.0))
+                if attempt + 1 >= self.max_attempts:
+                    return resp
+                delay = max(retry_after or 0.0, self._backoff(attempt))
+                resp.close()
+            state.count("retries")
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,14 @@
+import argparse
+
+from ..services.aggregates_service import rebuild_aggregates
+
+
+def _cmd_rebuild_aggregates(args: argparse.Namespace) -> None:
+    team_rows, player_rows = rebuild_aggregates(args.season)
+    print(f"Rebuilt aggregates for {args.season}: {team_rows} team rows, {player_rows} player rows.")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("rebuild-aggregates", help="Recompute per-game event aggregates from plays for a season")
+    p.add_argument("season", help="Season in YYYYYYYY format, e.g. 20252026")
+    p.set_defaults(func=_cmd_rebuild_aggregates)
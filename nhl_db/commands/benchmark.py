@@ -0,0 +1,67 @@
+import argparse
+import json
+
+from ..config import DB_BACKEND
+from ..services.write_benchmark import (
+    COMMIT_MODES,
+    PLAYS_PER_GAME,
+    SEASON_GAMES,
+    bench_backend,
+    compare_to_baseline,
+    run_write_benchmark,
+    save_report,
+)
+
+
+def _print_result(r: dict) -> None:
+    lat = r["latency_ms"]
+    print(
+        f"{r['target']:<30} {r['workload']:<9} batch={r['batch_size']:<6} {r['commit_mode']:<13} "
+        f"{r['rows']:>8} rows  {r['rows_per_sec'] or 0:>10.0f} rows/s  "
+        f"p50={lat.get('p50', 0):.1f}ms p99={lat.get('p99', 0):.1f}ms max={lat.get('max', 0):.1f}ms"
+    )
+
+
+def _cmd_bench_writes(args: argparse.Namespace) -> None:
+    backend = bench_backend(args.backend, database=args.database, sqlite_path=args.sqlite_path)
+    report = run_write_benchmark(
+        backend,
+        games=int(args.games),
+        plays_per_game=int(args.plays_per_game),
+        batch_sizes=[int(b) for b in args.batch_sizes.split(",") if b.strip()],
+        commit_modes=[m.strip() for m in args.commit_modes.split(",") if m.strip()],
+        targets=[t.strip() for t in args.targets.split(",") if t.strip()] if args.targets else None,
+        group=int(args.group),
+        seed=int(args.seed),
+        progress=_print_result,
+    )
+    path = save_report(report, args.out)
+    print(f"Saved results to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        meta = baseline.get("meta", {})
+        print(f"Compared to {args.compare} ({meta.get('backend')}, {meta.get('created_at')}):")
+        if meta.get("rows") != report["meta"]["rows"]:
+            print("  Warning: the baseline was generated with different row counts; rows/sec may not be comparable")
+        for (target, workload, batch_size, commit_mode), before, change in compare_to_baseline(report, baseline):
+            detail = f"{change:+.1f}% vs {before:.0f} rows/s" if change is not None else "no baseline"
+            print(f"  {target:<30} {workload:<9} batch={batch_size:<6} {commit_mode:<13} {detail}")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("bench-writes", help="Benchmark the repository write paths on a scratch database with season-scale synthetic rows")
+    p.add_argument("--backend", choices=("mysql", "sqlite"), default=DB_BACKEND, help="Storage engine to benchmark (default: DB_BACKEND)")
+    p.add_argument("--database", default=None, help="Scratch MySQL database (default: BENCH_DB_NAME or nhl_bench; never DB_NAME)")
+    p.add_argument("--sqlite-path", default=None, help="Scratch SQLite file (default: .data/bench.sqlite3; recreated each run)")
+    p.add_argument("--games", type=int, default=SEASON_GAMES, help=f"Games to generate (default: {SEASON_GAMES}, one season)")
+    p.add_argument("--plays-per-game", type=int, default=PLAYS_PER_GAME, help=f"Plays per game (default: {PLAYS_PER_GAME})")
+    p.add_argument("--batch-sizes", default="500,5000", help="Comma-separated rows per executemany/chunk")
+    p.add_argument("--commit-modes", default=",".join(COMMIT_MODES), help=f"Comma-separated subset of {', '.join(COMMIT_MODES)}")
+    p.add_argument("--group", type=int, default=10, help="Chunks per transaction for txn-grouped")
+    p.add_argument("--targets", default=None, help="Comma-separated repository functions (default: all)")
+    p.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic rows")
+    p.add_argument("--out", default=None, help="Results JSON path (default: benchmarks/writes_<backend>_<timestamp>.json)")
+    p.add_argument("--compare", default=None, help="Baseline results JSON to compare rows/sec against")
+    p.set_defaults(func=_cmd_bench_writes)
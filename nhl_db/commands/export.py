@@ -0,0 +1,17 @@
+import argparse
+
+from ..services.export_service import export_parquet
+
+
+def _cmd_export(args: argparse.Namespace) -> None:
+    counts = export_parquet(args.out, full=args.full, batch_size=int(args.batch_size))
+    summary = ", ".join(f"{table}={n}" for table, n in counts.items())
+    print(f"Exported to {args.out}: {summary}")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("export", help="Stream games/plays/players/teams to Parquet partitioned by season")
+    p.add_argument("--out", default="exports", help="Output directory (default: exports)")
+    p.add_argument("--full", action="store_true", help="Rewrite every final game instead of only games finished since the last export")
+    p.add_argument("--batch-size", type=int, default=50000, help="Rows fetched per batch from the server-side cursor")
+    p.set_defaults(func=_cmd_export)
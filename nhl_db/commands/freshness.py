@@ -0,0 +1,26 @@
+import argparse
+
+from ..config import FRESHNESS_STATUS_FILE
+from ..services.freshness import FIELD_LAG, PLAY_LAG, POLL_GAP, format_summary, read_status
+
+
+def _cmd_freshness(args: argparse.Namespace) -> None:
+    try:
+        status = read_status(args.file)
+    except FileNotFoundError:
+        print(f"No freshness status at {args.file}; is watch-live running?")
+        return
+    print(f"Freshness as of {status['updatedAt']} (SLO {status['sloSeconds']:g}s, poll gap SLO {status['pollGapSloSeconds']:g}s)")
+    breaches = status.get("breaches", {})
+    print(f"SLO breaches: play lag {breaches.get(PLAY_LAG, 0)}, field lag {breaches.get(FIELD_LAG, 0)}, poll gap {breaches.get(POLL_GAP, 0)}")
+    scopes = [("overall", status["overall"])] + [(f"game {g}", m) for g, m in status.get("games", {}).items()]
+    for label, metrics in scopes:
+        print(f"{label}:")
+        for name, key in (("play lag", PLAY_LAG), ("field lag", FIELD_LAG), ("poll gap", POLL_GAP)):
+            print(f"  {name:<9} {format_summary(metrics.get(key, {}))}")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("freshness", help="Show event-to-database lag percentiles published by watch-live")
+    p.add_argument("--file", default=FRESHNESS_STATUS_FILE, help="Status file written by watch-live")
+    p.set_defaults(func=_cmd_freshness)
@@ -0,0 +1,15 @@
+import argparse
+
+from ..services.heatmaps_service import update_heatmaps
+
+
+def _cmd_update_heatmaps(args: argparse.Namespace) -> None:
+    season = int(args.season) if args.season else None
+    games, grids = update_heatmaps(season=season)
+    print(f"Binned {games} final games; wrote {grids} heatmap grids.")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("update-heatmaps", help="Bin finished games' shot locations into stored heatmap grids")
+    p.add_argument("--season", default=None, help="Optional season in YYYYYYYY format, e.g. 20252026")
+    p.set_defaults(func=_cmd_update_heatmaps)
@@ -1,25 +1,49 @@
 import argparse
 
-from ..services.live_service import update_live_once, watch_live_games
+from ..services.live_service import select_game_ids, update_live_games, watch_live_games
 
 
 def _cmd_update_live(args: argparse.Namespace) -> None:
-    game_id = int(args.game)
-    count = update_live_once(game_id)
-    print(f"Updated game {game_id}; upserted {count} plays.")
+    game_ids = [int(g) for g in args.games]
+    if args.date or args.state:
+        game_ids += select_game_ids(args.date, args.state.split(",") if args.state else None)
+    if not game_ids:
+        if not (args.date or args.state):
+            raise SystemExit("Give game ids, --date or --state")
+        print("No games match the selection.")
+        return
+    print(f"Updating {len(set(game_ids))} game(s)...")
+    results = update_live_games(game_ids, workers=int(args.workers), group_size=int(args.group_size))
+
+    ok = {gid: r for gid, r in results.items() if "error" not in r}
+    failed = {gid: r for gid, r in results.items() if "error" in r}
+    if len(results) == 1 and ok:
+        game_id, r = next(iter(ok.items()))
+        print(f"Updated game {game_id}; upserted {r['plays']} plays.")
+    else:
+        plays = sum(int(r.get("plays") or 0) for r in ok.values())
+        new_plays = sum(int(r.get("new_plays") or 0) for r in ok.values())
+        print(f"Updated {len(ok)}/{len(results)} games; upserted {plays} plays ({new_plays} new).")
+    for game_id, r in sorted(failed.items()):
+        print(f"  FAILED {game_id} at {r['stage']}: {r['error']}")
+    if failed:
+        raise SystemExit(f"{len(failed)} game(s) failed")
 
 
 def _cmd_watch_live(args: argparse.Namespace) -> None:
-    watch_live_games(poll_seconds=int(args.poll_seconds))
+    watch_live_games(poll_seconds=int(args.poll_seconds), schedule_refresh_seconds=int(args.schedule_refresh_seconds))
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
-    p = subparsers.add_parser("update-live", help="Update live game state and plays for a gameId")
-    p.add_argument("game", help="Game ID (e.g., 2025020001)")
+    p = subparsers.add_parser("update-live", help="Update game state and plays for game ids, a date's games or games in given states")
+    p.add_argument("games", nargs="*", help="Game IDs (e.g., 2025020001 2025020002)")
+    p.add_argument("--date", default=None, help="Also update every game in `games` played on this date (YYYY-MM-DD)")
+    p.add_argument("--state", default=None, help="Also update games in these states, e.g. FINAL,OFF (combined with --date: both must match)")
+    p.add_argument("--workers", type=int, default=8, help="Games fetched concurrently")
+    p.add_argument("--group-size", type=int, default=10, help="Games written per transaction")
     p.set_defaults(func=_cmd_update_live)
 
     p2 = subparsers.add_parser("watch-live", help="Continuously watch all LIVE games and update DB")
     p2.add_argument("--poll-seconds", type=int, default=5, help="Polling interval in seconds")
+    p2.add_argument("--schedule-refresh-seconds", type=int, default=300, help="How often to refresh the cached schedule snapshot")
     p2.set_defaults(func=_cmd_watch_live)
-
-
@@ -0,0 +1,35 @@
+import argparse
+
+from ..services.migrations_service import check_query_plans, migrate, migration_status
+
+
+def _cmd_migrate(args: argparse.Namespace) -> None:
+    if args.status:
+        for version, description, applied in migration_status():
+            print(f"{version:>4}  {'applied' if applied else 'pending':<8} {description}")
+        return
+    applied = migrate(target=args.target)
+    if applied:
+        print(f"Applied migrations: {', '.join(str(v) for v in applied)}")
+    else:
+        print("Schema is up to date.")
+
+
+def _cmd_check_query_plans(_: argparse.Namespace) -> None:
+    failures = 0
+    for name, ok, detail in check_query_plans():
+        print(f"{'PASS' if ok else 'FAIL'}  {name}: {detail}")
+        if not ok:
+            failures += 1
+    if failures:
+        raise SystemExit(f"{failures} query plan check(s) failed")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("migrate", help="Apply versioned schema migrations")
+    p.add_argument("--target", type=int, default=None, help="Stop after this migration version")
+    p.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    p.set_defaults(func=_cmd_migrate)
+
+    p2 = subparsers.add_parser("check-query-plans", help="EXPLAIN common queries and verify index usage")
+    p2.set_defaults(func=_cmd_check_query_plans)
@@ -1,17 +1,36 @@
 import argparse
+import time
 
+from ..services.player_search import get_player_index
 from ..services.players_service import sync_players_roster
 
 
 def _cmd_sync_players_roster(args: argparse.Namespace) -> None:
-    total = sync_players_roster(args.season, teams_filter=args.teams)
+    total = sync_players_roster(args.season, teams_filter=args.teams, end_season=args.end_season, refresh=args.refresh)
     print(f"Finished syncing {total} players across active teams.")
 
 
+def _cmd_search_players(args: argparse.Namespace) -> None:
+    index = get_player_index()
+    started = time.perf_counter()
+    results = index.search(args.query, limit=int(args.limit))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for r in results:
+        team = r["teamAbbrev"] or "-"
+        number = f"#{r['number']}" if r["number"] is not None else ""
+        print(f"{r['playerId']}  {r['name']:<28} {team:<4} {r['position'] or '':<2} {number:<4} {r['headshotUrl'] or ''}")
+    print(f"{len(results)} match(es) in {elapsed_ms:.3f} ms ({len(index.entries)} players indexed)")
+
+
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("sync-players-roster", help="Import players via NHL roster per team and season")
     p.add_argument("season", help="Season in YYYYYYYY format, e.g. 20252026")
+    p.add_argument("--end-season", help="Optional last season (inclusive) to sync a range, e.g. 20252026", default=None)
     p.add_argument("--teams", help="Optional comma-separated triCodes to limit (e.g. 'SEA,VGK')", default=None)
+    p.add_argument("--refresh", action="store_true", help="Ignore the on-disk HTTP cache and re-download rosters")
     p.set_defaults(func=_cmd_sync_players_roster)
 
-
+    p2 = subparsers.add_parser("search-players", help="Autocomplete player names from the in-memory search index")
+    p2.add_argument("query", help="Name prefix(es), accents optional, e.g. 'stutz' or 'ryan o'")
+    p2.add_argument("--limit", type=int, default=10, help="Maximum results (default: 10)")
+    p2.set_defaults(func=_cmd_search_players)
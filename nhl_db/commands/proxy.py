@@ -0,0 +1,61 @@
+import argparse
+import json
+import logging
+import threading
+
+import requests
+
+from ..clients.fetch_proxy import FetchProxy, make_server
+from ..config import FETCH_PROXY_HOST, FETCH_PROXY_LIVE_TTL_SECONDS, FETCH_PROXY_PORT, FETCH_PROXY_TTL_SECONDS, FETCH_PROXY_URL
+
+logger = logging.getLogger(__name__)
+
+
+def _cmd_fetch_proxy(args: argparse.Namespace) -> None:
+    proxy = FetchProxy(live_ttl_seconds=float(args.live_ttl), ttl_seconds=float(args.ttl))
+    server = make_server(args.host, int(args.port), proxy)
+    stop = threading.Event()
+
+    def _report() -> None:
+        while not stop.wait(float(args.stats_seconds)):
+            s = proxy.stats()
+            logger.info(
+                f"Proxy: {s['hits']} hits, {s['misses']} misses, {s['coalesced']} coalesced, "
+                f"{s['upstream']} upstream fetches ({s['errors']} errors), {s['entries']} cached"
+            )
+
+    if float(args.stats_seconds) > 0:
+        threading.Thread(target=_report, name="proxy-stats", daemon=True).start()
+    logger.info(f"Fetch proxy listening on http://{args.host}:{args.port} (set FETCH_PROXY_URL=http://{args.host}:{args.port} for clients)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+def _cmd_fetch_proxy_stats(args: argparse.Namespace) -> None:
+    url = (args.url or FETCH_PROXY_URL or f"http://{FETCH_PROXY_HOST}:{FETCH_PROXY_PORT}").rstrip("/")
+    try:
+        resp = requests.get(f"{url}/_stats", timeout=5)
+        resp.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Fetch proxy at {url} not reachable: {e}")
+        return
+    print(json.dumps(resp.json(), indent=2))
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("fetch-proxy", help="Run the local caching fetch proxy shared by all local processes")
+    p.add_argument("--host", default=FETCH_PROXY_HOST, help=f"Listen address (default: {FETCH_PROXY_HOST})")
+    p.add_argument("--port", type=int, default=FETCH_PROXY_PORT, help=f"Listen port (default: {FETCH_PROXY_PORT})")
+    p.add_argument("--live-ttl", type=float, default=FETCH_PROXY_LIVE_TTL_SECONDS, help="Seconds to serve cached gamecenter bodies")
+    p.add_argument("--ttl", type=float, default=FETCH_PROXY_TTL_SECONDS, help="Seconds to serve other cached bodies")
+    p.add_argument("--stats-seconds", type=float, default=300, help="Log hit/miss counters this often (0 disables)")
+    p.set_defaults(func=_cmd_fetch_proxy)
+
+    p2 = subparsers.add_parser("fetch-proxy-stats", help="Show hit/miss/coalescing counters of a running fetch proxy")
+    p2.add_argument("--url", default=None, help="Proxy base URL (default: FETCH_PROXY_URL or the local default address)")
+    p2.set_defaults(func=_cmd_fetch_proxy_stats)
@@ -0,0 +1,31 @@
+import argparse
+
+from ..services.orchestrator import run_daemon
+
+
+def _cmd_run(args: argparse.Namespace) -> None:
+    run_daemon(
+        teams_hours=float(args.teams_hours),
+        players_hours=float(args.players_hours),
+        season_hours=float(args.season_hours),
+        schedule_minutes=float(args.schedule_minutes),
+        live_check_seconds=float(args.live_check_seconds),
+        live_lead_seconds=int(args.live_lead_seconds),
+        poll_seconds=int(args.poll_seconds),
+        schedule_refresh_seconds=int(args.schedule_refresh_seconds),
+        db_pool_size=int(args.db_pool_size),
+    )
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("run", help="Run all sync jobs and the live watcher on a schedule in one long-lived process")
+    p.add_argument("--teams-hours", type=float, default=24, help="Cadence of sync-teams-records (default: 24)")
+    p.add_argument("--players-hours", type=float, default=12, help="Cadence of sync-players-roster for the current season (default: 12)")
+    p.add_argument("--season-hours", type=float, default=24, help="Cadence of sync-schedule-season for the current season (default: 24)")
+    p.add_argument("--schedule-minutes", type=float, default=30, help="Cadence of the schedule sync for yesterday..+7 days (default: 30)")
+    p.add_argument("--live-check-seconds", type=float, default=60, help="How often to check for games starting or live (default: 60)")
+    p.add_argument("--live-lead-seconds", type=int, default=900, help="Start the live watcher this long before a game starts (default: 900)")
+    p.add_argument("--poll-seconds", type=int, default=5, help="Live watcher polling interval in seconds")
+    p.add_argument("--schedule-refresh-seconds", type=int, default=300, help="Live watcher schedule snapshot refresh interval")
+    p.add_argument("--db-pool-size", type=int, default=10, help="Shared MySQL connection pool size (default: 10)")
+    p.set_defaults(func=_cmd_run)
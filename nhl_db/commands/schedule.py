@@ -1,6 +1,6 @@
 import argparse
 
-from ..services.schedule_service import sync_schedule_dates
+from ..services.schedule_service import sync_schedule_dates, sync_schedule_season
 
 
 def _cmd_sync_schedule_dates(args: argparse.Namespace) -> None:
@@ -8,10 +8,18 @@ def _cmd_sync_schedule_dates(args: argparse.Namespace) -> None:
     print(f"Finished upserting {total} games across {args.start}..{args.end}.")
 
 
+def _cmd_sync_schedule_season(args: argparse.Namespace) -> None:
+    total = sync_schedule_season(args.season, workers=int(args.workers))
+    print(f"Finished upserting {total} games for season {args.season}.")
+
+
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("sync-schedule-dates", help="Import schedule by date range (inclusive)")
     p.add_argument("start", help="YYYY-MM-DD")
     p.add_argument("end", help="YYYY-MM-DD")
     p.set_defaults(func=_cmd_sync_schedule_dates)
 
-
+    p = subparsers.add_parser("sync-schedule-season", help="Import a full season from per-club season schedules (concurrent)")
+    p.add_argument("season", help="Season in YYYYYYYY format, e.g., 20252026")
+    p.add_argument("--workers", type=int, default=8, help="Concurrent club schedule requests (default: 8)")
+    p.set_defaults(func=_cmd_sync_schedule_season)
@@ -0,0 +1,18 @@
+import argparse
+import json
+
+from ..services.snapshot_service import get_game_snapshot
+
+
+def _cmd_game_snapshot(args: argparse.Namespace) -> None:
+    document = get_game_snapshot(int(args.game))
+    if document is None:
+        print(f"No snapshot for game {args.game}; it is written by update-live / watch-live.")
+        return
+    print(json.dumps(document, indent=2, ensure_ascii=False))
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("game-snapshot", help="Print a game's precomputed snapshot document")
+    p.add_argument("game", help="Game ID (e.g., 2025020001)")
+    p.set_defaults(func=_cmd_game_snapshot)
@@ -0,0 +1,23 @@
+import argparse
+import json
+
+from ..services.write_spool import get_spool
+
+
+def _cmd_replay_spool(args: argparse.Namespace) -> None:
+    spool = get_spool()
+    if args.status:
+        print(json.dumps(spool.status(), indent=2))
+        return
+    if not spool.pending():
+        print(f"Nothing spooled in {spool.path}.")
+        return
+    written = spool.replay()
+    status = spool.status()
+    print(f"Replayed {status['replayed']} spooled records ({written} rows/games written); {status['rejected']} set aside in {spool.rejected_path}.")
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("replay-spool", help="Replay writes spooled while the database was unreachable")
+    p.add_argument("--status", action="store_true", help="Show pending spool size and counters instead of replaying")
+    p.set_defaults(func=_cmd_replay_spool)
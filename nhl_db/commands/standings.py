@@ -0,0 +1,32 @@
+import argparse
+
+from ..repositories.standings_repo import get_standings
+from ..services.standings_service import rebuild_standings
+
+
+def _cmd_rebuild_standings(args: argparse.Namespace) -> None:
+    applied = rebuild_standings(args.season)
+    print(f"Rebuilt standings for {args.season} from {applied} final games.")
+
+
+def _cmd_standings(args: argparse.Namespace) -> None:
+    rows = get_standings(int(args.season), conference=args.conference, division=args.division)
+    print(f"{'Team':<5} {'Div':<14} {'GP':>3} {'W':>3} {'L':>3} {'OTL':>3} {'RW':>3} {'PTS':>4} {'GF':>4} {'GA':>4} {'DIFF':>5}")
+    for r in rows:
+        print(
+            f"{(r['teamAbbrev'] or r['teamId']):<5} {(r['divisionName'] or '-'):<14} {r['gamesPlayed']:>3} {r['wins']:>3} "
+            f"{r['losses']:>3} {r['otLosses']:>3} {r['regulationWins']:>3} {r['points']:>4} {r['goalsFor']:>4} "
+            f"{r['goalsAgainst']:>4} {r['goalDifferential']:>5}"
+        )
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    p = subparsers.add_parser("rebuild-standings", help="Recompute standings for a season from final games")
+    p.add_argument("season", help="Season in YYYYYYYY format, e.g. 20252026")
+    p.set_defaults(func=_cmd_rebuild_standings)
+
+    p2 = subparsers.add_parser("standings", help="Print standings for a season")
+    p2.add_argument("season", help="Season in YYYYYYYY format, e.g. 20252026")
+    p2.add_argument("--conference", default=None, help="Optional conference name, e.g. Western")
+    p2.add_argument("--division", default=None, help="Optional division name, e.g. Central")
+    p2.set_defaults(func=_cmd_standings)
@@ -3,13 +3,14 @@ import argparse
 from ..services.teams_service import sync_teams_records
 
 
-def _cmd_sync_teams_records(_: argparse.Namespace) -> None:
-    count = sync_teams_records()
+def _cmd_sync_teams_records(args: argparse.Namespace) -> None:
+    count = sync_teams_records(refresh=args.refresh)
     print(f"Upserted {count} teams from Records API.")
 
 
 def register(subparsers: argparse._SubParsersAction) -> None:
     p = subparsers.add_parser("sync-teams-records", help="Import teams from Records API franchise endpoint")
+    p.add_argument("--refresh", action="store_true", help="Ignore the on-disk HTTP cache and re-download")
     p.set_defaults(func=_cmd_sync_teams_records)
 
 
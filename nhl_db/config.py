@@ -1,12 +1,19 @@
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-RECORDS_BASE = "https://records.nhl.com/site/api"
-NHL_WEB_BASE = "https://api-web.nhle.com/v1"
+RECORDS_UPSTREAM = "https://records.nhl.com/site/api"
+NHL_WEB_UPSTREAM = "https://api-web.nhle.com/v1"
+
+# Optional local fetch proxy (`python app.py fetch-proxy`); when set, clients fetch through it
+FETCH_PROXY_URL = os.getenv("FETCH_PROXY_URL", "").rstrip("/")
+
+RECORDS_BASE = f"{FETCH_PROXY_URL}/records" if FETCH_PROXY_URL else RECORDS_UPSTREAM
+NHL_WEB_BASE = f"{FETCH_PROXY_URL}/web" if FETCH_PROXY_URL else NHL_WEB_UPSTREAM
 
 
 def get_env(name: str, default: Optional[str] = None) -> str:
@@ -16,3 +23,79 @@ def get_env(name: str, default: Optional[str] = None) -> str:
     return value
 
 
+# Storage engine: "mysql" (default) or "sqlite" (embedded, one local file at SQLITE_PATH)
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").lower()
+SQLITE_PATH = os.getenv(
+    "SQLITE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data", "nhl_companion.sqlite3"),
+)
+
+# Append-only local spool for writes made while the database is unreachable; replayed in order on recovery
+SPOOL_ENABLED = os.getenv("SPOOL_ENABLED", "1") != "0"
+SPOOL_PATH = os.getenv(
+    "SPOOL_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".data", "write_spool.bin"),
+)
+# Spooled records are fsynced at most this often (and at the end of every live poll cycle)
+SPOOL_FSYNC_SECONDS = float(os.getenv("SPOOL_FSYNC_SECONDS", "1"))
+# While the database is down, how often the replayer checks whether it is back
+SPOOL_PROBE_SECONDS = float(os.getenv("SPOOL_PROBE_SECONDS", "10"))
+
+# Client-side request budget per upstream host: (requests per second, burst size)
+HTTP_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    urlparse(NHL_WEB_UPSTREAM).hostname or "": (
+        float(os.getenv("NHL_WEB_RATE_PER_SEC", "8")),
+        float(os.getenv("NHL_WEB_BURST", "16")),
+    ),
+    urlparse(RECORDS_UPSTREAM).hostname or "": (
+        float(os.getenv("RECORDS_RATE_PER_SEC", "3")),
+        float(os.getenv("RECORDS_BURST", "6")),
+    ),
+}
+
+# Keep-alive pool size per upstream host for the shared NhlClient
+HTTP_POOL_SIZES: Dict[str, int] = {
+    urlparse(NHL_WEB_UPSTREAM).hostname or "": int(os.getenv("NHL_WEB_POOL_SIZE", "16")),
+    urlparse(RECORDS_UPSTREAM).hostname or "": int(os.getenv("RECORDS_POOL_SIZE", "4")),
+}
+
+if FETCH_PROXY_URL:
+    # The upstream budget is enforced by the proxy; local calls to it only need a generous cap
+    HTTP_RATE_LIMITS[urlparse(FETCH_PROXY_URL).hostname or ""] = (
+        float(os.getenv("FETCH_PROXY_RATE_PER_SEC", "100")),
+        float(os.getenv("FETCH_PROXY_BURST", "200")),
+    )
+    HTTP_POOL_SIZES[urlparse(FETCH_PROXY_URL).hostname or ""] = int(os.getenv("NHL_WEB_POOL_SIZE", "16"))
+
+# Drop a host's idle keep-alive connections after this many quiet seconds
+HTTP_IDLE_RECYCLE_SECONDS = float(os.getenv("HTTP_IDLE_RECYCLE_SECONDS", "45"))
+
+# Freshness SLOs for the live path (seconds) and where the watcher publishes its lag numbers
+FRESHNESS_SLO_SECONDS = float(os.getenv("FRESHNESS_SLO_SECONDS", "30"))
+FRESHNESS_POLL_GAP_SLO_SECONDS = float(os.getenv("FRESHNESS_POLL_GAP_SLO_SECONDS", "15"))
+FRESHNESS_STATUS_FILE = os.getenv(
+    "FRESHNESS_STATUS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "freshness.json"),
+)
+
+# Persistent cache for slow-changing reference endpoints (set HTTP_CACHE_ENABLED=0 to disable)
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") != "0"
+HTTP_CACHE_PATH = os.getenv(
+    "HTTP_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "http_cache.sqlite3"),
+)
+HTTP_CACHE_MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+# Time-to-live per cached endpoint, in seconds
+HTTP_CACHE_TTLS: Dict[str, float] = {
+    "franchises": float(os.getenv("HTTP_CACHE_TTL_FRANCHISES", str(7 * 24 * 3600))),
+    "players_by_team": float(os.getenv("HTTP_CACHE_TTL_PLAYERS_BY_TEAM", str(24 * 3600))),
+    "web_roster": float(os.getenv("HTTP_CACHE_TTL_WEB_ROSTER", str(6 * 3600))),
+}
+
+# Local fetch proxy: listen address and how long it serves a cached body (seconds)
+FETCH_PROXY_HOST = os.getenv("FETCH_PROXY_HOST", "127.0.0.1")
+FETCH_PROXY_PORT = int(os.getenv("FETCH_PROXY_PORT", "8787"))
+FETCH_PROXY_LIVE_TTL_SECONDS = float(os.getenv("FETCH_PROXY_LIVE_TTL_SECONDS", "2"))
+FETCH_PROXY_TTL_SECONDS = float(os.getenv("FETCH_PROXY_TTL_SECONDS", "60"))
+FETCH_PROXY_MAX_ENTRIES = int(os.getenv("FETCH_PROXY_MAX_ENTRIES", "2000"))
@@ -1,18 +1,21 @@
-from typing import Any
+import logging
 
-import mysql.connector
+from .storage import get_backend
 
-from .config import get_env
+logger = logging.getLogger(__name__)
 
 
-def get_db_connection():  # type: ignore[no-untyped-def]
-    return mysql.connector.connect(
-        host=get_env("DB_HOST", "127.0.0.1"),
-        port=int(get_env("DB_PORT", "3306")),
-        user=get_env("DB_USER", "root"),
-        password=get_env("DB_PASSWORD", ""),
-        database=get_env("DB_NAME"),
-        autocommit=True,
-    )
+def enable_connection_pool(size: int = 10) -> None:
+    """
+    Serve `get_db_connection()` from a process-wide pool (for long-running processes).
+
+    `conn.close()` then returns the connection to the pool instead of closing
+    the socket. When the pool is exhausted, a direct connection is opened.
+    Engines without pooling (SQLite) ignore this.
+    """
+    get_backend().enable_pool(size)
 
 
+def get_db_connection():  # type: ignore[no-untyped-def]
+    """A connection from the configured storage backend (DB_BACKEND, default mysql)."""
+    return get_backend().connect()
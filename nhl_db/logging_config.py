@@ -1,42 +1,161 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
+# Context fields services attach with `extra={...}`; emitted as JSON keys when present
+CONTEXT_FIELDS = ("game_id", "endpoint", "stage")
 
-def setup_logging() -> None:
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, function, message, context fields and traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Plain message for INFO and below (progress output); full detail for warnings and errors."""
+
+    def __init__(self, detailed: logging.Formatter) -> None:
+        super().__init__("%(message)s")
+        self.detailed = detailed
+
+    def format(self, record: logging.LogRecord) -> str:
+        if record.levelno >= logging.WARNING:
+            return self.detailed.format(record)
+        return super().format(record)
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Rate-limit identical warnings/errors: the first one in `window_seconds` passes,
+    repeats are dropped and counted, and the next one to pass reports the count.
+
+    Identical means same logger, level and rendered message, so a flapping
+    upstream produces one traceback per window instead of one per poll.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, min_level: int = logging.WARNING) -> None:
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.min_level = min_level
+        self._seen: Dict[Tuple[str, int, str], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.min_level or self.window_seconds <= 0:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            first_at, suppressed = self._seen.get(key, (0.0, 0))
+            if first_at and now - first_at < self.window_seconds:
+                self._seen[key] = (first_at, suppressed + 1)
+                return False
+            self._seen[key] = (now, 0)
+            if len(self._seen) > 1000:
+                # Forget keys whose window has passed so the map stays small
+                for k in [k for k, (t, _) in self._seen.items() if now - t >= self.window_seconds]:
+                    del self._seen[k]
+        if suppressed:
+            record.msg = f"{record.getMessage()} (repeated {suppressed} more times in the previous {self.window_seconds:g}s)"
+            record.args = None
+        return True
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback in `exc_text` instead of folding it into the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def setup_logging(
+    json_format: Optional[bool] = None,
+    level: Optional[str] = None,
+    file_level: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    repeat_window_seconds: Optional[float] = None,
+) -> None:
     """
     Configure application-wide logging with rotating file handler.
-    
-    - Logs ERROR level and above to rotating files (10MB per file, 5 backups)
-    - Logs ERROR level to console
-    - Log files stored in services/db/logs/ directory
-    - Format includes timestamp, module, level, function name, and message
+
+    - Console: INFO and above to stdout; progress messages print as plain text
+    - File: `file_level` (default WARNING) and above to rotating files (10MB per file, 5 backups)
+      in logs/, as text or as JSON lines (`json_format` / LOG_FORMAT=json) including
+      game_id, endpoint and stage when a caller passes them via `extra`
+    - Non-blocking: with `use_queue` (default on, LOG_ASYNC=0 disables) callers only
+      enqueue records; a background QueueListener thread does the formatting and I/O
+    - Identical warnings/errors are rate-limited per `repeat_window_seconds`
+      (LOG_REPEAT_WINDOW_SECONDS, default 60; 0 disables)
     """
+    global _listener
+    json_format = os.getenv("LOG_FORMAT", "text").lower() == "json" if json_format is None else json_format
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    file_level = file_level or os.getenv("LOG_FILE_LEVEL", "WARNING")
+    use_queue = os.getenv("LOG_ASYNC", "1") != "0" if use_queue is None else use_queue
+    if repeat_window_seconds is None:
+        repeat_window_seconds = float(os.getenv("LOG_REPEAT_WINDOW_SECONDS", "60"))
+
     # Determine the logs directory path
     current_file = Path(__file__)
     db_dir = current_file.parent.parent  # services/db/
     logs_dir = db_dir / "logs"
-    
+
     # Create logs directory if it doesn't exist
     logs_dir.mkdir(exist_ok=True)
-    
+
     log_file = logs_dir / "nhl_companion.log"
-    
+
     # Define log format
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s - %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
-    
+
     # Create formatter
     formatter = logging.Formatter(log_format, datefmt=date_format)
-    
+
     # Configure root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.ERROR)
-    
-    # Remove existing handlers to avoid duplicates
+    root_logger.setLevel(level.upper())
+
+    # Remove existing handlers (and a previous listener) to avoid duplicates
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
     root_logger.handlers.clear()
-    
+
     # Create rotating file handler (10MB per file, keep 5 backups)
     file_handler = RotatingFileHandler(
         log_file,
@@ -44,26 +163,45 @@ def setup_logging() -> None:
         backupCount=5,
         encoding="utf-8"
     )
-    file_handler.setLevel(logging.ERROR)
-    file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
-    
-    # Create console handler for ERROR level
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.ERROR)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    file_handler.setLevel(file_level.upper())
+    file_handler.setFormatter(JsonFormatter() if json_format else formatter)
+
+    # Create console handler for progress output and errors
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level.upper())
+    console_handler.setFormatter(ConsoleFormatter(formatter))
+
+    handlers = [file_handler, console_handler]
+    if use_queue:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        queue_handler = _PreparedQueueHandler(log_queue)
+        queue_handler.addFilter(RepeatFilter(repeat_window_seconds))
+        root_logger.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+    else:
+        for handler in handlers:
+            handler.addFilter(RepeatFilter(repeat_window_seconds))
+            root_logger.addHandler(handler)
+
+
+def _stop_listener() -> None:
+    """Flush queued records on interpreter exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for the given module name.
-    
+
     Args:
         name: Usually __name__ from the calling module
-        
+
     Returns:
         Configured logger instance
     """
     return logging.getLogger(name)
-
@@ -26,6 +26,8 @@ def to_game_rows_from_schedule(games: List[Dict[str, Any]]) -> List[Tuple[Any, .
         game_state = g.get("gameState")
         home_score = int((g.get("homeTeam") or {}).get("score", 0)) if (g.get("homeTeam") or {}).get("score") is not None else 0
         away_score = int((g.get("awayTeam") or {}).get("score", 0)) if (g.get("awayTeam") or {}).get("score") is not None else 0
+        outcome = g.get("gameOutcome")
+        last_period_type = outcome.get("lastPeriodType") if isinstance(outcome, dict) else None
         rows.append((
             game_id,
             season,
@@ -36,7 +38,8 @@ def to_game_rows_from_schedule(games: List[Dict[str, Any]]) -> List[Tuple[Any, .
             away_team_id,
             game_state,
             home_score,
-            away_score
+            away_score,
+            last_period_type,
         ))
     return rows
 
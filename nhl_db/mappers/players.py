@@ -49,3 +49,29 @@ def to_player_rows(roster: List[Dict[str, Any]], team_id: int) -> List[Tuple[Any
     return rows
 
 
+def to_player_rows_from_roster_spots(spots: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    """Map play-by-play `rosterSpots` entries; each carries its own teamId. Birthplace is not in the payload."""
+    rows: List[Tuple[Any, ...]] = []
+    for spot in spots:
+        try:
+            team_id = int(spot.get("teamId"))
+        except Exception:
+            continue
+        entry = dict(spot, id=spot.get("playerId"))
+        rows.extend(to_player_rows([entry], team_id))
+    return rows
+
+
+def player_landing_to_roster_entry(landing: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape a `/player/{id}/landing` payload into the NHL Web roster entry shape `to_player_rows` reads."""
+    return {
+        "id": landing.get("playerId"),
+        "playerTeamId": landing.get("currentTeamId"),
+        "firstName": landing.get("firstName"),
+        "lastName": landing.get("lastName"),
+        "sweaterNumber": landing.get("sweaterNumber"),
+        "positionCode": landing.get("position"),
+        "headshot": landing.get("headshot"),
+        "birthCity": landing.get("birthCity"),
+        "birthCountry": landing.get("birthCountry"),
+    }
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -78,3 +78,66 @@ def map_play(game_id: int, p: Dict[str, Any]) -> Tuple[Any, ...]:
         raise
 
 
+# Positions of the primary, losing, secondary and tertiary player ids in a map_play row
+PLAYER_ID_POSITIONS = (4, 5, 6, 7)
+
+
+def player_ids_in_plays(rows: Sequence[Tuple[Any, ...]]) -> Set[int]:
+    ids: Set[int] = set()
+    for r in rows:
+        for idx in PLAYER_ID_POSITIONS:
+            if r[idx] is not None:
+                try:
+                    ids.add(int(r[idx]))
+                except Exception:
+                    continue
+    return ids
+
+
+# Fixed ids of the `play_zones` lookup table (migration 8)
+ZONE_IDS = {"O": 1, "D": 2, "N": 3}
+
+# Length of a regulation period; overtime periods start after the same number of seconds
+PERIOD_SECONDS = 1200
+
+# Positions of the type and zone in a map_play row
+PLAY_TYPE_POSITION = 11
+PLAY_ZONE_POSITION = 12
+
+
+def clock_to_seconds(clock: Optional[str]) -> int:
+    """"MM:SS" -> seconds; missing or malformed clocks become 0."""
+    try:
+        minutes, seconds = str(clock).split(":")
+        return int(minutes) * 60 + int(seconds)
+    except Exception:
+        return 0
+
+
+def game_second(period: Optional[int], elapsed_seconds: int) -> int:
+    """Seconds since the start of the game for a play `elapsed_seconds` into `period`."""
+    return max(int(period or 0) - 1, 0) * PERIOD_SECONDS + elapsed_seconds
+
+
+def play_types_in_plays(rows: Sequence[Tuple[Any, ...]]) -> Set[str]:
+    return {str(r[PLAY_TYPE_POSITION]) for r in rows if r[PLAY_TYPE_POSITION] is not None}
+
+
+def encode_play(row: Tuple[Any, ...], type_ids: Mapping[str, int]) -> Tuple[Any, ...]:
+    """
+    Convert a map_play row to the `plays_encoded` layout: clocks as seconds, the
+    derived game second, and type/zone as lookup ids (`type_ids` maps names to
+    `play_types` ids; unknown names and zones encode as NULL).
+    """
+    elapsed = clock_to_seconds(row[9])
+    ptype = row[PLAY_TYPE_POSITION]
+    zone = row[PLAY_ZONE_POSITION]
+    return row[:9] + (
+        elapsed,
+        clock_to_seconds(row[10]),
+        game_second(row[8], elapsed),
+        type_ids.get(str(ptype)) if ptype is not None else None,
+        ZONE_IDS.get(str(zone)) if zone is not None else None,
+        row[13],
+        row[14],
+    )
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import hashlib
+import json
+import zlib
+
+from .games import derive_game_fields_from_gamecenter
+
+FINAL_STATES = ("FINAL", "OFF")
+
+# Roles of the player id columns in a map_play row, by position
+_PLAYER_ROLES = ((4, "primary"), (5, "opposing"), (6, "assist"), (7, "assist"))
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get("default") or next(iter(value.values()), None)
+    return value
+
+
+def roster_spot_names(pbp: Dict[str, Any]) -> Dict[int, str]:
+    names: Dict[int, str] = {}
+    for spot in pbp.get("rosterSpots") or []:
+        try:
+            pid = int(spot.get("playerId"))
+        except Exception:
+            continue
+        names[pid] = " ".join(n for n in (_text(spot.get("firstName")), _text(spot.get("lastName"))) if n)
+    return names
+
+
+def _team(block: Dict[str, Any], score: int, sog: int) -> Dict[str, Any]:
+    return {
+        "id": block.get("id"),
+        "abbrev": block.get("abbrev"),
+        "name": " ".join(n for n in (_text(block.get("placeName")), _text(block.get("commonName"))) if n) or _text(block.get("name")),
+        "logo": block.get("logo"),
+        "score": score,
+        "sog": sog,
+    }
+
+
+def build_game_snapshot(
+    game_id: int,
+    landing: Dict[str, Any],
+    box: Dict[str, Any],
+    pbp: Dict[str, Any],
+    rows: Sequence[Tuple[Any, ...]],
+    last_plays: int = 20,
+) -> Dict[str, Any]:
+    """
+    Self-contained game document: teams, score, SOG, period/clock and the last
+    `last_plays` plays (newest first) with player names from `rosterSpots`.
+
+    `rows` are the game's mapped plays (see mappers.plays.map_play). Contains no
+    fetch-time fields, so unchanged games produce identical documents.
+    """
+    game_state, period, clock, home_score, away_score, home_sog, away_sog = derive_game_fields_from_gamecenter(landing, box)
+    names = roster_spot_names(pbp)
+    pd = landing.get("periodDescriptor") or {}
+    venue = landing.get("venue")
+
+    plays: List[Dict[str, Any]] = []
+    for r in sorted(rows, key=lambda r: r[2], reverse=True)[:max(0, int(last_plays))]:
+        players = []
+        for idx, role in _PLAYER_ROLES:
+            if r[idx] is not None:
+                players.append({"id": int(r[idx]), "name": names.get(int(r[idx])), "role": role})
+        plays.append({
+            "playId": r[0],
+            "sortOrder": r[2],
+            "teamId": r[3],
+            "period": r[8],
+            "time": r[9],
+            "type": r[11],
+            "zone": r[12],
+            "x": r[13],
+            "y": r[14],
+            "players": players,
+        })
+
+    state = str(game_state or "").upper()
+    return {
+        "gameId": int(game_id),
+        "season": landing.get("season"),
+        "gameType": landing.get("gameType"),
+        "startTimeUTC": landing.get("startTimeUTC"),
+        "venue": _text(venue) if venue is not None else None,
+        "state": game_state,
+        "final": state in FINAL_STATES,
+        "period": period,
+        "periodType": pd.get("periodType") if isinstance(pd, dict) else None,
+        "clock": clock,
+        "home": _team(box.get("homeTeam") or landing.get("homeTeam") or {}, home_score, home_sog),
+        "away": _team(box.get("awayTeam") or landing.get("awayTeam") or {}, away_score, away_sog),
+        "playCount": len(rows),
+        "lastPlays": plays,
+    }
+
+
+def encode_snapshot(document: Dict[str, Any]) -> Tuple[bytes, bytes]:
+    """(zlib-compressed JSON, SHA-1 of the uncompressed JSON)."""
+    raw = json.dumps(document, separators=(",", ":"), sort_keys=True, default=str).encode("utf-8")
+    return zlib.compress(raw, 6), hashlib.sha1(raw).digest()
+
+
+def decode_snapshot(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
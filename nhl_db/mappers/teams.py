@@ -46,7 +46,11 @@ def to_team_rows(franchises: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
             abbrev = t.get("triCode")
             active = (t.get("active") or "").upper() == "Y"
             logo_url = pick_dark_logo_url(t)
-            rows.append((team_id, team_name, team_city, abbrev, active, logo_url))
+            conference_block = t.get("conference")
+            conference = conference_block.get("name") if isinstance(conference_block, dict) else None
+            division_block = t.get("division")
+            division = division_block.get("name") if isinstance(division_block, dict) else None
+            rows.append((team_id, team_name, team_city, abbrev, active, logo_url, conference, division))
     return rows
 
 
@@ -0,0 +1,26 @@
+from typing import List
+
+from . import (
+    m0001_base_schema,
+    m0002_partition_plays,
+    m0003_games_indexes,
+    m0004_event_aggregates,
+    m0005_standings,
+    m0006_heatmaps,
+    m0007_game_snapshots,
+    m0008_compact_plays,
+)
+
+# Ordered; each module exposes VERSION, DESCRIPTION and upgrade(cur)
+MIGRATIONS: List = [
+    m0001_base_schema,
+    m0002_partition_plays,
+    m0003_games_indexes,
+    m0004_event_aggregates,
+    m0005_standings,
+    m0006_heatmaps,
+    m0007_game_snapshots,
+    m0008_compact_plays,
+]
+
+__all__ = ["MIGRATIONS"]
@@ -0,0 +1,88 @@
+"""
+Baseline schema for teams, players, games and plays.
+
+Uses CREATE TABLE IF NOT EXISTS so databases created from the old hand-run
+schema script are adopted as version 1 without changes.
+"""
+
+VERSION = 1
+DESCRIPTION = "Base schema: teams, players, games, plays"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS teams (
+        teamId INT NOT NULL,
+        teamName VARCHAR(100) NULL,
+        teamCity VARCHAR(100) NULL,
+        teamAbbrev VARCHAR(10) NULL,
+        teamIsActive TINYINT(1) NOT NULL DEFAULT 0,
+        teamLogoUrl VARCHAR(512) NULL,
+        PRIMARY KEY (teamId)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS players (
+        playerId INT NOT NULL,
+        playerTeamId INT NULL,
+        playerFirstName VARCHAR(100) NOT NULL,
+        playerLastName VARCHAR(100) NOT NULL,
+        playerNumber SMALLINT NULL,
+        playerPosition VARCHAR(5) NULL,
+        playerHeadshotUrl VARCHAR(512) NULL,
+        playerHomeCity VARCHAR(100) NULL,
+        playerHomeCountry VARCHAR(10) NULL,
+        PRIMARY KEY (playerId),
+        KEY idx_players_team (playerTeamId),
+        CONSTRAINT fk_players_team FOREIGN KEY (playerTeamId) REFERENCES teams (teamId)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS games (
+        gameId INT NOT NULL,
+        gameSeason INT NOT NULL,
+        gameType TINYINT NOT NULL,
+        gameDateTimeUtc DATETIME NULL,
+        gameVenue VARCHAR(100) NULL,
+        gameHomeTeamId INT NOT NULL,
+        gameAwayTeamId INT NOT NULL,
+        gameState VARCHAR(10) NULL,
+        gamePeriod TINYINT NULL,
+        gameClock VARCHAR(10) NULL,
+        gameHomeScore SMALLINT NOT NULL DEFAULT 0,
+        gameAwayScore SMALLINT NOT NULL DEFAULT 0,
+        gameHomeSOG SMALLINT NOT NULL DEFAULT 0,
+        gameAwaySOG SMALLINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (gameId),
+        KEY idx_games_home_team (gameHomeTeamId),
+        KEY idx_games_away_team (gameAwayTeamId),
+        CONSTRAINT fk_games_home_team FOREIGN KEY (gameHomeTeamId) REFERENCES teams (teamId),
+        CONSTRAINT fk_games_away_team FOREIGN KEY (gameAwayTeamId) REFERENCES teams (teamId)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS plays (
+        playId BIGINT NOT NULL,
+        playGameId INT NOT NULL,
+        playIndex INT NOT NULL,
+        playTeamId INT NULL,
+        playPrimaryPlayerId INT NULL,
+        playLosingPlayerId INT NULL,
+        playSecondaryPlayerId INT NULL,
+        playTertiaryPlayerId INT NULL,
+        playPeriod TINYINT NOT NULL,
+        playTime VARCHAR(5) NOT NULL,
+        playTimeReamaining VARCHAR(5) NOT NULL,
+        playType VARCHAR(32) NULL,
+        playZone CHAR(1) NULL,
+        playXCoord SMALLINT NULL,
+        playYCoord SMALLINT NULL,
+        PRIMARY KEY (playId),
+        KEY idx_plays_game (playGameId)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    for stmt in STATEMENTS:
+        cur.execute(stmt)
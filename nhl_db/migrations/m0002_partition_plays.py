@@ -0,0 +1,71 @@
+"""
+Range-partition `plays` by season and add its covering indexes.
+
+The season is derivable from the game id (2025020076 -> season starting 2025),
+so partitions are ranges of `playGameId`: partition pYYYY holds every play of
+the season starting in YYYY. MySQL requires the partitioning column in every
+unique key, so the primary key becomes (playGameId, playId); playId already
+embeds the game id, so uniqueness and ON DUPLICATE KEY behavior are unchanged.
+Partitioned InnoDB tables cannot have foreign keys, so `plays` carries none.
+
+Existing rows are copied into the new table, which then replaces the old one.
+"""
+
+from datetime import datetime
+
+VERSION = 2
+DESCRIPTION = "Partition plays by season; covering indexes for game/sortOrder and player/type"
+
+# Oldest season with its own partition; anything earlier lands in p_old
+FIRST_PARTITIONED_SEASON = 2010
+
+PLAYS_COLUMNS = (
+    "playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
+    "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
+    "playType, playZone, playXCoord, playYCoord"
+)
+
+
+def season_partition_bound(season_start_year: int) -> int:
+    """Exclusive upper playGameId bound for the season starting in `season_start_year`."""
+    return (season_start_year + 1) * 1000000
+
+
+def partition_clause(last_season_start_year: int) -> str:
+    parts = [f"PARTITION p_old VALUES LESS THAN ({season_partition_bound(FIRST_PARTITIONED_SEASON - 1)})"]
+    for year in range(FIRST_PARTITIONED_SEASON, last_season_start_year + 1):
+        parts.append(f"PARTITION p{year} VALUES LESS THAN ({season_partition_bound(year)})")
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (playGameId) (\n    " + ",\n    ".join(parts) + "\n)"
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    cur.execute("DROP TABLE IF EXISTS plays_partitioned")
+    cur.execute(
+        """
+        CREATE TABLE plays_partitioned (
+            playId BIGINT NOT NULL,
+            playGameId INT NOT NULL,
+            playIndex INT NOT NULL,
+            playTeamId INT NULL,
+            playPrimaryPlayerId INT NULL,
+            playLosingPlayerId INT NULL,
+            playSecondaryPlayerId INT NULL,
+            playTertiaryPlayerId INT NULL,
+            playPeriod TINYINT NOT NULL,
+            playTime VARCHAR(5) NOT NULL,
+            playTimeReamaining VARCHAR(5) NOT NULL,
+            playType VARCHAR(32) NULL,
+            playZone CHAR(1) NULL,
+            playXCoord SMALLINT NULL,
+            playYCoord SMALLINT NULL,
+            PRIMARY KEY (playGameId, playId),
+            KEY idx_plays_game_sort (playGameId, playIndex),
+            KEY idx_plays_player_type (playPrimaryPlayerId, playType, playGameId)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+        + partition_clause(datetime.now().year + 1)
+    )
+    cur.execute(f"INSERT INTO plays_partitioned ({PLAYS_COLUMNS}) SELECT {PLAYS_COLUMNS} FROM plays")
+    cur.execute("RENAME TABLE plays TO plays_unpartitioned, plays_partitioned TO plays")
+    cur.execute("DROP TABLE plays_unpartitioned")
@@ -0,0 +1,27 @@
+"""
+Covering indexes for the common `games` access paths: by date, by state and by season.
+"""
+
+VERSION = 3
+DESCRIPTION = "Games indexes: date/state, state/date, season/type"
+
+INDEXES = [
+    ("idx_games_date_state", "(gameDateTimeUtc, gameState)"),
+    ("idx_games_state_date", "(gameState, gameDateTimeUtc)"),
+    ("idx_games_season_type", "(gameSeason, gameType, gameState)"),
+]
+
+
+def _index_exists(cur, table: str, index: str) -> bool:  # type: ignore[no-untyped-def]
+    cur.execute(
+        "SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+        (table, index),
+    )
+    return cur.fetchone() is not None
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    for name, columns in INDEXES:
+        # Deployments may already carry hand-made indexes with these names
+        if not _index_exists(cur, "games", name):
+            cur.execute(f"CREATE INDEX {name} ON games {columns}")
@@ -0,0 +1,39 @@
+"""
+Per-game event count aggregates, maintained incrementally as plays are inserted.
+
+- game_team_event_counts: game x team x playType
+- game_player_event_counts: game x player x role x playType, where role is
+  'primary' (playPrimaryPlayerId), 'opposing' (playLosingPlayerId) or
+  'assist' (playSecondaryPlayerId / playTertiaryPlayerId)
+"""
+
+VERSION = 4
+DESCRIPTION = "Event count aggregates per game x team and game x player"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS game_team_event_counts (
+        gameId INT NOT NULL,
+        teamId INT NOT NULL,
+        playType VARCHAR(32) NOT NULL,
+        eventCount INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (gameId, teamId, playType)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS game_player_event_counts (
+        gameId INT NOT NULL,
+        playerId INT NOT NULL,
+        playerRole VARCHAR(10) NOT NULL,
+        playType VARCHAR(32) NOT NULL,
+        eventCount INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (gameId, playerId, playerRole, playType),
+        KEY idx_player_event_counts_player (playerId, playType, playerRole, gameId)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    for stmt in STATEMENTS:
+        cur.execute(stmt)
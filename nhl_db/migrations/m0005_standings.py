@@ -0,0 +1,58 @@
+"""
+Incrementally maintained standings.
+
+- teams gains teamConference / teamDivision (from the Records franchise payload)
+- games gains gameLastPeriodType (REG/OT/SO from the schedule's gameOutcome)
+- standings holds one row per season x team; standings_applied_games records
+  which final games have been counted so each game is applied exactly once
+"""
+
+VERSION = 5
+DESCRIPTION = "Standings table, team conference/division, game last period type"
+
+
+def _column_exists(cur, table: str, column: str) -> bool:  # type: ignore[no-untyped-def]
+    cur.execute(
+        "SELECT 1 FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1",
+        (table, column),
+    )
+    return cur.fetchone() is not None
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    if not _column_exists(cur, "teams", "teamConference"):
+        cur.execute("ALTER TABLE teams ADD COLUMN teamConference VARCHAR(50) NULL, ADD COLUMN teamDivision VARCHAR(50) NULL")
+    if not _column_exists(cur, "games", "gameLastPeriodType"):
+        cur.execute("ALTER TABLE games ADD COLUMN gameLastPeriodType VARCHAR(5) NULL")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS standings (
+            standingsSeason INT NOT NULL,
+            teamId INT NOT NULL,
+            conferenceName VARCHAR(50) NULL,
+            divisionName VARCHAR(50) NULL,
+            gamesPlayed SMALLINT NOT NULL DEFAULT 0,
+            wins SMALLINT NOT NULL DEFAULT 0,
+            losses SMALLINT NOT NULL DEFAULT 0,
+            otLosses SMALLINT NOT NULL DEFAULT 0,
+            regulationWins SMALLINT NOT NULL DEFAULT 0,
+            points SMALLINT NOT NULL DEFAULT 0,
+            goalsFor SMALLINT NOT NULL DEFAULT 0,
+            goalsAgainst SMALLINT NOT NULL DEFAULT 0,
+            goalDifferential SMALLINT AS (goalsFor - goalsAgainst) STORED,
+            PRIMARY KEY (standingsSeason, teamId),
+            KEY idx_standings_division (standingsSeason, conferenceName, divisionName, points)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS standings_applied_games (
+            gameId INT NOT NULL,
+            standingsSeason INT NOT NULL,
+            appliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (gameId),
+            KEY idx_standings_applied_season (standingsSeason)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
@@ -0,0 +1,40 @@
+"""
+Precomputed shot-location heatmap grids.
+
+Each grid is a fixed (x, y) count matrix per season x scope (team or player)
+x playType, stored as zlib-compressed little-endian uint32 cells.
+heatmap_applied_games records which final games are already binned in.
+"""
+
+VERSION = 6
+DESCRIPTION = "Heatmap grids and applied-games ledger"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS heatmap_grids (
+        gridSeason INT NOT NULL,
+        scopeType VARCHAR(6) NOT NULL,
+        scopeId INT NOT NULL,
+        playType VARCHAR(32) NOT NULL,
+        gridShape VARCHAR(16) NOT NULL,
+        gridData MEDIUMBLOB NOT NULL,
+        eventCount INT NOT NULL DEFAULT 0,
+        updatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (gridSeason, scopeType, scopeId, playType)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS heatmap_applied_games (
+        gameId INT NOT NULL,
+        gridSeason INT NOT NULL,
+        appliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (gameId),
+        KEY idx_heatmap_applied_season (gridSeason)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    for stmt in STATEMENTS:
+        cur.execute(stmt)
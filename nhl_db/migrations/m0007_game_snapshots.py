@@ -0,0 +1,30 @@
+"""
+Denormalized per-game snapshot documents.
+
+One row per game holding a zlib-compressed JSON document (teams, score, SOG,
+period/clock, last plays with player names) so a game page is one primary-key
+read. snapshotHash lets writers skip unchanged documents; rows with
+isFinal = 1 are never rewritten.
+"""
+
+VERSION = 7
+DESCRIPTION = "Game snapshot documents"
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS game_snapshots (
+        gameId INT NOT NULL,
+        snapshotVersion INT NOT NULL DEFAULT 1,
+        snapshotHash BINARY(20) NOT NULL,
+        isFinal TINYINT(1) NOT NULL DEFAULT 0,
+        document MEDIUMBLOB NOT NULL,
+        updatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (gameId)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    for stmt in STATEMENTS:
+        cur.execute(stmt)
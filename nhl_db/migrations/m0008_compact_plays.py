@@ -0,0 +1,156 @@
+"""
+Compact encoding for `plays`.
+
+Play types and zones move to small-int lookup tables (`play_types`,
+`play_zones`), the two "MM:SS" clocks become integer seconds, and a derived
+`playGameSecond` (seconds since the start of the game) makes time-window
+queries indexable. The encoded rows live in the partitioned table
+`plays_encoded`; `plays` becomes a view with the old column names and text
+values, so existing readers keep working. Writers must use `plays_encoded`.
+
+The old table is renamed to `plays_text` and its rows are converted in one
+INSERT ... SELECT. `plays_text` is dropped only once `plays_encoded` holds the
+same number of rows, and a rerun after a failure picks up from `plays_text`.
+"""
+
+from datetime import datetime
+
+from .m0002_partition_plays import partition_clause
+
+VERSION = 8
+DESCRIPTION = "Encode plays: lookup tables for type/zone, integer clocks, game second; plays becomes a view"
+
+PLAYS_TABLE = "plays_encoded"
+
+# Zone codes as sent by the API; ids are fixed so the mapper can encode without a lookup
+PLAY_ZONES = (("O", 1), ("D", 2), ("N", 3))
+
+# Length of a regulation period; overtime periods start after the same number of seconds
+PERIOD_SECONDS = 1200
+
+
+def _seconds_sql(col: str) -> str:
+    """SQL converting an "MM:SS" column to seconds; anything else becomes 0."""
+    return (
+        f"CASE WHEN {col} REGEXP '^[0-9]+:[0-9]{{2}}$' "
+        f"THEN CAST(SUBSTRING_INDEX({col}, ':', 1) AS UNSIGNED) * 60 + CAST(SUBSTRING_INDEX({col}, ':', -1) AS UNSIGNED) "
+        f"ELSE 0 END"
+    )
+
+
+def _clock_sql(col: str) -> str:
+    """SQL formatting a seconds column back to "MM:SS"."""
+    return f"CONCAT(LPAD({col} DIV 60, 2, '0'), ':', LPAD({col} MOD 60, 2, '0'))"
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS play_types (
+        playTypeId SMALLINT UNSIGNED NOT NULL AUTO_INCREMENT,
+        playTypeName VARCHAR(32) NOT NULL,
+        PRIMARY KEY (playTypeId),
+        UNIQUE KEY uq_play_types_name (playTypeName)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS play_zones (
+        playZoneId TINYINT UNSIGNED NOT NULL,
+        playZoneCode CHAR(1) NOT NULL,
+        PRIMARY KEY (playZoneId),
+        UNIQUE KEY uq_play_zones_code (playZoneCode)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    "INSERT IGNORE INTO play_zones (playZoneCode, playZoneId) VALUES "
+    + ", ".join(f"('{code}', {zone_id})" for code, zone_id in PLAY_ZONES),
+    "INSERT IGNORE INTO play_types (playTypeName) SELECT DISTINCT playType FROM plays_text WHERE playType IS NOT NULL ORDER BY playType",
+    "DROP TABLE IF EXISTS plays_encoded",
+]
+
+ENCODED_TABLE = """
+    CREATE TABLE plays_encoded (
+        playId BIGINT NOT NULL,
+        playGameId INT NOT NULL,
+        playIndex INT NOT NULL,
+        playTeamId INT NULL,
+        playPrimaryPlayerId INT NULL,
+        playLosingPlayerId INT NULL,
+        playSecondaryPlayerId INT NULL,
+        playTertiaryPlayerId INT NULL,
+        playPeriod TINYINT NOT NULL,
+        playTimeSeconds SMALLINT UNSIGNED NOT NULL,
+        playTimeRemainingSeconds SMALLINT UNSIGNED NOT NULL,
+        playGameSecond SMALLINT UNSIGNED NOT NULL,
+        playTypeId SMALLINT UNSIGNED NULL,
+        playZoneId TINYINT UNSIGNED NULL,
+        playXCoord SMALLINT NULL,
+        playYCoord SMALLINT NULL,
+        PRIMARY KEY (playGameId, playId),
+        KEY idx_plays_game_sort (playGameId, playIndex),
+        KEY idx_plays_player_type (playPrimaryPlayerId, playTypeId, playGameId),
+        KEY idx_plays_game_second (playGameId, playGameSecond)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+COPY = (
+    "INSERT INTO plays_encoded (playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
+    "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTimeSeconds, playTimeRemainingSeconds, "
+    "playGameSecond, playTypeId, playZoneId, playXCoord, playYCoord) "
+    "SELECT p.playId, p.playGameId, p.playIndex, p.playTeamId, p.playPrimaryPlayerId, p.playLosingPlayerId, "
+    "p.playSecondaryPlayerId, p.playTertiaryPlayerId, p.playPeriod, "
+    f"{_seconds_sql('p.playTime')}, {_seconds_sql('p.playTimeReamaining')}, "
+    f"GREATEST(p.playPeriod - 1, 0) * {PERIOD_SECONDS} + {_seconds_sql('p.playTime')}, "
+    "t.playTypeId, z.playZoneId, p.playXCoord, p.playYCoord "
+    "FROM plays_text p "
+    "LEFT JOIN play_types t ON t.playTypeName = p.playType "
+    "LEFT JOIN play_zones z ON z.playZoneCode = p.playZone"
+)
+
+# Same columns and text values as the old table, plus the encoded clocks
+COMPAT_VIEW = (
+    "CREATE VIEW plays AS SELECT p.playId, p.playGameId, p.playIndex, p.playTeamId, p.playPrimaryPlayerId, "
+    "p.playLosingPlayerId, p.playSecondaryPlayerId, p.playTertiaryPlayerId, p.playPeriod, "
+    f"{_clock_sql('p.playTimeSeconds')} AS playTime, {_clock_sql('p.playTimeRemainingSeconds')} AS playTimeReamaining, "
+    "t.playTypeName AS playType, z.playZoneCode AS playZone, p.playXCoord, p.playYCoord, "
+    "p.playTimeSeconds, p.playTimeRemainingSeconds, p.playGameSecond "
+    "FROM plays_encoded p "
+    "LEFT JOIN play_types t ON t.playTypeId = p.playTypeId "
+    "LEFT JOIN play_zones z ON z.playZoneId = p.playZoneId"
+)
+
+
+def _table_type(cur, table: str):  # type: ignore[no-untyped-def]
+    """'BASE TABLE', 'VIEW' or None if `table` does not exist."""
+    cur.execute(
+        "SELECT table_type FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,),
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _count(cur, table: str) -> int:  # type: ignore[no-untyped-def]
+    cur.execute(f"SELECT COUNT(*) FROM {table}")
+    return int(cur.fetchone()[0])
+
+
+def upgrade(cur) -> None:  # type: ignore[no-untyped-def]
+    if _table_type(cur, "plays") == "BASE TABLE":
+        if _table_type(cur, "plays_text") is not None:
+            raise RuntimeError("Both `plays` and `plays_text` exist; keep the complete one as `plays_text` and rerun migrate")
+        cur.execute("RENAME TABLE plays TO plays_text")
+    elif _table_type(cur, "plays_text") is None:
+        # An earlier run copied and dropped the text table but stopped before the view
+        cur.execute("DROP VIEW IF EXISTS plays")
+        cur.execute(COMPAT_VIEW)
+        return
+    cur.execute("DROP VIEW IF EXISTS plays")
+
+    for stmt in STATEMENTS:
+        cur.execute(stmt)
+    cur.execute(ENCODED_TABLE + partition_clause(datetime.now().year + 1))
+    cur.execute(COPY)
+    expected, copied = _count(cur, "plays_text"), _count(cur, "plays_encoded")
+    if copied != expected:
+        raise RuntimeError(f"plays_encoded has {copied} rows, plays_text {expected}; keeping plays_text, rerun migrate")
+    cur.execute("DROP TABLE plays_text")
+    cur.execute(COMPAT_VIEW)
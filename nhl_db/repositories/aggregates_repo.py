@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import Counter
+import logging
+
+from ..db import get_db_connection
+from ..storage import get_backend
+
+logger = logging.getLogger(__name__)
+
+# Positions within a mapped play row (see mappers.plays.map_play)
+_GAME, _TEAM, _PRIMARY, _OPPOSING, _SECONDARY, _TERTIARY, _TYPE = 1, 3, 4, 5, 6, 7, 11
+
+_ROLE_POSITIONS = (("primary", _PRIMARY), ("opposing", _OPPOSING), ("assist", _SECONDARY), ("assist", _TERTIARY))
+
+PLAYER_ROLE_COLUMNS = (
+    ("primary", "playPrimaryPlayerId"),
+    ("opposing", "playLosingPlayerId"),
+    ("assist", "playSecondaryPlayerId"),
+    ("assist", "playTertiaryPlayerId"),
+)
+
+
+def count_play_events(rows: Sequence[Tuple[Any, ...]]) -> Tuple[Counter, Counter]:
+    """Team and player event counts for mapped play rows, keyed like the aggregate tables."""
+    team_counts: Counter = Counter()
+    player_counts: Counter = Counter()
+    for r in rows:
+        ptype = r[_TYPE]
+        if not ptype:
+            continue
+        game_id = int(r[_GAME])
+        if r[_TEAM] is not None:
+            team_counts[(game_id, int(r[_TEAM]), ptype)] += 1
+        for role, idx in _ROLE_POSITIONS:
+            pid = r[idx]
+            if pid is not None:
+                player_counts[(game_id, int(pid), role, ptype)] += 1
+    return team_counts, player_counts
+
+
+def increment_event_counts_with_conn(conn, rows: Sequence[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
+    """Add counts for newly inserted play rows. Callers must pass each play only once."""
+    if not rows:
+        return
+    team_counts, player_counts = count_play_events(rows)
+    increment = (("eventCount", "{old[eventCount]} + {new[eventCount]}"),)
+    backend = get_backend()
+    team_sql = backend.upsert_sql(
+        "game_team_event_counts", ("gameId", "teamId", "playType", "eventCount"), ("gameId", "teamId", "playType"), increment
+    )
+    player_sql = backend.upsert_sql(
+        "game_player_event_counts",
+        ("gameId", "playerId", "playerRole", "playType", "eventCount"),
+        ("gameId", "playerId", "playerRole", "playType"),
+        increment,
+    )
+    cur = conn.cursor()
+    try:
+        try:
+            if team_counts:
+                cur.executemany(team_sql, [k + (n,) for k, n in team_counts.items()])
+            if player_counts:
+                cur.executemany(player_sql, [k + (n,) for k, n in player_counts.items()])
+        except Exception as e:
+            logger.error(f"Database error incrementing event counts for {len(rows)} plays: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def rebuild_event_counts_for_season_with_conn(conn, season_start_year: int) -> Tuple[int, int]:  # type: ignore[no-untyped-def]
+    """Recompute both aggregate tables from `plays` for every game of one season."""
+    lo = season_start_year * 1000000
+    hi = (season_start_year + 1) * 1000000
+    player_selects = " UNION ALL ".join(
+        f"SELECT p.playGameId AS gameId, p.{col} AS playerId, '{role}' AS playerRole, t.playTypeName AS playType "
+        f"FROM plays_encoded p JOIN play_types t ON t.playTypeId = p.playTypeId "
+        f"WHERE p.playGameId >= %s AND p.playGameId < %s AND p.{col} IS NOT NULL"
+        for role, col in PLAYER_ROLE_COLUMNS
+    )
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute("DELETE FROM game_team_event_counts WHERE gameId >= %s AND gameId < %s", (lo, hi))
+            cur.execute("DELETE FROM game_player_event_counts WHERE gameId >= %s AND gameId < %s", (lo, hi))
+            cur.execute(
+                "INSERT INTO game_team_event_counts (gameId, teamId, playType, eventCount) "
+                "SELECT p.playGameId, p.playTeamId, t.playTypeName, COUNT(*) FROM plays_encoded p "
+                "JOIN play_types t ON t.playTypeId = p.playTypeId "
+                "WHERE p.playGameId >= %s AND p.playGameId < %s AND p.playTeamId IS NOT NULL "
+                "GROUP BY p.playGameId, p.playTeamId, t.playTypeName",
+                (lo, hi),
+            )
+            team_rows = cur.rowcount
+            cur.execute(
+                "INSERT INTO game_player_event_counts (gameId, playerId, playerRole, playType, eventCount) "
+                f"SELECT gameId, playerId, playerRole, playType, COUNT(*) FROM ({player_selects}) p "
+                "GROUP BY gameId, playerId, playerRole, playType",
+                tuple(v for _ in PLAYER_ROLE_COLUMNS for v in (lo, hi)),
+            )
+            player_rows = cur.rowcount
+        except Exception as e:
+            logger.error(f"Database error rebuilding event counts for season starting {season_start_year}: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+    return team_rows, player_rows
+
+
+def get_game_team_event_counts(game_id: int) -> Dict[int, Dict[str, int]]:
+    """teamId -> playType -> count for one game."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT teamId, playType, eventCount FROM game_team_event_counts WHERE gameId = %s", (game_id,))
+            out: Dict[int, Dict[str, int]] = {}
+            for team_id, ptype, n in cur.fetchall():
+                out.setdefault(int(team_id), {})[str(ptype)] = int(n)
+            return out
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def get_game_player_event_counts(game_id: int, player_id: Optional[int] = None) -> List[Tuple[int, str, str, int]]:
+    """(playerId, playerRole, playType, count) rows for one game, optionally one player."""
+    sql = "SELECT playerId, playerRole, playType, eventCount FROM game_player_event_counts WHERE gameId = %s"
+    params: Tuple[Any, ...] = (game_id,)
+    if player_id is not None:
+        sql += " AND playerId = %s"
+        params = (game_id, player_id)
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, params)
+            return [(int(r[0]), str(r[1]), str(r[2]), int(r[3])) for r in cur.fetchall()]
+        finally:
+            cur.close()
+    finally:
+        conn.close()
@@ -1,23 +1,28 @@
 from typing import Any, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
 
 from ..db import get_db_connection
+from ..storage import get_backend
 
 logger = logging.getLogger(__name__)
 
+GAME_COLUMNS = (
+    "gameId", "gameSeason", "gameType", "gameDateTimeUtc", "gameVenue", "gameHomeTeamId", "gameAwayTeamId",
+    "gameState", "gameHomeScore", "gameAwayScore", "gameLastPeriodType",
+)
+
+
+def _upsert_games_sql() -> str:
+    # A schedule row without an outcome must not erase a known last period type
+    updates = GAME_COLUMNS[1:-1] + (("gameLastPeriodType", "COALESCE({new[gameLastPeriodType]}, {old[gameLastPeriodType]})"),)
+    return get_backend().upsert_sql("games", GAME_COLUMNS, ("gameId",), updates)
+
 
 def upsert_games(rows: List[Tuple[Any, ...]]) -> None:
     if not rows:
         return
-    sql = (
-        "INSERT INTO games (gameId, gameSeason, gameType, gameDateTimeUtc, gameVenue, gameHomeTeamId, gameAwayTeamId, "
-        "gameState, gameHomeScore, gameAwayScore) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE gameSeason=VALUES(gameSeason), gameType=VALUES(gameType), gameDateTimeUtc=VALUES(gameDateTimeUtc), "
-        "gameVenue=VALUES(gameVenue), gameHomeTeamId=VALUES(gameHomeTeamId), gameAwayTeamId=VALUES(gameAwayTeamId), "
-        "gameState=VALUES(gameState), gameHomeScore=VALUES(gameHomeScore), "
-        "gameAwayScore=VALUES(gameAwayScore)"
-    )
+    sql = _upsert_games_sql()
     conn = get_db_connection()
     try:
         cur = conn.cursor()
@@ -66,14 +71,7 @@ def update_game_fields(game_id: int, game_state: Optional[str], period: Optional
 def upsert_games_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
     if not rows:
         return
-    sql = (
-        "INSERT INTO games (gameId, gameSeason, gameType, gameDateTimeUtc, gameVenue, gameHomeTeamId, gameAwayTeamId, "
-        "gameState, gameHomeScore, gameAwayScore) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE gameSeason=VALUES(gameSeason), gameType=VALUES(gameType), gameDateTimeUtc=VALUES(gameDateTimeUtc), "
-        "gameVenue=VALUES(gameVenue), gameHomeTeamId=VALUES(gameHomeTeamId), gameAwayTeamId=VALUES(gameAwayTeamId), "
-        "gameState=VALUES(gameState), gameHomeScore=VALUES(gameHomeScore), gameAwayScore=VALUES(gameAwayScore)"
-    )
+    sql = _upsert_games_sql()
     cur = conn.cursor()
     try:
         try:
@@ -113,3 +111,76 @@ def update_game_fields_with_conn(conn, game_id: int, game_state: Optional[str],
         cur.close()
 
 
+def update_game_fields_batch_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
+    """`update_game_fields_with_conn` for many games in one executemany; rows are (game_id, game_state, period, clock, home_score, away_score, home_sog, away_sog)."""
+    if not rows:
+        return
+    sql = (
+        "UPDATE games SET gameState=%s, gamePeriod=%s, gameClock=%s, gameHomeScore=%s, gameAwayScore=%s, "
+        "gameHomeSOG=%s, gameAwaySOG=%s WHERE gameId=%s"
+    )
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, [tuple(r[1:]) + (r[0],) for r in rows])
+        except Exception as e:
+            logger.error(f"Database error updating game fields for {len(rows)} games: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def fetch_game_ids(start_utc: Optional[str] = None, end_utc: Optional[str] = None, states: Optional[List[str]] = None) -> List[int]:
+    """Ids of games starting in [start_utc, end_utc) ("YYYY-MM-DD HH:MM:SS") and in one of `states`, oldest first."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    if start_utc is not None:
+        clauses.append("gameDateTimeUtc >= %s")
+        params.append(start_utc)
+    if end_utc is not None:
+        clauses.append("gameDateTimeUtc < %s")
+        params.append(end_utc)
+    if states:
+        clauses.append(f"gameState IN ({', '.join(['%s'] * len(states))})")
+        params.extend(states)
+    sql = "SELECT gameId FROM games" + (f" WHERE {' AND '.join(clauses)}" if clauses else "") + " ORDER BY gameDateTimeUtc, gameId"
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, tuple(params))
+            return [int(row[0]) for row in cur.fetchall()]
+        except Exception as e:
+            logger.error(f"Database error selecting game ids: {e}", exc_info=True)
+            raise
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def has_games_to_watch(lead_seconds: int = 900, max_duration_hours: int = 8) -> bool:
+    """
+    True if a game is LIVE, or scheduled to start within `lead_seconds` (or started
+    less than `max_duration_hours` ago) and not final yet.
+    """
+    sql = (
+        "SELECT 1 FROM games WHERE gameDateTimeUtc BETWEEN %s AND %s "
+        "AND gameState IN ('FUT', 'PRE', 'LIVE', 'CRIT') LIMIT 1"
+    )
+    # Bounds computed here rather than with SQL date functions, which differ per engine
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    window = (
+        (now - timedelta(hours=int(max_duration_hours))).strftime("%Y-%m-%d %H:%M:%S"),
+        (now + timedelta(seconds=int(lead_seconds))).strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, window)
+            return cur.fetchone() is not None
+        finally:
+            cur.close()
+    finally:
+        conn.close()
@@ -0,0 +1,156 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+
+from ..db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+HEATMAP_PLAY_TYPES = ("shot-on-goal", "missed-shot", "blocked-shot", "goal")
+
+_PLAY_COLUMNS = (
+    "p.playGameId, p.playPeriod, COALESCE(p.playTeamId, -1), COALESCE(p.playPrimaryPlayerId, -1), t.playTypeName, "
+    "COALESCE(z.playZoneCode, ''), p.playXCoord, p.playYCoord"
+)
+
+_PLAY_TABLES = (
+    "plays_encoded p JOIN play_types t ON t.playTypeId = p.playTypeId "
+    "LEFT JOIN play_zones z ON z.playZoneId = p.playZoneId"
+)
+
+
+def fetch_unapplied_final_games_with_conn(conn, season: Optional[int] = None) -> List[Tuple[int, int]]:  # type: ignore[no-untyped-def]
+    """(gameId, gameSeason) of final games not yet binned into heatmap grids."""
+    sql = (
+        "SELECT g.gameId, g.gameSeason FROM games g "
+        "LEFT JOIN heatmap_applied_games h ON h.gameId = g.gameId "
+        "WHERE g.gameState IN ('FINAL', 'OFF') AND h.gameId IS NULL"
+    )
+    params: Tuple[Any, ...] = ()
+    if season is not None:
+        sql += " AND g.gameSeason = %s"
+        params = (season,)
+    cur = conn.cursor()
+    try:
+        cur.execute(sql + " ORDER BY g.gameId", params)
+        return [(int(r[0]), int(r[1])) for r in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def claim_games_with_conn(conn, season: int, game_ids: Iterable[int]) -> List[int]:  # type: ignore[no-untyped-def]
+    """Mark games as binned; returns only the ids this caller claimed (others were already applied)."""
+    claimed: List[int] = []
+    cur = conn.cursor()
+    try:
+        for game_id in game_ids:
+            cur.execute("INSERT IGNORE INTO heatmap_applied_games (gameId, gridSeason) VALUES (%s, %s)", (game_id, season))
+            if cur.rowcount == 1:
+                claimed.append(int(game_id))
+    finally:
+        cur.close()
+    return claimed
+
+
+def iter_heatmap_plays_with_conn(  # type: ignore[no-untyped-def]
+    conn,
+    game_ids: Optional[Sequence[int]] = None,
+    season_start_year: Optional[int] = None,
+    team_id: Optional[int] = None,
+    player_id: Optional[int] = None,
+    play_types: Sequence[str] = HEATMAP_PLAY_TYPES,
+    batch_size: int = 10000,
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Stream located plays in batches through an unbuffered cursor.
+
+    Filter by explicit game ids or by a season (playGameId range, so only that
+    season's partition is read), optionally narrowed to a team or player.
+    """
+    where = ["p.playXCoord IS NOT NULL", "p.playYCoord IS NOT NULL", f"t.playTypeName IN ({', '.join(['%s'] * len(play_types))})"]
+    params: List[Any] = list(play_types)
+    if game_ids is not None:
+        if not game_ids:
+            return
+        where.append(f"p.playGameId IN ({', '.join(['%s'] * len(game_ids))})")
+        params.extend(game_ids)
+    if season_start_year is not None:
+        where.append("p.playGameId >= %s AND p.playGameId < %s")
+        params.extend([season_start_year * 1000000, (season_start_year + 1) * 1000000])
+    if team_id is not None:
+        where.append("p.playTeamId = %s")
+        params.append(team_id)
+    if player_id is not None:
+        where.append("p.playPrimaryPlayerId = %s")
+        params.append(player_id)
+    cur = conn.cursor(buffered=False)
+    try:
+        cur.execute(f"SELECT {_PLAY_COLUMNS} FROM {_PLAY_TABLES} WHERE {' AND '.join(where)}", tuple(params))
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        cur.close()
+
+
+def fetch_grids_with_conn(conn, season: int, keys: Iterable[Tuple[str, int, str]]) -> Dict[Tuple[str, int, str], Tuple[bytes, str]]:  # type: ignore[no-untyped-def]
+    """Stored (gridData, gridShape) for the given (scopeType, scopeId, playType) keys, locked for update."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    out: Dict[Tuple[str, int, str], Tuple[bytes, str]] = {}
+    cur = conn.cursor()
+    try:
+        # Chunked so the IN list stays a reasonable size
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            cond = " OR ".join(["(scopeType = %s AND scopeId = %s AND playType = %s)"] * len(chunk))
+            cur.execute(
+                f"SELECT scopeType, scopeId, playType, gridData, gridShape FROM heatmap_grids "
+                f"WHERE gridSeason = %s AND ({cond}) FOR UPDATE",
+                (season,) + tuple(v for k in chunk for v in k),
+            )
+            for scope_type, scope_id, ptype, data, shape in cur.fetchall():
+                out[(str(scope_type), int(scope_id), str(ptype))] = (bytes(data), str(shape))
+    finally:
+        cur.close()
+    return out
+
+
+def upsert_grids_with_conn(conn, season: int, rows: Sequence[Tuple[str, int, str, str, bytes, int]]) -> None:  # type: ignore[no-untyped-def]
+    """rows: (scopeType, scopeId, playType, gridShape, gridData, eventCount)."""
+    if not rows:
+        return
+    sql = (
+        "INSERT INTO heatmap_grids (gridSeason, scopeType, scopeId, playType, gridShape, gridData, eventCount) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE gridShape=VALUES(gridShape), gridData=VALUES(gridData), eventCount=VALUES(eventCount)"
+    )
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, [(season,) + tuple(r) for r in rows])
+        except Exception as e:
+            logger.error(f"Database error upserting {len(rows)} heatmap grids for season {season}: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def get_grid(season: int, scope_type: str, scope_id: int, play_type: str) -> Optional[Tuple[bytes, str, int]]:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                "SELECT gridData, gridShape, eventCount FROM heatmap_grids "
+                "WHERE gridSeason = %s AND scopeType = %s AND scopeId = %s AND playType = %s",
+                (season, scope_type, scope_id, play_type),
+            )
+            row = cur.fetchone()
+            return (bytes(row[0]), str(row[1]), int(row[2])) if row else None
+        finally:
+            cur.close()
+    finally:
+        conn.close()
@@ -1,22 +1,21 @@
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Set, Tuple
 import logging
 
 from ..db import get_db_connection
+from ..storage import get_backend
 
 logger = logging.getLogger(__name__)
 
+PLAYER_COLUMNS = (
+    "playerId", "playerTeamId", "playerFirstName", "playerLastName", "playerNumber",
+    "playerPosition", "playerHeadshotUrl", "playerHomeCity", "playerHomeCountry",
+)
+
 
 def upsert_players(rows: List[Tuple[Any, ...]]) -> None:
     if not rows:
         return
-    sql = (
-        "INSERT INTO players (playerId, playerTeamId, playerFirstName, playerLastName, playerNumber, "
-        "playerPosition, playerHeadshotUrl, playerHomeCity, playerHomeCountry) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE playerTeamId=VALUES(playerTeamId), playerFirstName=VALUES(playerFirstName), "
-        "playerLastName=VALUES(playerLastName), playerNumber=VALUES(playerNumber), playerPosition=VALUES(playerPosition), "
-        "playerHeadshotUrl=VALUES(playerHeadshotUrl), playerHomeCity=VALUES(playerHomeCity), playerHomeCountry=VALUES(playerHomeCountry)"
-    )
+    sql = get_backend().upsert_sql("players", PLAYER_COLUMNS, ("playerId",), PLAYER_COLUMNS[1:])
     conn = get_db_connection()
     try:
         cur = conn.cursor()
@@ -31,3 +30,80 @@ def upsert_players(rows: List[Tuple[Any, ...]]) -> None:
         conn.close()
 
 
+def upsert_players_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
+    if not rows:
+        return
+    sql = get_backend().upsert_sql("players", PLAYER_COLUMNS, ("playerId",), PLAYER_COLUMNS[1:])
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, rows)
+        except Exception as e:
+            logger.error(f"Database error upserting {len(rows)} players with connection: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def insert_missing_players_with_conn(conn, rows: List[Tuple[Any, ...]]) -> int:  # type: ignore[no-untyped-def]
+    """Insert players that don't exist yet; existing rows (e.g. from a roster sync) are left untouched."""
+    if not rows:
+        return 0
+    sql = get_backend().insert_ignore_sql("players", PLAYER_COLUMNS)
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, rows)
+            return max(0, cur.rowcount)
+        except Exception as e:
+            logger.error(f"Database error inserting {len(rows)} missing players: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def fetch_player_ids_with_conn(conn) -> Set[int]:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT playerId FROM players")
+        return {int(r[0]) for r in cur.fetchall()}
+    finally:
+        cur.close()
+
+
+def fetch_players_for_search(player_ids: Optional[List[int]] = None) -> List[Tuple[Any, ...]]:
+    """
+    (playerId, firstName, lastName, teamId, teamAbbrev, teamIsActive, position, number,
+    headshotUrl, lastGameId) for all players, or only `player_ids`. lastGameId is the
+    most recent game with an event for the player (NULL if none).
+    """
+    sql = (
+        "SELECT p.playerId, p.playerFirstName, p.playerLastName, p.playerTeamId, t.teamAbbrev, "
+        "COALESCE(t.teamIsActive, 0), p.playerPosition, p.playerNumber, p.playerHeadshotUrl, r.lastGameId "
+        "FROM players p "
+        "LEFT JOIN teams t ON t.teamId = p.playerTeamId "
+        "LEFT JOIN (SELECT playerId, MAX(gameId) AS lastGameId FROM game_player_event_counts {where} GROUP BY playerId) r "
+        "ON r.playerId = p.playerId"
+    )
+    params: Tuple[Any, ...] = ()
+    if player_ids is not None:
+        if not player_ids:
+            return []
+        marks = ", ".join(["%s"] * len(player_ids))
+        sql = sql.format(where=f"WHERE playerId IN ({marks})") + f" WHERE p.playerId IN ({marks})"
+        params = tuple(player_ids) * 2
+    else:
+        sql = sql.format(where="")
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql, params)
+            return [tuple(r) for r in cur.fetchall()]
+        except Exception as e:
+            logger.error(f"Database error fetching players for search: {e}", exc_info=True)
+            raise
+        finally:
+            cur.close()
+    finally:
+        conn.close()
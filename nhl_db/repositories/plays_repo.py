@@ -1,32 +1,89 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Set, Tuple
 import logging
+import threading
 
 from ..db import get_db_connection
+from ..mappers.plays import encode_play, play_types_in_plays
+from ..storage import get_backend
 
 logger = logging.getLogger(__name__)
 
+# Plays are written to the encoded table; `plays` is a read-only compatibility view over it
+PLAY_COLUMNS = (
+    "playId", "playGameId", "playIndex", "playTeamId", "playPrimaryPlayerId", "playLosingPlayerId",
+    "playSecondaryPlayerId", "playTertiaryPlayerId", "playPeriod", "playTimeSeconds", "playTimeRemainingSeconds",
+    "playGameSecond", "playTypeId", "playZoneId", "playXCoord", "playYCoord",
+)
+
+
+def _upsert_plays_sql() -> str:
+    return get_backend().upsert_sql("plays_encoded", PLAY_COLUMNS, ("playGameId", "playId"), PLAY_COLUMNS[3:])
+
+# Per backend, playTypeName -> playTypeId; ids never change once assigned, so the cache never goes stale
+_play_type_ids: Dict[Any, Dict[str, int]] = {}
+_play_type_lock = threading.Lock()
+
+
+def _select_play_type_ids(cur, names: List[str]) -> Dict[str, int]:  # type: ignore[no-untyped-def]
+    cur.execute(
+        f"SELECT playTypeName, playTypeId FROM play_types WHERE playTypeName IN ({', '.join(['%s'] * len(names))})",
+        tuple(names),
+    )
+    return {str(r[0]): int(r[1]) for r in cur.fetchall()}
+
+
+def get_play_type_ids(names: Iterable[str]) -> Dict[str, int]:
+    """
+    `play_types` ids for the given type names, adding names seen for the first time.
+
+    New names are inserted on their own autocommitted connection, so a rolled-back
+    plays transaction can never leave a cached id without its lookup row. Callers
+    that write plays in a transaction resolve the ids before starting it (SQLite
+    allows one writer at a time, so the insert would wait on the caller's lock).
+    """
+    names = set(names)
+    backend = get_backend()
+    with _play_type_lock:
+        cached = _play_type_ids.setdefault(backend, {})
+        missing = sorted(n for n in names if n not in cached)
+        if missing:
+            conn = get_db_connection()
+            try:
+                cur = conn.cursor()
+                try:
+                    found = _select_play_type_ids(cur, missing)
+                    new = [n for n in missing if n not in found]
+                    if new:
+                        cur.executemany(backend.insert_ignore_sql("play_types", ("playTypeName",)), [(n,) for n in new])
+                        found.update(_select_play_type_ids(cur, new))
+                        logger.info(f"Added play types: {', '.join(new)}")
+                    cached.update(found)
+                except Exception as e:
+                    logger.error(f"Database error resolving play type ids for {missing}: {e}", exc_info=True)
+                    raise
+                finally:
+                    cur.close()
+            finally:
+                conn.close()
+        return {n: cached[n] for n in names if n in cached}
+
+
+def encode_plays(rows: List[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+    """map_play rows -> `plays_encoded` rows."""
+    type_ids = get_play_type_ids(play_types_in_plays(rows))
+    return [encode_play(r, type_ids) for r in rows]
+
 
 def upsert_plays_from_pbp(game_id: int, pbp: Dict[str, Any], rows: List[Tuple[Any, ...]]) -> int:
     if not rows:
         return 0
 
-    sql = (
-        "INSERT INTO plays (playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
-        "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
-        "playType, playZone, playXCoord, playYCoord) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE playTeamId=VALUES(playTeamId), playPrimaryPlayerId=VALUES(playPrimaryPlayerId), "
-        "playLosingPlayerId=VALUES(playLosingPlayerId), playSecondaryPlayerId=VALUES(playSecondaryPlayerId), "
-        "playTertiaryPlayerId=VALUES(playTertiaryPlayerId), playPeriod=VALUES(playPeriod), playTime=VALUES(playTime), "
-        "playTimeReamaining=VALUES(playTimeReamaining), playType=VALUES(playType), "
-        "playZone=VALUES(playZone), playXCoord=VALUES(playXCoord), playYCoord=VALUES(playYCoord)"
-    )
-
+    encoded = encode_plays(rows)
     conn = get_db_connection()
     try:
         cur = conn.cursor()
         try:
-            cur.executemany(sql, rows)
+            cur.executemany(_upsert_plays_sql(), encoded)
         except Exception as e:
             logger.error(f"Database error upserting {len(rows)} plays for game_id={game_id}: {e}", exc_info=True)
             raise
@@ -41,22 +98,11 @@ def upsert_plays_with_conn(conn, rows: List[Tuple[Any, ...]]) -> int:  # type: i
     if not rows:
         return 0
 
-    sql = (
-        "INSERT INTO plays (playId, playGameId, playIndex, playTeamId, playPrimaryPlayerId, playLosingPlayerId, "
-        "playSecondaryPlayerId, playTertiaryPlayerId, playPeriod, playTime, playTimeReamaining, "
-        "playType, playZone, playXCoord, playYCoord) "
-        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE playTeamId=VALUES(playTeamId), playPrimaryPlayerId=VALUES(playPrimaryPlayerId), "
-        "playLosingPlayerId=VALUES(playLosingPlayerId), playSecondaryPlayerId=VALUES(playSecondaryPlayerId), "
-        "playTertiaryPlayerId=VALUES(playTertiaryPlayerId), playPeriod=VALUES(playPeriod), playTime=VALUES(playTime), "
-        "playTimeReamaining=VALUES(playTimeReamaining), playType=VALUES(playType), "
-        "playZone=VALUES(playZone), playXCoord=VALUES(playXCoord), playYCoord=VALUES(playYCoord)"
-    )
-
+    encoded = encode_plays(rows)
     cur = conn.cursor()
     try:
         try:
-            cur.executemany(sql, rows)
+            cur.executemany(_upsert_plays_sql(), encoded)
         except Exception as e:
             logger.error(f"Database error upserting {len(rows)} plays with connection: {e}", exc_info=True)
             raise
@@ -65,3 +111,37 @@ def upsert_plays_with_conn(conn, rows: List[Tuple[Any, ...]]) -> int:  # type: i
     return len(rows)
 
 
+def fetch_play_ids_for_game_with_conn(conn, game_id: int, for_update: bool = False) -> Set[int]:  # type: ignore[no-untyped-def]
+    sql = "SELECT playId FROM plays_encoded WHERE playGameId = %s"
+    if for_update:
+        # Serializes concurrent writers of the same game (e.g. watch-live and update-live)
+        sql = get_backend().for_update(sql)
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(sql, (game_id,))
+            return {int(row[0]) for row in cur.fetchall()}
+        except Exception as e:
+            logger.error(f"Database error fetching play ids for game_id={game_id}: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def fetch_plays_in_window_with_conn(conn, game_id: int, start_second: int, end_second: int) -> List[Tuple[Any, ...]]:  # type: ignore[no-untyped-def]
+    """Plays of one game with start_second <= playGameSecond < end_second, in sortOrder, with text type/zone."""
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT p.playId, p.playIndex, p.playPeriod, p.playTimeSeconds, p.playGameSecond, t.playTypeName, "
+            "z.playZoneCode, p.playTeamId, p.playPrimaryPlayerId, p.playXCoord, p.playYCoord "
+            "FROM plays_encoded p "
+            "LEFT JOIN play_types t ON t.playTypeId = p.playTypeId "
+            "LEFT JOIN play_zones z ON z.playZoneId = p.playZoneId "
+            "WHERE p.playGameId = %s AND p.playGameSecond >= %s AND p.playGameSecond < %s "
+            "ORDER BY p.playIndex",
+            (game_id, start_second, end_second),
+        )
+        return [tuple(r) for r in cur.fetchall()]
+    finally:
+        cur.close()
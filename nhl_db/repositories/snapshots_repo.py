@@ -0,0 +1,57 @@
+from typing import Optional, Tuple
+import logging
+
+from ..db import get_db_connection
+from ..storage import get_backend
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_snapshot_with_conn(conn, game_id: int, document: bytes, digest: bytes, is_final: bool) -> bool:  # type: ignore[no-untyped-def]
+    """
+    Write a game's snapshot unless it is unchanged or the stored one is already final.
+
+    Final rows are immutable: every column keeps its stored value once isFinal = 1.
+    Returns True if a row was inserted or changed.
+    """
+    # MySQL runs assignments left to right and they see earlier ones, so hash and isFinal are updated last
+    keep = "{old[isFinal]} = 1 OR {old[snapshotHash]} = {new[snapshotHash]}"
+    sql = get_backend().upsert_sql(
+        "game_snapshots",
+        ("gameId", "snapshotHash", "isFinal", "document"),
+        ("gameId",),
+        (
+            ("snapshotVersion", f"CASE WHEN {keep} THEN {{old[snapshotVersion]}} ELSE {{old[snapshotVersion]}} + 1 END"),
+            ("document", f"CASE WHEN {keep} THEN {{old[document]}} ELSE {{new[document]}} END"),
+            ("snapshotHash", f"CASE WHEN {keep} THEN {{old[snapshotHash]}} ELSE {{new[snapshotHash]}} END"),
+            ("isFinal", "CASE WHEN {old[isFinal]} = 1 THEN {old[isFinal]} ELSE {new[isFinal]} END"),
+        ),
+        where="{old[isFinal]} = 0 AND ({old[snapshotHash]} <> {new[snapshotHash]} OR {new[isFinal]} = 1)",
+    )
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(sql, (game_id, digest, 1 if is_final else 0, document))
+            # MySQL reports 1 for an insert, 2 for a changed row, 0 when nothing changed; SQLite skips
+            # unchanged rows through the upsert's WHERE and reports 0 for them
+            return cur.rowcount > 0
+        except Exception as e:
+            logger.error(f"Database error writing snapshot for game {game_id}: {e}", exc_info=True, extra={"game_id": game_id})
+            raise
+    finally:
+        cur.close()
+
+
+def get_snapshot(game_id: int) -> Optional[Tuple[bytes, int, bool]]:
+    """(document blob, snapshotVersion, isFinal) by primary key."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT document, snapshotVersion, isFinal FROM game_snapshots WHERE gameId = %s", (game_id,))
+            row = cur.fetchone()
+            return (bytes(row[0]), int(row[1]), bool(row[2])) if row else None
+        finally:
+            cur.close()
+    finally:
+        conn.close()
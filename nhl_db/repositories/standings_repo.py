@@ -0,0 +1,155 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from ..db import get_db_connection
+from ..storage import get_backend
+
+logger = logging.getLogger(__name__)
+
+FINAL_GAME_STATES = ("FINAL", "OFF")
+REGULAR_SEASON_GAME_TYPE = 2
+
+# Per-team delta columns, in the order standings_delta() returns them
+STANDINGS_DELTA_COLUMNS = ("gamesPlayed", "wins", "losses", "otLosses", "regulationWins", "points", "goalsFor", "goalsAgainst")
+
+
+def last_period_type(game_type: int, last_period: Optional[str], period: Optional[int]) -> str:
+    """REG/OT/SO, from the schedule outcome when present, else from the final period number."""
+    if last_period:
+        return str(last_period).upper()
+    if period is None or int(period) <= 3:
+        return "REG"
+    if game_type == REGULAR_SEASON_GAME_TYPE and int(period) >= 5:
+        return "SO"
+    return "OT"
+
+
+def standings_delta(goals_for: int, goals_against: int, period_type: str) -> Tuple[int, ...]:
+    """One team's contribution from one final game, matching STANDINGS_DELTA_COLUMNS."""
+    won = goals_for > goals_against
+    extra_time = period_type in ("OT", "SO")
+    win = 1 if won else 0
+    loss = 1 if not won and not extra_time else 0
+    ot_loss = 1 if not won and extra_time else 0
+    regulation_win = 1 if won and not extra_time else 0
+    points = 2 * win + ot_loss
+    return (1, win, loss, ot_loss, regulation_win, points, goals_for, goals_against)
+
+
+def apply_final_games_with_conn(conn, game_ids: Iterable[int]) -> int:  # type: ignore[no-untyped-def]
+    """
+    Add final regular-season games to `standings`, each game at most once.
+
+    A game is claimed by inserting it into `standings_applied_games`; only
+    games whose claim succeeds are counted, so calling this repeatedly (from
+    the live path, schedule upserts or concurrent processes) is safe. Must run
+    inside the caller's transaction. Returns the number of games applied.
+    """
+    ids = sorted({int(g) for g in game_ids})
+    if not ids:
+        return 0
+    placeholders = ", ".join(["%s"] * len(ids))
+    cur = conn.cursor()
+    try:
+        try:
+            cur.execute(
+                "SELECT gameId, gameSeason, gameType, gameHomeTeamId, gameAwayTeamId, gameHomeScore, gameAwayScore, "
+                "gamePeriod, gameLastPeriodType FROM games "
+                f"WHERE gameId IN ({placeholders}) AND gameType = %s AND gameState IN (%s, %s)",
+                tuple(ids) + (REGULAR_SEASON_GAME_TYPE,) + FINAL_GAME_STATES,
+            )
+            games = cur.fetchall()
+
+            deltas: Dict[Tuple[int, int], List[int]] = {}
+            applied = 0
+            for game_id, season, game_type, home_id, away_id, home_score, away_score, period, last_period in games:
+                home_score, away_score = int(home_score or 0), int(away_score or 0)
+                if home_score == away_score:
+                    # Final without a winner means the payload isn't settled yet; a later update applies it
+                    continue
+                cur.execute(get_backend().insert_ignore_sql("standings_applied_games", ("gameId", "standingsSeason")), (game_id, season))
+                if cur.rowcount != 1:
+                    continue
+                applied += 1
+                ptype = last_period_type(int(game_type), last_period, period)
+                for team_id, gf, ga in ((home_id, home_score, away_score), (away_id, away_score, home_score)):
+                    acc = deltas.setdefault((int(season), int(team_id)), [0] * len(STANDINGS_DELTA_COLUMNS))
+                    for i, v in enumerate(standings_delta(gf, ga, ptype)):
+                        acc[i] += v
+
+            if deltas:
+                _increment_standings_with_cur(cur, deltas)
+        except Exception as e:
+            logger.error(f"Database error applying {len(ids)} final games to standings: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+    return applied
+
+
+def _increment_standings_with_cur(cur, deltas: Dict[Tuple[int, int], List[int]]) -> None:  # type: ignore[no-untyped-def]
+    team_ids = sorted({team_id for _, team_id in deltas})
+    cur.execute(
+        f"SELECT teamId, teamConference, teamDivision FROM teams WHERE teamId IN ({', '.join(['%s'] * len(team_ids))})",
+        tuple(team_ids),
+    )
+    groups = {int(r[0]): (r[1], r[2]) for r in cur.fetchall()}
+    sql = get_backend().upsert_sql(
+        "standings",
+        ("standingsSeason", "teamId", "conferenceName", "divisionName") + tuple(STANDINGS_DELTA_COLUMNS),
+        ("standingsSeason", "teamId"),
+        tuple((c, f"{{old[{c}]}} + {{new[{c}]}}") for c in STANDINGS_DELTA_COLUMNS),
+    )
+    rows = []
+    for (season, team_id), acc in sorted(deltas.items()):
+        conference, division = groups.get(team_id, (None, None))
+        rows.append((season, team_id, conference, division) + tuple(acc))
+    cur.executemany(sql, rows)
+
+
+def clear_season_standings_with_conn(conn, season: int) -> None:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM standings WHERE standingsSeason = %s", (season,))
+        cur.execute("DELETE FROM standings_applied_games WHERE standingsSeason = %s", (season,))
+    finally:
+        cur.close()
+
+
+def fetch_final_game_ids_for_season_with_conn(conn, season: int) -> List[int]:  # type: ignore[no-untyped-def]
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            "SELECT gameId FROM games WHERE gameSeason = %s AND gameType = %s AND gameState IN (%s, %s)",
+            (season, REGULAR_SEASON_GAME_TYPE) + FINAL_GAME_STATES,
+        )
+        return [int(r[0]) for r in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def get_standings(season: int, conference: Optional[str] = None, division: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Standings rows for a season (optionally one conference/division), best first."""
+    sql = (
+        "SELECT s.teamId, t.teamAbbrev, s.conferenceName, s.divisionName, s.gamesPlayed, s.wins, s.losses, s.otLosses, "
+        "s.regulationWins, s.points, s.goalsFor, s.goalsAgainst, s.goalDifferential "
+        "FROM standings s LEFT JOIN teams t ON t.teamId = s.teamId WHERE s.standingsSeason = %s"
+    )
+    params: List[Any] = [season]
+    if conference:
+        sql += " AND s.conferenceName = %s"
+        params.append(conference)
+    if division:
+        sql += " AND s.divisionName = %s"
+        params.append(division)
+    sql += " ORDER BY s.points DESC, s.regulationWins DESC, s.goalDifferential DESC"
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(sql, tuple(params))
+            return list(cur.fetchall())
+        finally:
+            cur.close()
+    finally:
+        conn.close()
@@ -1,20 +1,18 @@
-from typing import Any, List, Tuple
+from typing import Any, List, Set, Tuple
 import logging
 
 from ..db import get_db_connection
+from ..storage import get_backend
 
 logger = logging.getLogger(__name__)
 
+TEAM_COLUMNS = ("teamId", "teamName", "teamCity", "teamAbbrev", "teamIsActive", "teamLogoUrl", "teamConference", "teamDivision")
+
 
 def upsert_teams(rows: List[Tuple[Any, ...]]) -> None:
     if not rows:
         return
-    sql = (
-        "INSERT INTO teams (teamId, teamName, teamCity, teamAbbrev, teamIsActive, teamLogoUrl) "
-        "VALUES (%s, %s, %s, %s, %s, %s) "
-        "ON DUPLICATE KEY UPDATE teamName=VALUES(teamName), teamCity=VALUES(teamCity), teamAbbrev=VALUES(teamAbbrev), "
-        "teamIsActive=VALUES(teamIsActive), teamLogoUrl=VALUES(teamLogoUrl)"
-    )
+    sql = get_backend().upsert_sql("teams", TEAM_COLUMNS, ("teamId",), TEAM_COLUMNS[1:])
     conn = get_db_connection()
     try:
         cur = conn.cursor()
@@ -29,3 +27,45 @@ def upsert_teams(rows: List[Tuple[Any, ...]]) -> None:
         conn.close()
 
 
+def upsert_teams_with_conn(conn, rows: List[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
+    if not rows:
+        return
+    sql = get_backend().upsert_sql("teams", TEAM_COLUMNS, ("teamId",), TEAM_COLUMNS[1:])
+    cur = conn.cursor()
+    try:
+        try:
+            cur.executemany(sql, rows)
+        except Exception as e:
+            logger.error(f"Database error upserting {len(rows)} teams with connection: {e}", exc_info=True)
+            raise
+    finally:
+        cur.close()
+
+
+def get_active_teams() -> List[Tuple[int, str]]:
+    """(teamId, teamAbbrev) of every active team."""
+    sql = "SELECT teamId, teamAbbrev FROM teams WHERE teamIsActive = 1 AND teamAbbrev IS NOT NULL"
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql)
+            return [(int(row[0]), str(row[1])) for row in cur.fetchall()]
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def get_team_ids() -> Set[int]:
+    """teamId of every team, active or not."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT teamId FROM teams")
+            return {int(row[0]) for row in cur.fetchall()}
+        finally:
+            cur.close()
+    finally:
+        conn.close()
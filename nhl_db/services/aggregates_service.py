@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Tuple
+import logging
+
+from ..db import get_db_connection
+from ..repositories.aggregates_repo import increment_event_counts_with_conn, rebuild_event_counts_for_season_with_conn
+from ..mappers.plays import play_types_in_plays
+from ..repositories.plays_repo import fetch_play_ids_for_game_with_conn, get_play_type_ids, upsert_plays_with_conn
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_plays_and_aggregates_with_conn(conn, game_id: int, rows: List[Tuple[Any, ...]]) -> Tuple[int, int]:  # type: ignore[no-untyped-def]
+    """
+    Upsert a game's plays and add only the new ones to the event aggregates.
+
+    Runs in one transaction: the game's existing play ids are read with
+    FOR UPDATE, so a concurrent writer of the same game waits and then sees
+    these rows as existing, and no play is ever counted twice.
+    Returns (rows upserted, new plays counted).
+    """
+    if not rows:
+        return 0, 0
+    # New play types are added outside the transaction (see get_play_type_ids)
+    get_play_type_ids(play_types_in_plays(rows))
+    conn.start_transaction()
+    try:
+        counts = upsert_plays_and_aggregates_for_games_with_conn(conn, {game_id: rows})
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return counts[game_id]
+
+
+def upsert_plays_and_aggregates_for_games_with_conn(conn, plays_by_game: Dict[int, List[Tuple[Any, ...]]]) -> Dict[int, Tuple[int, int]]:  # type: ignore[no-untyped-def]
+    """
+    Several games' plays in one upsert, with only new plays added to the aggregates.
+
+    Must run inside the caller's transaction, with the play type ids already
+    resolved (see `get_play_type_ids`). Returns game_id -> (rows upserted, new plays counted).
+    Games are locked in id order, so concurrent multi-game writers cannot deadlock.
+    """
+    all_rows: List[Tuple[Any, ...]] = []
+    new_rows: List[Tuple[Any, ...]] = []
+    counts: Dict[int, Tuple[int, int]] = {}
+    for game_id in sorted(plays_by_game):
+        rows = plays_by_game[game_id]
+        existing = fetch_play_ids_for_game_with_conn(conn, game_id, for_update=True) if rows else set()
+        game_new = [r for r in rows if int(r[0]) not in existing]
+        all_rows.extend(rows)
+        new_rows.extend(game_new)
+        counts[game_id] = (len(rows), len(game_new))
+    upsert_plays_with_conn(conn, all_rows)
+    increment_event_counts_with_conn(conn, new_rows)
+    return counts
+
+
+def season_start_year(season: str) -> int:
+    s = (season or "").strip()
+    if len(s) == 8 and s.isdigit():
+        return int(s[:4])
+    if len(s) == 4 and s.isdigit():
+        return int(s)
+    raise ValueError(f"Invalid season '{season}'; expected YYYYYYYY (e.g. 20252026) or a start year")
+
+
+def rebuild_aggregates(season: str) -> Tuple[int, int]:
+    """Reconstruct both aggregate tables from `plays` for one season."""
+    year = season_start_year(season)
+    conn = get_db_connection()
+    try:
+        conn.start_transaction()
+        try:
+            result = rebuild_event_counts_for_season_with_conn(conn, year)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error rebuilding aggregates for season {season}: {e}", exc_info=True)
+            raise
+        return result
+    finally:
+        conn.close()
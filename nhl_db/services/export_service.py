@@ -0,0 +1,324 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import logging
+import os
+import shutil
+import uuid
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..db import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "_export_state.json"
+FINAL_STATES = ("FINAL", "OFF")
+
+TEAMS_SCHEMA = pa.schema([
+    ("teamId", pa.int32()),
+    ("teamName", pa.string()),
+    ("teamCity", pa.string()),
+    ("teamAbbrev", pa.string()),
+    ("teamIsActive", pa.bool_()),
+    ("teamLogoUrl", pa.string()),
+    ("teamConference", pa.string()),
+    ("teamDivision", pa.string()),
+])
+
+PLAYERS_SCHEMA = pa.schema([
+    ("playerId", pa.int32()),
+    ("playerTeamId", pa.int32()),
+    ("playerFirstName", pa.string()),
+    ("playerLastName", pa.string()),
+    ("playerNumber", pa.int16()),
+    ("playerPosition", pa.string()),
+    ("playerHeadshotUrl", pa.string()),
+    ("playerHomeCity", pa.string()),
+    ("playerHomeCountry", pa.string()),
+])
+
+GAMES_SCHEMA = pa.schema([
+    ("gameId", pa.int32()),
+    ("gameSeason", pa.int32()),
+    ("gameType", pa.int8()),
+    ("gameDateTimeUtc", pa.timestamp("s", tz="UTC")),
+    ("gameVenue", pa.string()),
+    ("gameHomeTeamId", pa.int32()),
+    ("gameAwayTeamId", pa.int32()),
+    ("gameState", pa.string()),
+    ("gamePeriod", pa.int8()),
+    ("gameClock", pa.string()),
+    ("gameHomeScore", pa.int16()),
+    ("gameAwayScore", pa.int16()),
+    ("gameHomeSOG", pa.int16()),
+    ("gameAwaySOG", pa.int16()),
+    ("gameLastPeriodType", pa.string()),
+])
+
+PLAYS_SCHEMA = pa.schema([
+    ("playId", pa.int64()),
+    ("playGameId", pa.int32()),
+    ("playIndex", pa.int32()),
+    ("playTeamId", pa.int32()),
+    ("playPrimaryPlayerId", pa.int32()),
+    ("playLosingPlayerId", pa.int32()),
+    ("playSecondaryPlayerId", pa.int32()),
+    ("playTertiaryPlayerId", pa.int32()),
+    ("playPeriod", pa.int8()),
+    ("playTime", pa.string()),
+    ("playTimeReamaining", pa.string()),
+    ("playType", pa.string()),
+    ("playZone", pa.string()),
+    ("playXCoord", pa.int16()),
+    ("playYCoord", pa.int16()),
+])
+
+
+def _season_of_game_id(game_id: int) -> int:
+    year = int(game_id) // 1000000
+    return year * 10000 + year + 1
+
+
+def _stream_rows(conn, sql: str, params: Sequence[Any] = (), batch_size: int = 50000) -> Iterator[List[Tuple[Any, ...]]]:  # type: ignore[no-untyped-def]
+    """Yield result batches from an unbuffered (server-streamed) cursor; memory stays at one batch."""
+    cur = conn.cursor(buffered=False)
+    try:
+        cur.execute(sql, tuple(params))
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        cur.close()
+
+
+def _utc_datetime(value: Any) -> Any:
+    """DATETIME values as UTC datetimes; SQLite stores them as "YYYY-MM-DD HH:MM:SS" text."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _to_record_batch(rows: List[Tuple[Any, ...]], schema: pa.Schema) -> pa.RecordBatch:
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_boolean(field.type):
+            # TINYINT(1) columns come back as 1/0
+            values = [None if v is None else bool(v) for v in values]
+        elif pa.types.is_timestamp(field.type):
+            values = [_utc_datetime(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _PartitionedWriter:
+    """
+    Lazily opens one Parquet file per season partition: <root>/season=<season>/<name>.
+
+    Files are written under a hidden temporary name; `staged()` lists the
+    (temporary, final) paths to publish, `discard()` deletes them.
+    """
+
+    def __init__(self, root: Path, file_name: str, schema: pa.Schema, season_of_row) -> None:  # type: ignore[no-untyped-def]
+        self.root = root
+        self.file_name = file_name
+        self.schema = schema
+        self.season_of_row = season_of_row
+        self.writers: Dict[int, pq.ParquetWriter] = {}
+        self.rows = 0
+
+    def _path(self, season: int, tmp: bool = False) -> Path:
+        return self.root / f"season={season}" / (f".{self.file_name}.tmp" if tmp else self.file_name)
+
+    def write(self, rows: List[Tuple[Any, ...]]) -> None:
+        by_season: Dict[int, List[Tuple[Any, ...]]] = {}
+        for r in rows:
+            by_season.setdefault(self.season_of_row(r), []).append(r)
+        for season, season_rows in by_season.items():
+            writer = self.writers.get(season)
+            if writer is None:
+                path = self._path(season, tmp=True)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writer = pq.ParquetWriter(str(path), self.schema, compression="zstd")
+                self.writers[season] = writer
+            writer.write_batch(_to_record_batch(season_rows, self.schema))
+            self.rows += len(season_rows)
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+    def staged(self) -> List[Tuple[Path, Path]]:
+        return [(self._path(season, tmp=True), self._path(season)) for season in self.writers]
+
+    def discard(self) -> None:
+        for season in self.writers:
+            try:
+                os.remove(self._path(season, tmp=True))
+            except FileNotFoundError:
+                pass
+
+
+def _write_snapshot(conn, out_dir: Path, table: str, schema: pa.Schema, batch_size: int) -> int:  # type: ignore[no-untyped-def]
+    """Full rewrite of a small dimension table; the file is swapped in atomically."""
+    target_dir = out_dir / table
+    target_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_dir / f".{table}.parquet.tmp"
+    count = 0
+    writer = pq.ParquetWriter(str(tmp_path), schema, compression="zstd")
+    try:
+        for batch in _stream_rows(conn, f"SELECT {', '.join(schema.names)} FROM {table}", batch_size=batch_size):
+            writer.write_batch(_to_record_batch(batch, schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    os.replace(tmp_path, target_dir / f"{table}.parquet")
+    return count
+
+
+def _load_state(out_dir: Path) -> Dict[str, Any]:
+    path = out_dir / STATE_FILE
+    if not path.exists():
+        return {"exportedGameIds": [], "lastExportAt": None, "pending": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_state(out_dir: Path, state: Dict[str, Any]) -> None:
+    tmp = out_dir / f".{STATE_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, out_dir / STATE_FILE)
+
+
+def _publish(root: Path, pending: List[List[str]]) -> None:
+    """Move staged files and directories (paths relative to `root`) into place; safe to repeat."""
+    for src, dst in pending:
+        src_path, dst_path = root / src, root / dst
+        if not src_path.exists():
+            # Moved by an earlier, interrupted attempt
+            continue
+        if src_path.is_dir() and dst_path.exists():
+            shutil.rmtree(dst_path)
+        dst_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(src_path, dst_path)
+
+
+def _finish_publishing(root: Path, state: Dict[str, Any]) -> None:
+    """Publish what the saved state lists as pending, then drop output of runs that never saved their state."""
+    if state.get("pending"):
+        _publish(root, state["pending"])
+        state["pending"] = []
+        _save_state(root, state)
+    for tmp in root.glob("*/season=*/.part-*.tmp"):
+        tmp.unlink()
+    for staging in root.glob(".full-*"):
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def export_parquet(out_dir: str, full: bool = False, batch_size: int = 50000, games_per_query: int = 200) -> Dict[str, int]:
+    """
+    Stream teams, players, games and plays into Parquet files partitioned by season.
+
+    - teams / players: rewritten in full every run (small dimension tables)
+    - games / plays: final games only. Incremental by default: games not exported
+      by an earlier run (per the state file in `out_dir`) are written as a new
+      part file per season partition. `full=True` rewrites both from scratch.
+
+    Rows are read through unbuffered cursors in `batch_size` batches, so memory
+    stays bounded regardless of table size. Returns row counts per table.
+
+    New part files are written under hidden names (a full export into a hidden
+    staging directory) and published only after the state file has recorded
+    their games together with the list of moves still to do. A failed run
+    changes neither the published files nor the state; a run interrupted while
+    publishing is completed at the start of the next one.
+    """
+    root = Path(out_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    state = _load_state(root)
+    _finish_publishing(root, state)
+    exported: Set[int] = set() if full else {int(g) for g in state.get("exportedGameIds", [])}
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    # Unique even for runs started within the same second, so publishing never overwrites another run's part
+    run_tag = f"{run_id}-{uuid.uuid4().hex[:8]}"
+    part_name = f"part-{run_tag}.parquet"
+    data_root = root / f".full-{run_tag}" if full else root
+    counts: Dict[str, int] = {}
+    parts: List[_PartitionedWriter] = []
+
+    conn = get_db_connection()
+    try:
+        counts["teams"] = _write_snapshot(conn, root, "teams", TEAMS_SCHEMA, batch_size)
+        counts["players"] = _write_snapshot(conn, root, "players", PLAYERS_SCHEMA, batch_size)
+
+        if full:
+            # Created even when empty, so the swap also empties the published tables
+            for table in ("games", "plays"):
+                (data_root / table).mkdir(parents=True, exist_ok=True)
+
+        games_sql = f"SELECT {', '.join(GAMES_SCHEMA.names)} FROM games WHERE gameState IN (%s, %s)"
+        games_writer = _PartitionedWriter(data_root / "games", part_name, GAMES_SCHEMA, lambda r: int(r[1]))
+        parts.append(games_writer)
+        new_game_ids: List[int] = []
+        try:
+            for batch in _stream_rows(conn, games_sql, FINAL_STATES, batch_size):
+                rows = [r for r in batch if int(r[0]) not in exported]
+                if rows:
+                    games_writer.write(rows)
+                new_game_ids.extend(int(r[0]) for r in rows)
+        finally:
+            games_writer.close()
+        counts["games"] = games_writer.rows
+
+        plays_writer = _PartitionedWriter(data_root / "plays", part_name, PLAYS_SCHEMA, lambda r: _season_of_game_id(r[1]))
+        parts.append(plays_writer)
+        try:
+            if full:
+                sql = (
+                    f"SELECT {', '.join(PLAYS_SCHEMA.names)} FROM plays "
+                    "WHERE playGameId IN (SELECT gameId FROM games WHERE gameState IN (%s, %s))"
+                )
+                for batch in _stream_rows(conn, sql, FINAL_STATES, batch_size):
+                    plays_writer.write(batch)
+            else:
+                for i in range(0, len(new_game_ids), games_per_query):
+                    chunk = new_game_ids[i:i + games_per_query]
+                    sql = (
+                        f"SELECT {', '.join(PLAYS_SCHEMA.names)} FROM plays "
+                        f"WHERE playGameId IN ({', '.join(['%s'] * len(chunk))})"
+                    )
+                    for batch in _stream_rows(conn, sql, chunk, batch_size):
+                        plays_writer.write(batch)
+        finally:
+            plays_writer.close()
+        counts["plays"] = plays_writer.rows
+    except Exception as e:
+        logger.error(f"Error exporting to Parquet in {out_dir}: {e}", exc_info=True)
+        for part in parts:
+            part.discard()
+        if full:
+            shutil.rmtree(data_root, ignore_errors=True)
+        raise
+    finally:
+        conn.close()
+
+    pending = [[str(tmp.relative_to(root)), str(final.relative_to(root))] for part in parts for tmp, final in part.staged()]
+    if full:
+        pending += [[str((data_root / table).relative_to(root)), table] for table in ("games", "plays")]
+    exported.update(new_game_ids)
+    state["exportedGameIds"] = sorted(exported)
+    state["lastExportAt"] = run_id
+    state["pending"] = pending
+    # The saved state is the commit point; _finish_publishing is repeated by the next run if this one stops here
+    _save_state(root, state)
+    _finish_publishing(root, state)
+    return counts
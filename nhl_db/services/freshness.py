@@ -0,0 +1,167 @@
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import time
+
+from ..config import FRESHNESS_POLL_GAP_SLO_SECONDS, FRESHNESS_SLO_SECONDS, FRESHNESS_STATUS_FILE
+
+logger = logging.getLogger(__name__)
+
+# Metric names, as they appear in snapshots and the status file
+PLAY_LAG = "playLag"
+FIELD_LAG = "fieldLag"
+POLL_GAP = "pollGap"
+METRICS = (PLAY_LAG, FIELD_LAG, POLL_GAP)
+
+
+class RollingPercentiles:
+    """The most recent `maxlen` samples of one metric, with percentiles over that window."""
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self.samples: Deque[float] = deque(maxlen=maxlen)
+        self.total = 0
+
+    def add(self, value: float) -> None:
+        self.samples.append(float(value))
+        self.total += 1
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.samples:
+            return {"count": self.total}
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+        return {"count": self.total, "p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99), "max": round(ordered[-1], 3)}
+
+
+class FreshnessTracker:
+    """
+    Event-to-database lag for the live path, per game and overall.
+
+    - playLag: commit time of a newly inserted play minus the time the NHL API
+      first exposed it. Exposure is the content time of the first pbp response
+      that contained the play (see `NhlClient.last_content_time`). The true
+      exposure lies between the previous poll and that response, so the real lag
+      can be up to one poll gap higher; pollGap is tracked for that reason.
+    - fieldLag: the same for a change in the game's state/period/clock/score/SOG.
+    - pollGap: seconds between consecutive polls of the same game.
+
+    Breaches of `slo_seconds` (lags) and `poll_gap_slo_seconds` are counted and
+    logged. `write_status()` dumps a snapshot to a JSON file that the `freshness`
+    command reads, so the numbers are queryable from outside the watcher.
+    """
+
+    def __init__(
+        self,
+        slo_seconds: float = FRESHNESS_SLO_SECONDS,
+        poll_gap_slo_seconds: float = FRESHNESS_POLL_GAP_SLO_SECONDS,
+        status_path: Optional[str] = FRESHNESS_STATUS_FILE,
+        window: int = 2000,
+        game_window: int = 500,
+    ) -> None:
+        self.slo_seconds = float(slo_seconds)
+        self.poll_gap_slo_seconds = float(poll_gap_slo_seconds)
+        self.status_path = status_path
+        self.game_window = game_window
+        self.overall: Dict[str, RollingPercentiles] = {m: RollingPercentiles(window) for m in METRICS}
+        self.games: Dict[int, Dict[str, RollingPercentiles]] = {}
+        self.breaches: Dict[str, int] = {m: 0 for m in METRICS}
+        self._last_poll: Dict[int, float] = {}
+        self._last_fields: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, game_id: int, metric: str, values: Iterable[float]) -> List[float]:
+        per_game = self.games.setdefault(game_id, {m: RollingPercentiles(self.game_window) for m in METRICS})
+        added = []
+        for v in values:
+            v = max(0.0, float(v))
+            self.overall[metric].add(v)
+            per_game[metric].add(v)
+            added.append(v)
+        return added
+
+    def _check_slo(self, game_id: int, metric: str, values: List[float], limit: float) -> None:
+        over = [v for v in values if v > limit]
+        if not over:
+            return
+        self.breaches[metric] += len(over)
+        msg = f"Freshness SLO breach for game {game_id}: {len(over)} of {len(values)} {metric} samples over {limit:g}s (max {max(over):.1f}s)"
+        logger.warning(msg, extra={"game_id": game_id, "stage": metric})
+
+    def record_poll(self, game_id: int, at: Optional[float] = None) -> None:
+        at = time.monotonic() if at is None else at
+        with self._lock:
+            last = self._last_poll.get(game_id)
+            self._last_poll[game_id] = at
+            if last is None:
+                return
+            added = self._add(game_id, POLL_GAP, [at - last])
+            self._check_slo(game_id, POLL_GAP, added, self.poll_gap_slo_seconds)
+
+    def record_fields(self, game_id: int, fields: tuple, exposed_at: float, committed_at: Optional[float] = None) -> None:
+        """Record a field-change lag if `fields` differ from the last ones seen for the game."""
+        committed_at = time.time() if committed_at is None else committed_at
+        with self._lock:
+            previous = self._last_fields.get(game_id)
+            self._last_fields[game_id] = tuple(fields)
+            if previous is None or previous == tuple(fields):
+                # The first observation has no known change time to measure from
+                return
+            added = self._add(game_id, FIELD_LAG, [committed_at - exposed_at])
+            self._check_slo(game_id, FIELD_LAG, added, self.slo_seconds)
+
+    def record_plays(self, game_id: int, new_plays: int, exposed_at: float, committed_at: Optional[float] = None) -> None:
+        if new_plays <= 0:
+            return
+        committed_at = time.time() if committed_at is None else committed_at
+        with self._lock:
+            added = self._add(game_id, PLAY_LAG, [committed_at - exposed_at] * new_plays)
+            self._check_slo(game_id, PLAY_LAG, added, self.slo_seconds)
+
+    def retain(self, game_ids: Iterable[int]) -> None:
+        """Drop per-game state for games no longer watched; overall numbers are kept."""
+        keep = set(game_ids)
+        with self._lock:
+            for state in (self.games, self._last_poll, self._last_fields):
+                for game_id in [g for g in state if g not in keep]:
+                    del state[game_id]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "updatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "sloSeconds": self.slo_seconds,
+                "pollGapSloSeconds": self.poll_gap_slo_seconds,
+                "breaches": dict(self.breaches),
+                "overall": {m: r.summary() for m, r in self.overall.items()},
+                "games": {str(g): {m: r.summary() for m, r in metrics.items()} for g, metrics in sorted(self.games.items())},
+            }
+
+    def write_status(self) -> None:
+        if not self.status_path:
+            return
+        path = Path(self.status_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+
+def read_status(path: str = FRESHNESS_STATUS_FILE) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    if "p50" not in summary:
+        return f"n={summary.get('count', 0)}"
+    return f"n={summary['count']} p50={summary['p50']}s p90={summary['p90']}s p99={summary['p99']}s max={summary['max']}s"
@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+from ..analytics.heatmaps import (
+    GRID_SHAPE,
+    GRID_SHAPE_LABEL,
+    GridKey,
+    SCOPE_PLAYER,
+    SCOPE_TEAM,
+    bin_plays,
+    decode_grid,
+    encode_grid,
+    merge_grids,
+    parse_shape,
+)
+from ..db import get_db_connection
+from ..repositories.heatmaps_repo import (
+    HEATMAP_PLAY_TYPES,
+    claim_games_with_conn,
+    fetch_grids_with_conn,
+    fetch_unapplied_final_games_with_conn,
+    get_grid,
+    iter_heatmap_plays_with_conn,
+    upsert_grids_with_conn,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def season_for_game_id(game_id: int) -> int:
+    """2025020076 -> 20252026."""
+    year = int(game_id) // 1000000
+    return year * 10000 + year + 1
+
+
+def _accumulate(total: Dict[GridKey, np.ndarray], delta: Dict[GridKey, np.ndarray]) -> None:
+    for key, grid in delta.items():
+        base = total.get(key)
+        total[key] = grid if base is None else base + grid
+
+
+def update_heatmaps_for_games_with_conn(conn, season: int, game_ids: Sequence[int]) -> Tuple[int, int]:  # type: ignore[no-untyped-def]
+    """
+    Bin the located plays of `game_ids` into the stored season grids.
+
+    Games are claimed in `heatmap_applied_games` in the same transaction, so
+    each game is added exactly once. Plays stream in batches; attack direction
+    is voted per batch, and a (game, period, team) split across two batches
+    simply votes in both. Returns (games applied, grids written).
+    """
+    if not game_ids:
+        return 0, 0
+    conn.start_transaction()
+    try:
+        claimed = claim_games_with_conn(conn, season, game_ids)
+        delta: Dict[GridKey, np.ndarray] = {}
+        if claimed:
+            for batch in iter_heatmap_plays_with_conn(conn, game_ids=claimed):
+                _accumulate(delta, bin_plays(batch))
+        existing = {
+            key: decode_grid(blob, parse_shape(shape))
+            for key, (blob, shape) in fetch_grids_with_conn(conn, season, delta.keys()).items()
+        }
+        rows = [
+            (scope_type, scope_id, ptype, GRID_SHAPE_LABEL, encode_grid(grid), int(grid.sum()))
+            for (scope_type, scope_id, ptype), grid in merge_grids(existing, delta)
+        ]
+        upsert_grids_with_conn(conn, season, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(claimed), len(rows)
+
+
+def update_heatmaps(season: Optional[int] = None, chunk_games: int = 50) -> Tuple[int, int]:
+    """Bin every final game not yet in the grids (optionally one season). Returns (games, grid writes)."""
+    conn = get_db_connection()
+    try:
+        pending = fetch_unapplied_final_games_with_conn(conn, season)
+        by_season: Dict[int, List[int]] = {}
+        for game_id, game_season in pending:
+            by_season.setdefault(game_season, []).append(game_id)
+        games_total = grids_total = 0
+        for game_season, ids in sorted(by_season.items()):
+            for i in range(0, len(ids), chunk_games):
+                chunk = ids[i:i + chunk_games]
+                try:
+                    games, grids = update_heatmaps_for_games_with_conn(conn, game_season, chunk)
+                except Exception as e:
+                    logger.error(f"Error updating heatmaps for season {game_season}, games {chunk[0]}..{chunk[-1]}: {e}", exc_info=True)
+                    raise
+                games_total += games
+                grids_total += grids
+                logger.info(f"{game_season}: binned {games} games into {grids} grids")
+        return games_total, grids_total
+    finally:
+        conn.close()
+
+
+def get_heatmap(season: int, scope_type: str, scope_id: int, play_type: str) -> Optional[np.ndarray]:
+    """Stored grid (X_BINS x Y_BINS counts) for a team or player, or None."""
+    stored = get_grid(season, scope_type, scope_id, play_type)
+    if stored is None:
+        return None
+    blob, shape, _ = stored
+    return decode_grid(blob, parse_shape(shape))
+
+
+def compute_heatmap(season: int, team_id: Optional[int] = None, player_id: Optional[int] = None, play_types: Sequence[str] = HEATMAP_PLAY_TYPES) -> np.ndarray:
+    """Ad-hoc grid straight from `plays` for a season, optionally one team or player, summed over `play_types`."""
+    scope_type, scope_id = (SCOPE_PLAYER, player_id) if player_id is not None else (SCOPE_TEAM, team_id)
+    total = np.zeros(GRID_SHAPE, dtype=np.int64)
+    conn = get_db_connection()
+    try:
+        for batch in iter_heatmap_plays_with_conn(conn, season_start_year=int(season) // 10000, team_id=team_id, player_id=player_id, play_types=play_types):
+            for (st, sid, _), grid in bin_plays(batch).items():
+                if st == scope_type and (scope_id is None or sid == scope_id):
+                    total += grid
+    finally:
+        conn.close()
+    return total
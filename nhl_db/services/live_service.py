@@ -1,128 +1,367 @@
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
 import logging
+import threading
+import time
+
 import requests
 
 logger = logging.getLogger(__name__)
 
-from ..clients.nhl_web_client import (
-    fetch_game_boxscore,
-    fetch_game_landing,
-    fetch_game_pbp,
-    fetch_schedule_for_date,
-    get_configured_session,
-)
+from ..clients.nhl_client import NhlClient, get_client
+from ..clients.throttle import CircuitOpenError, format_http_stats
 from ..db import get_db_connection
-from ..mappers.games import derive_game_fields_from_gamecenter, to_game_rows_from_schedule
-from ..mappers.plays import map_play
-from ..repositories.games_repo import (
-    upsert_games_with_conn,
-    update_game_fields_with_conn,
-)
-from ..repositories.plays_repo import upsert_plays_with_conn
-
-
-def update_live_once(game_id: int) -> int:
-    session = get_configured_session()
-    landing = fetch_game_landing(game_id, session=session)
-    box = fetch_game_boxscore(game_id, session=session)
-    pbp = fetch_game_pbp(game_id, session=session)
-
-    game_state, period, clock, home_score, away_score, home_sog, away_sog = derive_game_fields_from_gamecenter(landing, box)
-    conn = get_db_connection()
+from ..storage import get_backend
+from ..mappers.games import derive_game_fields_from_gamecenter
+from ..mappers.plays import map_play, play_types_in_plays
+from ..repositories.games_repo import fetch_game_ids, update_game_fields_batch_with_conn, update_game_fields_with_conn
+from ..repositories.plays_repo import get_play_type_ids
+from .aggregates_service import upsert_plays_and_aggregates_for_games_with_conn, upsert_plays_and_aggregates_with_conn
+from .player_resolver import PlayerResolver
+from .snapshot_service import SnapshotWriter
+from .freshness import FIELD_LAG, PLAY_LAG, POLL_GAP, FreshnessTracker, format_summary
+from .standings_service import apply_final_games_in_txn
+from .schedule_snapshot import FINAL_STATES, LIVE_STATES, ScheduleSnapshot
+from .write_spool import get_spool
+
+
+def _write_game_update_with_conn(  # type: ignore[no-untyped-def]
+    conn,
+    game_id: int,
+    landing: Dict[str, Any],
+    box: Dict[str, Any],
+    pbp: Dict[str, Any],
+    freshness: Optional[FreshnessTracker] = None,
+    exposed_at: Optional[Dict[str, float]] = None,
+    players: Optional[PlayerResolver] = None,
+    snapshots: Optional[SnapshotWriter] = None,
+) -> int:
+    """
+    Write one gamecenter poll. With a `freshness` tracker, field-change and new-play
+    lags are recorded against `exposed_at` ("fields", "pbp": upstream content times).
+    With a `players` resolver, players the plays reference but `players` lacks are added.
+    The game's `game_snapshots` document is rewritten when it changed.
+    """
+    fields = derive_game_fields_from_gamecenter(landing, box)
+    game_state, period, clock, home_score, away_score, home_sog, away_sog = fields
+    update_game_fields_with_conn(conn, game_id, game_state, period, clock, home_score, away_score, home_sog, away_sog)
+    if freshness is not None and exposed_at:
+        freshness.record_fields(game_id, fields, exposed_at["fields"])
+
+    plays = pbp.get("plays") or []
+    rows = [map_play(game_id, p) for p in plays]
+    if players is not None:
+        try:
+            players.resolve_with_conn(conn, game_id, rows, pbp)
+        except Exception as e:
+            # Missing player rows only degrade joins; never hold up the plays themselves
+            logger.error(f"Error resolving players for game {game_id}: {e}", exc_info=True, extra={"game_id": game_id, "stage": "players"})
+    count, new_plays = upsert_plays_and_aggregates_with_conn(conn, game_id, rows)
+    if freshness is not None and exposed_at:
+        freshness.record_plays(game_id, new_plays, exposed_at["pbp"])
     try:
-        update_game_fields_with_conn(conn, game_id, game_state, period, clock, home_score, away_score, home_sog, away_sog)
+        (snapshots or SnapshotWriter()).write_with_conn(conn, game_id, landing, box, pbp, rows)
+    except Exception as e:
+        logger.error(f"Error writing snapshot for game {game_id}: {e}", exc_info=True, extra={"game_id": game_id, "stage": "snapshot"})
+    if str(game_state or "").upper() in FINAL_STATES:
+        apply_final_games_in_txn(conn, [game_id])
+        _update_heatmaps_for_final_game(conn, game_id)
+    return count
 
-        plays = pbp.get("plays") or []
-        rows = [map_play(game_id, p) for p in plays]
-        count = upsert_plays_with_conn(conn, rows)
-        return count
-    finally:
-        conn.close()
+
+def _update_heatmaps_for_final_game(conn, game_id: int) -> None:  # type: ignore[no-untyped-def]
+    if get_backend().name != "mysql":
+        # Heatmap tables exist only in the MySQL schema
+        return
+    # Heatmaps need NumPy; live ingestion must keep working without it
+    try:
+        from .heatmaps_service import season_for_game_id, update_heatmaps_for_games_with_conn
+    except ImportError as e:
+        logger.error(f"Skipping heatmap update for game {game_id}: {e}")
+        return
+    update_heatmaps_for_games_with_conn(conn, season_for_game_id(game_id), [game_id])
+
+
+def write_spooled_games_with_conn(conn, payloads: Sequence[Dict[str, Any]], client: Optional[NhlClient] = None) -> int:  # type: ignore[no-untyped-def]
+    """Replay spooled gamecenter polls ({"game_id", "landing", "box", "pbp"}) in order. Returns the number of games written."""
+    players = PlayerResolver(client or get_client())
+    snapshots = SnapshotWriter()
+    for data in payloads:
+        _write_game_update_with_conn(conn, int(data["game_id"]), data["landing"], data["box"], data["pbp"], players=players, snapshots=snapshots)
+    return len(payloads)
 
 
-def _list_live_games_today(session: Optional[requests.Session] = None) -> List[int]:
-    session = session or get_configured_session()
-    # Today's schedule only; can be extended to inch back/forward if desired
+class _LazyConnection:
+    """Opens the DB connection on first use, so a poll cycle that only spools never touches the database."""
+
+    def __init__(self) -> None:
+        self.conn = None
+
+    def get(self):  # type: ignore[no-untyped-def]
+        if self.conn is None:
+            self.conn = get_db_connection()
+        return self.conn
+
+    def close(self) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing DB connection: {e}")
+            self.conn = None
+
+
+def _fetch_gamecenter(client: NhlClient, game_id: int) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    return client.fetch_game_landing(game_id), client.fetch_game_boxscore(game_id), client.fetch_game_pbp(game_id)
+
+
+def _write_game_group_with_conn(  # type: ignore[no-untyped-def]
+    conn,
+    fetched: Sequence[Tuple[int, Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+    players: PlayerResolver,
+    snapshots: SnapshotWriter,
+    results: Dict[int, Dict[str, Any]],
+) -> None:
+    """
+    Write several fetched games (game_id, landing, box, pbp): the field updates and
+    plays of all of them in one transaction, then snapshots and final-game standings.
+    Fills `results` per game; raises if the grouped transaction fails.
+    """
+    fields = {gid: derive_game_fields_from_gamecenter(landing, box) for gid, landing, box, _ in fetched}
+    plays = {gid: [map_play(gid, p) for p in (pbp.get("plays") or [])] for gid, _, _, pbp in fetched}
+    for gid, _, _, pbp in fetched:
+        try:
+            players.resolve_with_conn(conn, gid, plays[gid], pbp)
+        except Exception as e:
+            logger.error(f"Error resolving players for game {gid}: {e}", exc_info=True, extra={"game_id": gid, "stage": "players"})
+    # New play types are added outside the transaction (see get_play_type_ids)
+    get_play_type_ids(play_types_in_plays([r for rows in plays.values() for r in rows]))
+
+    conn.start_transaction()
+    try:
+        # Same (gameId) lock order as the plays below
+        update_game_fields_batch_with_conn(conn, [(gid,) + tuple(fields[gid]) for gid in sorted(fields)])
+        counts = upsert_plays_and_aggregates_for_games_with_conn(conn, plays)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    for gid, _, _, _ in fetched:
+        results[gid] = {"state": fields[gid][0], "plays": counts[gid][0], "new_plays": counts[gid][1]}
+
+    for gid, landing, box, pbp in fetched:
+        try:
+            snapshots.write_with_conn(conn, gid, landing, box, pbp, plays[gid])
+        except Exception as e:
+            logger.error(f"Error writing snapshot for game {gid}: {e}", exc_info=True, extra={"game_id": gid, "stage": "snapshot"})
+    finals = [gid for gid, f in fields.items() if str(f[0] or "").upper() in FINAL_STATES]
+    try:
+        apply_final_games_in_txn(conn, finals)
+        for gid in finals:
+            _update_heatmaps_for_final_game(conn, gid)
+    except Exception as e:
+        # Game rows and plays are committed; only the final-game bookkeeping needs a re-run
+        logger.error(f"Error applying final games {finals}: {e}", exc_info=True, extra={"stage": "finals"})
+        for gid in finals:
+            results[gid].update(error=str(e), stage="finals")
+
+
+# A game "on" a date starts between 10:00 UTC that day and 10:00 UTC the next (late North American games cross UTC midnight)
+DATE_WINDOW_START_HOUR_UTC = 10
+
+
+def select_game_ids(date: Optional[str] = None, states: Optional[Sequence[str]] = None) -> List[int]:
+    """Ids from `games` played on `date` (YYYY-MM-DD) and/or in one of `states`."""
+    start = end = None
+    if date:
+        day = datetime.strptime(date, "%Y-%m-%d") + timedelta(hours=DATE_WINDOW_START_HOUR_UTC)
+        start, end = day.strftime("%Y-%m-%d %H:%M:%S"), (day + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+    return fetch_game_ids(start, end, [st.strip().upper() for st in states or [] if st.strip()] or None)
+
+
+def update_live_games(
+    game_ids: Sequence[int],
+    client: Optional[NhlClient] = None,
+    workers: int = 8,
+    group_size: int = 10,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Update many games at once, e.g. to catch up on a night's games after an outage.
+
+    Gamecenter payloads are fetched concurrently (`workers` games in flight) over
+    the shared client; fetched games are written `group_size` at a time, each group's
+    field updates and plays in one transaction. When a group's transaction fails,
+    its games are retried one by one so a single bad game only fails itself.
+    Returns game_id -> {"state", "plays", "new_plays"} or {"error", "stage"}.
+    """
+    client = client or get_client()
+    ids = list(dict.fromkeys(int(g) for g in game_ids))
+    results: Dict[int, Dict[str, Any]] = {}
+    players = PlayerResolver(client)
+    snapshots = SnapshotWriter()
+    group: List[Tuple[int, Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+    started = time.monotonic()
+
+    def _flush(conn) -> None:  # type: ignore[no-untyped-def]
+        try:
+            _write_game_group_with_conn(conn, group, players, snapshots, results)
+        except Exception as e:
+            logger.error(f"Grouped write of {len(group)} games failed ({e}); writing them one by one", extra={"stage": "write"})
+            for gid, landing, box, pbp in group:
+                try:
+                    count = _write_game_update_with_conn(conn, gid, landing, box, pbp, players=players, snapshots=snapshots)
+                    results[gid] = {"state": landing.get("gameState"), "plays": count, "new_plays": None}
+                except Exception as e2:
+                    logger.error(f"Error writing game {gid}: {e2}", exc_info=True, extra={"game_id": gid, "stage": "write"})
+                    results[gid] = {"error": str(e2), "stage": "write"}
+        group.clear()
+        failed = sum(1 for r in results.values() if "error" in r)
+        logger.info(f"update-live: {len(results)}/{len(ids)} games done, {failed} failed, {time.monotonic() - started:.1f}s")
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    games = fetch_schedule_for_date(today, session=session)
-    rows = to_game_rows_from_schedule(games)
-    # Ensure rows exist minimally (id and basic fields)
     conn = get_db_connection()
     try:
-        upsert_games_with_conn(conn, rows)
+        with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="gamecenter") as pool:
+            pending: Dict[Future, int] = {}
+            queue = iter(ids)
+            while True:
+                # Keep a bounded number of games in flight so payloads don't pile up in memory
+                for gid in queue:
+                    pending[pool.submit(_fetch_gamecenter, client, gid)] = gid
+                    if len(pending) >= max(1, int(workers)) * 2:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    gid = pending.pop(fut)
+                    try:
+                        group.append((gid,) + fut.result())
+                    except requests.exceptions.RequestException as e:
+                        logger.error(f"Request error fetching game {gid}: {e}", extra={"game_id": gid, "stage": "fetch"})
+                        results[gid] = {"error": str(e), "stage": "fetch"}
+                    except Exception as e:
+                        logger.error(f"Unexpected error fetching game {gid}: {e}", exc_info=True, extra={"game_id": gid, "stage": "fetch"})
+                        results[gid] = {"error": str(e), "stage": "fetch"}
+                    if len(group) >= max(1, int(group_size)):
+                        _flush(conn)
+            if group:
+                _flush(conn)
     finally:
         conn.close()
+    return {gid: results[gid] for gid in ids if gid in results}
 
-    ids: List[int] = []
-    for g in games:
-        try:
-            if str(g.get("gameState") or "").upper() in ["LIVE", "CRIT"]:
-                ids.append(int(g.get("id")))
-        except Exception:
-            continue
-    return ids
 
+def watch_live_games(
+    poll_seconds: int = 5,
+    client: Optional[NhlClient] = None,
+    schedule_refresh_seconds: int = 300,
+    stop_event: Optional[threading.Event] = None,
+    idle_exit_seconds: Optional[float] = None,
+) -> None:
+    """
+    Poll every LIVE game until stopped.
 
-def watch_live_games(poll_seconds: int = 5) -> None:
-    session = get_configured_session()
+    Runs forever by default. `stop_event` ends the loop at the next iteration;
+    `idle_exit_seconds` returns once nothing has needed polling for that long
+    (used by the `run` daemon, which restarts the watcher when games approach).
+
+    Writes go through the write spool: while the database is unreachable, each
+    poll is appended to the local spool file instead and polling continues; the
+    spool is replayed in one pass once the database is back.
+    """
+    # One long-lived pooled client; idle connections are recycled per host inside it
+    client = client or get_client()
+    stop_event = stop_event or threading.Event()
+    idle_since: Optional[float] = None
+    snapshot = ScheduleSnapshot(client=client, refresh_seconds=schedule_refresh_seconds)
+    freshness = FreshnessTracker()
+    players = PlayerResolver(client)
+    snapshots = SnapshotWriter()
+    spool = get_spool()
+    spool.resume()
     i = 0
-    SESSION_REFRESH_INTERVAL = 50  # Recreate session every N iterations
+    STATS_INTERVAL = 50  # Report HTTP client stats every N iterations
+    poll_ids: List[int] = []
     
-    while True:
-        # Periodically refresh the session to prevent long-lived connection issues
-        if i > 0 and i % SESSION_REFRESH_INTERVAL == 0:
-            print(f"Refreshing session after {i} iterations...")
-            session = get_configured_session()
+    while not stop_event.is_set():
+        if i > 0 and i % STATS_INTERVAL == 0:
+            logger.info(f"HTTP client stats after {i} iterations: {format_http_stats()}")
+            overall = freshness.snapshot()["overall"]
+            logger.info(
+                f"Freshness: play lag {format_summary(overall[PLAY_LAG])}; field lag {format_summary(overall[FIELD_LAG])}; "
+                f"poll gap {format_summary(overall[POLL_GAP])}"
+            )
+            if spool.spooling:
+                logger.warning(f"Writes spooled while the database is unreachable: {spool.status()}", extra={"stage": "spool"})
         
         try:
-            live_ids = _list_live_games_today(session=session)
-            if not live_ids:
-                print("No LIVE games found.")
+            if snapshot.refresh_due():
+                try:
+                    changed = snapshot.refresh()
+                    logger.info(f"Schedule snapshot refreshed: {len(snapshot.games)} games, {changed} changed rows upserted")
+                except CircuitOpenError as e:
+                    # Schedule refresh is shed first when the upstream degrades; keep polling from the old snapshot
+                    logger.warning(f"Schedule refresh shed ({e}); keeping snapshot of {len(snapshot.games)} games", extra={"stage": "schedule"})
+            poll_ids = snapshot.ids_to_poll()
+            if not poll_ids:
+                logger.info("No LIVE games found.")
             
-            conn = get_db_connection()
+            conn = _LazyConnection()
             try:
-                for game_id in live_ids:
+                for game_id in poll_ids:
+                    stage = "landing"
                     try:
-                        print(f"Watching game: {game_id}")
-                        landing = fetch_game_landing(game_id, session=session)
-                        box = fetch_game_boxscore(game_id, session=session)
-                        pbp = fetch_game_pbp(game_id, session=session)
-
-                        game_state, period, clock, home_score, away_score, home_sog, away_sog = derive_game_fields_from_gamecenter(landing, box)
-                        update_game_fields_with_conn(conn, game_id, game_state, period, clock, home_score, away_score, home_sog, away_sog)
-
-                        plays = pbp.get("plays") or []
-                        rows = [map_play(game_id, p) for p in plays]
-                        upsert_plays_with_conn(conn, rows)
+                        landing = client.fetch_game_landing(game_id)
+                        landing_at = client.last_content_time()
+                        freshness.record_poll(game_id)
+                        landing_state = str(landing.get("gameState") or "").upper()
+                        was_live = snapshot.state_of(game_id) in LIVE_STATES
+                        snapshot.set_state(game_id, landing_state)
+                        # Pre-game games are only checked for the LIVE transition; a game that just
+                        # went final while we watched it gets one last full update
+                        if landing_state not in LIVE_STATES and not (was_live and landing_state in FINAL_STATES):
+                            continue
+                        logger.debug(f"Watching game: {game_id}")
+                        stage = "boxscore"
+                        box = client.fetch_game_boxscore(game_id)
+                        box_at = client.last_content_time()
+                        stage = "pbp"
+                        pbp = client.fetch_game_pbp(game_id)
+                        exposed_at = {"fields": min(landing_at, box_at), "pbp": client.last_content_time()}
+                        stage = "write"
+                        spool.run(
+                            "gamecenter",
+                            game_id,
+                            {"game_id": game_id, "landing": landing, "box": box, "pbp": pbp},
+                            lambda: _write_game_update_with_conn(
+                                conn.get(), game_id, landing, box, pbp, freshness=freshness, exposed_at=exposed_at, players=players, snapshots=snapshots
+                            ),
+                        )
                     except requests.exceptions.RequestException as e:
-                        logger.error(f"Request error for game {game_id}: {e}", exc_info=True)
-                        print(f"Request error for game {game_id}: {e}")
-                        print("Continuing to next game...")
+                        # Request failures are expected while the upstream flaps; no traceback needed
+                        logger.error(f"Request error for game {game_id}: {e}; continuing to next game", extra={"game_id": game_id, "stage": stage})
                         continue
                     except Exception as e:
-                        logger.error(f"Unexpected error for game {game_id}: {e}", exc_info=True)
-                        print(f"Unexpected error for game {game_id}: {e}")
-                        print("Continuing to next game...")
+                        logger.error(f"Unexpected error for game {game_id}: {e}; continuing to next game", exc_info=True, extra={"game_id": game_id, "stage": stage})
                         continue
             finally:
                 conn.close()
+                spool.sync()
+            freshness.retain(poll_ids)
+            freshness.write_status()
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request error while fetching live games: {e}", exc_info=True)
-            print(f"Request error while fetching live games: {e}")
-            print("Retrying in next iteration...")
+            logger.error(f"Request error while fetching live games: {e}; retrying in next iteration", extra={"stage": "schedule"})
         except Exception as e:
-            logger.error(f"Unexpected error in watch loop: {e}", exc_info=True)
-            print(f"Unexpected error in watch loop: {e}")
-            print("Retrying in next iteration...")
-
-        from time import sleep as _sleep
-        if not live_ids:
-            _sleep(60)
-        else:
-            _sleep(max(1, int(poll_seconds)))
-        i += 1
-
+            logger.error(f"Unexpected error in watch loop: {e}; retrying in next iteration", exc_info=True, extra={"stage": "loop"})
 
+        if poll_ids:
+            idle_since = None
+        elif idle_since is None:
+            idle_since = time.monotonic()
+        if idle_exit_seconds is not None and idle_since is not None and time.monotonic() - idle_since >= idle_exit_seconds:
+            logger.info(f"No games to poll for {idle_exit_seconds:g}s; live watcher stopping")
+            return
+        stop_event.wait(max(1, int(poll_seconds)) if poll_ids else min(60, snapshot.refresh_seconds))
+        i += 1
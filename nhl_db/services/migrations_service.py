@@ -0,0 +1,225 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+import logging
+
+from ..db import get_db_connection
+from ..storage import get_backend
+from ..migrations import MIGRATIONS
+from ..migrations.m0002_partition_plays import season_partition_bound
+from ..migrations.m0008_compact_plays import PLAYS_TABLE, VERSION as COMPACT_PLAYS_VERSION
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK_NAME = "nhl_db_migrate"
+
+
+def _ensure_migrations_table(cur) -> None:  # type: ignore[no-untyped-def]
+    cur.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INT NOT NULL PRIMARY KEY, "
+        "description VARCHAR(255) NOT NULL, "
+        "appliedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+
+
+def _applied_versions(cur) -> Set[int]:  # type: ignore[no-untyped-def]
+    cur.execute("SELECT version FROM schema_migrations")
+    return {int(row[0]) for row in cur.fetchall()}
+
+
+def migration_status() -> List[Tuple[int, str, bool]]:
+    if get_backend().name != "mysql":
+        # Embedded backends create their full schema on connect
+        get_backend().ensure_schema()
+        return [(m.VERSION, m.DESCRIPTION, True) for m in MIGRATIONS]
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            _ensure_migrations_table(cur)
+            applied = _applied_versions(cur)
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+    return [(m.VERSION, m.DESCRIPTION, m.VERSION in applied) for m in MIGRATIONS]
+
+
+def migrate(target: Optional[int] = None) -> List[int]:
+    """
+    Apply pending migrations in version order, up to `target` if given.
+
+    MySQL DDL commits implicitly, so each migration is recorded only after it
+    completes; a named lock keeps two `migrate` runs from interleaving.
+    Returns the versions applied. Embedded backends (SQLite) have no migration
+    history; their schema is created in full instead.
+    """
+    if get_backend().name != "mysql":
+        get_backend().ensure_schema()
+        logger.info(f"{get_backend().name} schema is up to date")
+        return []
+    conn = get_db_connection()
+    applied_now: List[int] = []
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT GET_LOCK(%s, 30)", (MIGRATION_LOCK_NAME,))
+            row = cur.fetchone()
+            if not row or row[0] != 1:
+                raise RuntimeError("Another migrate run holds the migration lock")
+            try:
+                _ensure_migrations_table(cur)
+                applied = _applied_versions(cur)
+                for m in MIGRATIONS:
+                    if m.VERSION in applied or (target is not None and m.VERSION > target):
+                        continue
+                    logger.info(f"Applying migration {m.VERSION}: {m.DESCRIPTION}")
+                    try:
+                        m.upgrade(cur)
+                    except Exception as e:
+                        logger.error(f"Migration {m.VERSION} ({m.DESCRIPTION}) failed: {e}", exc_info=True)
+                        raise
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                        (m.VERSION, m.DESCRIPTION),
+                    )
+                    applied_now.append(m.VERSION)
+                done = applied | set(applied_now)
+                if 2 in done:
+                    table = PLAYS_TABLE if COMPACT_PLAYS_VERSION in done else "plays"
+                    ensure_plays_partitions_with_cur(cur, datetime.now().year + 1, table)
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+                cur.fetchall()
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+    return applied_now
+
+
+def ensure_plays_partitions_with_cur(cur, last_season_start_year: int, table: str = PLAYS_TABLE) -> List[str]:  # type: ignore[no-untyped-def]
+    """Split `pmax` of the plays table so every season up to `last_season_start_year` has its own partition."""
+    cur.execute(
+        "SELECT partition_name FROM information_schema.partitions "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL",
+        (table,),
+    )
+    existing = {str(row[0]) for row in cur.fetchall()}
+    if "pmax" not in existing:
+        return []
+    years = sorted(int(p[1:]) for p in existing if p.startswith("p") and p[1:].isdigit())
+    if not years:
+        return []
+    added: List[str] = []
+    for year in range(years[-1] + 1, last_season_start_year + 1):
+        cur.execute(
+            f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO ("
+            f"PARTITION p{year} VALUES LESS THAN ({season_partition_bound(year)}), "
+            f"PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        )
+        added.append(f"p{year}")
+        logger.info(f"Added plays partition p{year}")
+    return added
+
+
+def _sample_ids(cur) -> Dict[str, Any]:  # type: ignore[no-untyped-def]
+    cur.execute("SELECT MAX(gameId) FROM games")
+    row = cur.fetchone()
+    game_id = int(row[0]) if row and row[0] is not None else 2025020001
+    cur.execute("SELECT playPrimaryPlayerId FROM plays_encoded WHERE playGameId = %s AND playPrimaryPlayerId IS NOT NULL LIMIT 1", (game_id,))
+    row = cur.fetchone()
+    player_id = int(row[0]) if row and row[0] is not None else 8478402
+    cur.execute("SELECT playTypeId FROM play_types WHERE playTypeName = 'shot-on-goal'")
+    row = cur.fetchone()
+    type_id = int(row[0]) if row and row[0] is not None else 1
+    return {"game_id": game_id, "player_id": player_id, "type_id": type_id}
+
+
+# (name, sql, params builder, acceptable index names, require index-only access, require single partition)
+QUERY_PLAN_CHECKS = [
+    (
+        "plays by game in sortOrder",
+        "SELECT playId, playIndex, playTypeId FROM plays_encoded WHERE playGameId = %s ORDER BY playIndex",
+        lambda s: (s["game_id"],),
+        {"idx_plays_game_sort"},
+        False,
+        True,
+    ),
+    (
+        "plays by player and type",
+        "SELECT playGameId FROM plays_encoded WHERE playPrimaryPlayerId = %s AND playTypeId = %s",
+        lambda s: (s["player_id"], s["type_id"]),
+        {"idx_plays_player_type"},
+        True,
+        False,
+    ),
+    (
+        "plays by game-second window",
+        "SELECT playId, playGameSecond FROM plays_encoded WHERE playGameId = %s AND playGameSecond >= %s AND playGameSecond < %s",
+        lambda s: (s["game_id"], 2400, 2700),
+        {"idx_plays_game_second"},
+        True,
+        True,
+    ),
+    (
+        "games by date window",
+        "SELECT gameId, gameState FROM games WHERE gameDateTimeUtc >= %s AND gameDateTimeUtc < %s",
+        lambda s: ("2025-10-01 00:00:00", "2025-10-02 00:00:00"),
+        {"idx_games_date_state"},
+        True,
+        False,
+    ),
+    (
+        "games by state",
+        "SELECT gameId, gameDateTimeUtc FROM games WHERE gameState IN ('LIVE', 'CRIT')",
+        lambda s: (),
+        {"idx_games_state_date"},
+        True,
+        False,
+    ),
+]
+
+
+def check_query_plans() -> List[Tuple[str, bool, str]]:
+    """
+    EXPLAIN the common access paths and verify each uses its intended index.
+
+    Fails a check on a full scan, a filesort, the wrong index, or (for plays by
+    game) a plan that touches more than one partition.
+    """
+    results: List[Tuple[str, bool, str]] = []
+    conn = get_db_connection()
+    try:
+        sample_cur = conn.cursor(buffered=True)
+        try:
+            samples = _sample_ids(sample_cur)
+        finally:
+            sample_cur.close()
+        cur = conn.cursor(dictionary=True)
+        try:
+            for name, sql, params_fn, keys, index_only, single_partition in QUERY_PLAN_CHECKS:
+                cur.execute("EXPLAIN " + sql, params_fn(samples))
+                plan = cur.fetchall()
+                row = plan[0] if plan else {}
+                key = row.get("key")
+                extra = str(row.get("Extra") or "")
+                partitions = str(row.get("partitions") or "")
+                problems: List[str] = []
+                if row.get("type") == "ALL":
+                    problems.append("full table scan")
+                if key not in keys:
+                    problems.append(f"uses key {key!r}, expected one of {sorted(keys)}")
+                if "filesort" in extra:
+                    problems.append("filesort")
+                if index_only and "Using index" not in extra:
+                    problems.append("not covered by index")
+                if single_partition and "," in partitions:
+                    problems.append(f"no partition pruning ({partitions})")
+                detail = "; ".join(problems) if problems else f"key={key} type={row.get('type')} rows={row.get('rows')} extra={extra}"
+                results.append((name, not problems, detail))
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+    return results
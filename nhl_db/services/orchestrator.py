@@ -0,0 +1,154 @@
+from typing import Callable, List, Optional
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+import logging
+import signal
+import threading
+import time
+
+from ..clients.nhl_client import get_client
+from ..db import enable_connection_pool
+from ..repositories.games_repo import has_games_to_watch
+from .live_service import watch_live_games
+from .players_service import sync_players_roster
+from .schedule_service import sync_schedule_dates, sync_schedule_season
+from .teams_service import sync_teams_records
+from .write_spool import get_spool
+
+logger = logging.getLogger(__name__)
+
+
+def current_season(today: Optional[date] = None) -> str:
+    """Season in YYYYYYYY form; a new season starts in September (preseason)."""
+    today = today or date.today()
+    start = today.year if today.month >= 9 else today.year - 1
+    return f"{start}{start + 1}"
+
+
+class Job:
+    """One recurring job. `submit()` skips a run while the previous run of the same job is still going."""
+
+    def __init__(self, name: str, func: Callable[[], object], interval_seconds: float) -> None:
+        self.name = name
+        self.func = func
+        self.interval_seconds = float(interval_seconds)
+        self.next_run = time.monotonic()
+        self.running: Optional[Future] = None
+        self.last_error: Optional[str] = None
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_run
+
+    def submit(self, pool: ThreadPoolExecutor) -> None:
+        self.next_run = time.monotonic() + self.interval_seconds
+        if self.running is not None and not self.running.done():
+            logger.warning(f"Job {self.name} skipped: previous run still in progress")
+            return
+        self.running = pool.submit(self.run)
+
+    def run(self) -> None:
+        started = time.monotonic()
+        logger.info(f"Job {self.name} started")
+        try:
+            self.func()
+            self.last_error = None
+            logger.info(f"Job {self.name} finished in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Job {self.name} failed after {time.monotonic() - started:.1f}s: {e}", exc_info=True, extra={"stage": self.name})
+
+
+def _schedule_window(days_back: int = 1, days_ahead: int = 7) -> None:
+    today = date.today()
+    sync_schedule_dates(
+        (today - timedelta(days=days_back)).strftime("%Y-%m-%d"),
+        (today + timedelta(days=days_ahead)).strftime("%Y-%m-%d"),
+    )
+
+
+def run_daemon(
+    teams_hours: float = 24,
+    players_hours: float = 12,
+    season_hours: float = 24,
+    schedule_minutes: float = 30,
+    live_check_seconds: float = 60,
+    live_lead_seconds: int = 900,
+    poll_seconds: int = 5,
+    schedule_refresh_seconds: int = 300,
+    db_pool_size: int = 10,
+    stop_event: Optional[threading.Event] = None,
+) -> None:
+    """
+    Run the sync jobs on their cadences in one long-lived process.
+
+    - Shares one HTTP client (`get_client()`) and one DB connection pool across jobs
+    - Each job runs on a worker thread and never overlaps itself; a due job whose
+      previous run is still going is skipped until its next slot
+    - Teams sync runs to completion first, since players and games need team rows
+    - Every `live_check_seconds` the `games` table is checked for games that are
+      LIVE or start within `live_lead_seconds`; if any, the live watcher is started
+      on its own thread. It stops by itself after 30 idle minutes and is started
+      again when the next games approach
+    - Writes made while the database is unreachable go to the write spool and are
+      replayed once it is back; spooled writes left by an earlier run are replayed at start
+    - SIGINT/SIGTERM stop the loop; running jobs are allowed to finish
+    """
+    stop_event = stop_event or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop_event.set())
+
+    enable_connection_pool(db_pool_size)
+    get_client()
+    get_spool().resume()
+
+    jobs: List[Job] = [
+        Job("sync-players-roster", lambda: sync_players_roster(current_season()), players_hours * 3600),
+        Job("sync-schedule-season", lambda: sync_schedule_season(current_season()), season_hours * 3600),
+        Job("sync-schedule-window", _schedule_window, schedule_minutes * 60),
+    ]
+    teams_job = Job("sync-teams-records", sync_teams_records, teams_hours * 3600)
+    teams_job.next_run = time.monotonic() + teams_job.interval_seconds
+    teams_job.run()
+    jobs.insert(0, teams_job)
+
+    watcher: Optional[threading.Thread] = None
+    next_live_check = time.monotonic()
+    logger.info(f"Daemon running jobs: {', '.join(f'{j.name} every {j.interval_seconds:g}s' for j in jobs)}")
+
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="job") as pool:
+        while not stop_event.is_set():
+            now = time.monotonic()
+            for job in jobs:
+                if job.due(now):
+                    job.submit(pool)
+
+            if now >= next_live_check:
+                next_live_check = now + live_check_seconds
+                if watcher is None or not watcher.is_alive():
+                    try:
+                        start_watcher = has_games_to_watch(live_lead_seconds)
+                    except Exception as e:
+                        logger.error(f"Live check failed: {e}", extra={"stage": "live-check"})
+                        start_watcher = False
+                    if start_watcher:
+                        logger.info("Games starting or live; handing off to the live watcher")
+                        watcher = threading.Thread(
+                            target=watch_live_games,
+                            kwargs=dict(
+                                poll_seconds=poll_seconds,
+                                schedule_refresh_seconds=schedule_refresh_seconds,
+                                stop_event=stop_event,
+                                idle_exit_seconds=1800,
+                            ),
+                            name="live-watcher",
+                            daemon=True,
+                        )
+                        watcher.start()
+
+            stop_event.wait(1.0)
+
+        logger.info("Daemon stopping; waiting for running jobs to finish")
+    if watcher is not None:
+        watcher.join(timeout=30)
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import logging
+import threading
+import time
+
+import requests
+
+from ..clients.nhl_client import NhlClient, get_client
+from ..mappers.players import player_landing_to_roster_entry, to_player_rows, to_player_rows_from_roster_spots
+from ..mappers.plays import player_ids_in_plays
+from ..repositories.players_repo import fetch_player_ids_with_conn, insert_missing_players_with_conn
+from .player_search import refresh_player_index
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerResolver:
+    """
+    Fills in players referenced by plays but missing from `players`.
+
+    Keeps the set of known player ids in memory (loaded once from the DB), so
+    checking a poll's plays costs no query. Unknown ids are inserted from the
+    play-by-play `rosterSpots` already in hand; only ids absent from there
+    trigger a `/player/{id}/landing` request. Ids that fail to resolve are not
+    retried for `retry_seconds`, so a bad id doesn't cost a request every poll.
+    """
+
+    def __init__(self, client: Optional[NhlClient] = None, retry_seconds: float = 600.0) -> None:
+        self.client = client or get_client()
+        self.retry_seconds = retry_seconds
+        self.known: Optional[Set[int]] = None
+        self._failed: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def _unknown(self, conn, ids: Set[int]) -> Set[int]:  # type: ignore[no-untyped-def]
+        with self._lock:
+            if self.known is None:
+                self.known = fetch_player_ids_with_conn(conn)
+            now = time.monotonic()
+            return {pid for pid in ids if pid not in self.known and now - self._failed.get(pid, -self.retry_seconds) >= self.retry_seconds}
+
+    def _fetch_rows(self, player_ids: Sequence[int]) -> List[Tuple[Any, ...]]:
+        rows: List[Tuple[Any, ...]] = []
+        for pid in player_ids:
+            try:
+                landing = self.client.fetch_player_landing(pid)
+            except requests.exceptions.RequestException:
+                continue
+            rows.extend(to_player_rows([player_landing_to_roster_entry(landing)], None))  # type: ignore[arg-type]
+        return rows
+
+    def resolve_with_conn(self, conn, game_id: int, rows: Sequence[Tuple[Any, ...]], pbp: Dict[str, Any]) -> int:  # type: ignore[no-untyped-def]
+        """Insert players referenced by mapped play `rows` that aren't known yet. Returns the number inserted."""
+        unknown = self._unknown(conn, player_ids_in_plays(rows))
+        if not unknown:
+            return 0
+
+        spots = [s for s in (pbp.get("rosterSpots") or []) if isinstance(s, dict)]
+        player_rows = [r for r in to_player_rows_from_roster_spots(spots) if r[0] in unknown]
+        missing = sorted(unknown - {r[0] for r in player_rows})
+        if missing:
+            logger.info(f"Game {game_id}: {len(missing)} player(s) not in rosterSpots, fetching individually", extra={"game_id": game_id, "stage": "players"})
+            player_rows.extend(self._fetch_rows(missing))
+
+        inserted = insert_missing_players_with_conn(conn, player_rows)
+        resolved = {int(r[0]) for r in player_rows}
+        with self._lock:
+            if self.known is not None:
+                self.known.update(resolved)
+            now = time.monotonic()
+            for pid in unknown:
+                if pid in resolved:
+                    self._failed.pop(pid, None)
+                else:
+                    self._failed[pid] = now
+        if inserted:
+            logger.info(f"Game {game_id}: added {inserted} player(s) missing from `players`", extra={"game_id": game_id, "stage": "players"})
+            # Runs outside the plays transaction, so the new rows are already visible to the index
+            refresh_player_index(resolved)
+        unresolved = unknown - resolved
+        if unresolved:
+            logger.warning(f"Game {game_id}: could not resolve player ids {sorted(unresolved)}", extra={"game_id": game_id, "stage": "players"})
+        return inserted
@@ -0,0 +1,198 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import heapq
+import logging
+import threading
+import time
+import unicodedata
+
+from ..repositories.players_repo import fetch_players_for_search
+
+logger = logging.getLogger(__name__)
+
+# Letters NFKD does not decompose into a base letter plus accents
+_EXTRA_FOLDS = str.maketrans({"ø": "o", "ł": "l", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe", "ı": "i", "þ": "th"})
+
+# Longest indexed prefix; longer query tokens are matched against the candidates of this prefix
+MAX_PREFIX = 12
+
+# Player ids re-read per query when refreshing part of the index
+REFRESH_CHUNK = 1000
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase, strip accents and map letters like ø/ł/ß, so "Stützle" matches "stutzle"."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.lower().translate(_EXTRA_FOLDS))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Folded name tokens; hyphens, apostrophes and periods split ("O'Reilly" -> o, reilly, oreilly)."""
+    folded = fold(text)
+    tokens: List[str] = []
+    for word in folded.split():
+        parts = [p for p in "".join(c if c.isalnum() else " " for c in word).split() if p]
+        tokens.extend(parts)
+        if len(parts) > 1:
+            # Also index the joined form so "oreilly" and "o reilly" both match
+            tokens.append("".join(parts))
+    return tokens
+
+
+class PlayerEntry:
+    __slots__ = ("player_id", "first_name", "last_name", "team_id", "team_abbrev", "team_active", "position", "number", "headshot_url", "last_game_id", "tokens", "rank")
+
+    def __init__(self, row: Sequence[Any]) -> None:
+        (self.player_id, self.first_name, self.last_name, self.team_id, self.team_abbrev,
+         active, self.position, self.number, self.headshot_url, self.last_game_id) = row
+        self.player_id = int(self.player_id)
+        self.team_active = bool(active)
+        self.tokens = set(tokenize(f"{self.first_name or ''} {self.last_name or ''}"))
+        # Lower sorts first: players on active teams, then most recently seen in a game,
+        # then players with a current headshot (NHL Web roster rows), then by name
+        self.rank = (
+            0 if self.team_active else 1,
+            -int(self.last_game_id or 0),
+            0 if self.headshot_url else 1,
+            fold(self.last_name),
+            fold(self.first_name),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "playerId": self.player_id,
+            "name": f"{self.first_name} {self.last_name}".strip(),
+            "teamId": self.team_id,
+            "teamAbbrev": self.team_abbrev,
+            "position": self.position,
+            "number": self.number,
+            "headshotUrl": self.headshot_url,
+            "activeTeam": self.team_active,
+        }
+
+
+class PlayerSearchIndex:
+    """
+    In-memory prefix index over player names for autocomplete.
+
+    Every folded name token is indexed under each of its prefixes (up to
+    `MAX_PREFIX` characters), so a lookup is one dict read per query token plus
+    a set intersection; results are ranked by active team, recency and headshot.
+    `refresh(ids)` re-reads only the given players, which keeps the index current
+    after roster syncs without a rebuild. Safe to share between threads.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[int, PlayerEntry] = {}
+        self.prefixes: Dict[str, Set[int]] = {}
+        self.built_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _add(self, entry: PlayerEntry) -> None:
+        self.entries[entry.player_id] = entry
+        for token in entry.tokens:
+            for n in range(1, min(len(token), MAX_PREFIX) + 1):
+                self.prefixes.setdefault(token[:n], set()).add(entry.player_id)
+
+    def _remove(self, player_id: int) -> None:
+        entry = self.entries.pop(player_id, None)
+        if entry is None:
+            return
+        for token in entry.tokens:
+            for n in range(1, min(len(token), MAX_PREFIX) + 1):
+                ids = self.prefixes.get(token[:n])
+                if ids is not None:
+                    ids.discard(player_id)
+                    if not ids:
+                        del self.prefixes[token[:n]]
+
+    def load(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Replace the whole index with `rows` (see `players_repo.fetch_players_for_search`)."""
+        entries = [PlayerEntry(r) for r in rows]
+        with self._lock:
+            self.entries = {}
+            self.prefixes = {}
+            for entry in entries:
+                self._add(entry)
+            self.built_at = time.time()
+        return len(entries)
+
+    def apply(self, rows: Iterable[Sequence[Any]]) -> int:
+        """Insert or replace the given players."""
+        entries = [PlayerEntry(r) for r in rows]
+        with self._lock:
+            for entry in entries:
+                self._remove(entry.player_id)
+                self._add(entry)
+        return len(entries)
+
+    def build(self) -> int:
+        started = time.monotonic()
+        count = self.load(fetch_players_for_search())
+        logger.info(f"Built player search index: {count} players, {len(self.prefixes)} prefixes in {time.monotonic() - started:.2f}s")
+        return count
+
+    def refresh(self, player_ids: Iterable[int]) -> int:
+        ids = sorted({int(p) for p in player_ids})
+        refreshed = 0
+        for i in range(0, len(ids), REFRESH_CHUNK):
+            refreshed += self.apply(fetch_players_for_search(ids[i:i + REFRESH_CHUNK]))
+        return refreshed
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Players whose name tokens start with every token of `query`, best ranked first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            sets: List[Set[int]] = []
+            long_tokens: List[str] = []
+            for token in set(tokens):
+                ids = self.prefixes.get(token[:MAX_PREFIX])
+                if not ids:
+                    return []
+                sets.append(ids)
+                if len(token) > MAX_PREFIX:
+                    long_tokens.append(token)
+            sets.sort(key=len)
+            candidates = set(sets[0]).intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+            matches = [self.entries[pid] for pid in candidates]
+            if long_tokens:
+                matches = [e for e in matches if all(any(t.startswith(q) for t in e.tokens) for q in long_tokens)]
+            best = heapq.nsmallest(limit, matches, key=lambda e: e.rank)
+        return [e.to_dict() for e in best]
+
+
+_INDEX: Optional[PlayerSearchIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_player_index() -> PlayerSearchIndex:
+    """Process-wide index, built from the `players` table on first use."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            index = PlayerSearchIndex()
+            index.build()
+            _INDEX = index
+        return _INDEX
+
+
+def search_players(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    return get_player_index().search(query, limit)
+
+
+def refresh_player_index(player_ids: Iterable[int]) -> int:
+    """Re-read the given players into the process-wide index if it has been built; a no-op otherwise."""
+    index = _INDEX
+    if index is None:
+        return 0
+    try:
+        return index.refresh(player_ids)
+    except Exception as e:
+        # The index is a read cache; a failed refresh must not fail the write that triggered it
+        logger.error(f"Player search index refresh failed: {e}", exc_info=True)
+        return 0
+
@@ -1,48 +1,90 @@
 from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
 
-from ..clients.nhl_web_client import fetch_roster
-from ..db import get_db_connection
+from ..clients.nhl_client import NhlClient, get_client
+from ..clients.nhl_web_client import merge_records_players
 from ..mappers.players import to_player_rows
 from ..repositories.players_repo import upsert_players
+from ..repositories.teams_repo import get_active_teams
+from .player_search import refresh_player_index
+from .write_spool import get_spool
 
 logger = logging.getLogger(__name__)
 
 
-def _get_active_teams_from_db() -> List[Tuple[int, str]]:
-    sql = "SELECT teamId, teamAbbrev FROM teams WHERE teamIsActive = 1 AND teamAbbrev IS NOT NULL"
-    conn = get_db_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute(sql)
-        out: List[Tuple[int, str]] = []
-        for row in cur.fetchall():
-            out.append((int(row[0]), str(row[1])))
-        cur.close()
-        return out
-    finally:
-        conn.close()
+def expand_seasons(start_season: str, end_season: Optional[str] = None) -> List[str]:
+    """
+    Expand an inclusive season range (YYYYYYYY format) into a list of seasons, oldest first.
+    """
+    def _start_year(season: str) -> int:
+        s = (season or "").strip()
+        if len(s) != 8 or not s.isdigit() or int(s[4:]) != int(s[:4]) + 1:
+            raise ValueError(f"Invalid season '{season}'; expected YYYYYYYY, e.g. 20252026")
+        return int(s[:4])
 
+    first = _start_year(start_season)
+    last = _start_year(end_season) if end_season else first
+    if last < first:
+        raise ValueError("end season must be >= start season")
+    return [f"{y}{y + 1}" for y in range(first, last + 1)]
 
-def sync_players_roster(season: str, teams_filter: Optional[str] = None) -> int:
+
+def sync_players_roster(season: str, teams_filter: Optional[str] = None, end_season: Optional[str] = None, client: Optional[NhlClient] = None, refresh: bool = False) -> int:
     allow: Optional[Set[str]] = None
     if teams_filter:
         allow = {t.strip().upper() for t in teams_filter.split(',') if t.strip()}
 
-    team_rows = _get_active_teams_from_db()
-    total = 0
-    for team_id, tri in team_rows:
-        if allow and tri.upper() not in allow:
-            continue
-        try:
-            roster = fetch_roster(tri, season, team_id)
-            rows = to_player_rows(roster, team_id)
-            upsert_players(rows)
-            total += len(rows)
-            print(f"Synced {len(rows)} players for {tri} ({team_id}).")
-        except Exception as e:
-            logger.error(f"Error syncing players for team {tri} (team_id={team_id}): {e}", exc_info=True)
-            raise
-    return total
+    seasons = expand_seasons(season, end_season)
+    team_rows = get_active_teams()
+    client = client or get_client()
+
+    # playerId -> (rank, row). NHL Web rows rank by season so the most recent roster
+    # entry wins across seasons and teams; Records-only rows rank 0 and only fill gaps.
+    best: Dict[int, Tuple[int, Tuple[Any, ...]]] = {}
+
+    def _offer(rank: int, rows: List[Tuple[Any, ...]]) -> None:
+        for row in rows:
+            pid = int(row[0])
+            current = best.get(pid)
+            if current is None or rank > current[0]:
+                best[pid] = (rank, row)
+
+    # `refresh` skips cached rosters and Records lists (fresh responses are still cached)
+    with client.refreshing_cache(refresh):
+        for team_id, tri in team_rows:
+            if allow and tri.upper() not in allow:
+                continue
+            try:
+                # Records API player list is season-independent: fetch it once per team per run
+                records_players = client.fetch_players_by_team(team_id)
+                team_web_players: List[Dict[str, Any]] = []
+                web_ids: Set[int] = set()
+                for s in reversed(seasons):
+                    web_players = client.fetch_web_roster(tri, s)
+                    _offer(int(s), to_player_rows(web_players, team_id))
+                    for p in web_players:
+                        try:
+                            pid = int(p.get("id"))
+                        except Exception:
+                            continue
+                        if pid not in web_ids:
+                            web_ids.add(pid)
+                            team_web_players.append(p)
+                # Records fills only players missing from every fetched NHL Web roster of this team;
+                # merge_records_players appends those after the web entries
+                merged = merge_records_players(team_web_players, records_players)
+                filler = merged[len(team_web_players):]
+                _offer(0, to_player_rows(filler, team_id))
+                logger.info(f"Fetched {len(team_web_players)} roster and {len(filler)} Records players for {tri} ({team_id}) across {len(seasons)} season(s).")
+            except Exception as e:
+                logger.error(f"Error syncing players for team {tri} (team_id={team_id}): {e}", exc_info=True)
+                raise
+
+    rows = [row for _, row in best.values()]
 
+    def write() -> None:
+        upsert_players(rows)
+        refresh_player_index(int(r[0]) for r in rows)
 
+    get_spool().run("players", None, {"rows": rows}, write)
+    return len(rows)
@@ -1,15 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import logging
-from typing import List
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from ..clients.nhl_web_client import fetch_schedule_for_date
+import requests
+
+from ..clients.nhl_client import NhlClient, get_client
 from ..mappers.games import to_game_rows_from_schedule
 from ..repositories.games_repo import upsert_games
+from ..repositories.teams_repo import get_active_teams, get_team_ids
+from .standings_service import apply_final_games, final_game_ids_from_rows
+from .write_spool import get_spool
 
 logger = logging.getLogger(__name__)
 
 
-def sync_schedule_dates(start: str, end: str) -> int:
+def _write_games(rows: List[Tuple[Any, ...]]) -> None:
+    """Upsert schedule rows and apply final games to standings; spooled while the DB is unreachable."""
+    def write() -> None:
+        upsert_games(rows)
+        apply_final_games(final_game_ids_from_rows(rows))
+
+    if rows:
+        get_spool().run("games", None, {"rows": rows}, write)
+
+
+def sync_schedule_dates(start: str, end: str, client: Optional[NhlClient] = None) -> int:
+    client = client or get_client()
     start_date = datetime.strptime(start, "%Y-%m-%d").date()
     end_date = datetime.strptime(end, "%Y-%m-%d").date()
     if end_date < start_date:
@@ -19,11 +37,11 @@ def sync_schedule_dates(start: str, end: str) -> int:
     while d <= end_date:
         ds = d.strftime("%Y-%m-%d")
         try:
-            day_games = fetch_schedule_for_date(ds)
+            day_games = client.fetch_schedule_for_date(ds)
             rows = to_game_rows_from_schedule(day_games)
-            upsert_games(rows)
+            _write_games(rows)
             total += len(rows)
-            print(f"{ds}: upserted {len(rows)} games")
+            logger.info(f"{ds}: upserted {len(rows)} games")
         except Exception as e:
             logger.error(f"Error syncing schedule for date {ds}: {e}", exc_info=True)
             raise
@@ -31,3 +49,57 @@ def sync_schedule_dates(start: str, end: str) -> int:
     return total
 
 
+def sync_schedule_season(season: str, workers: int = 8, client: Optional[NhlClient] = None) -> int:
+    """
+    Import a whole season from the per-club season schedules, one request per active team.
+
+    Requests run concurrently on the shared client (its per-host rate limit still
+    applies). Each game appears in both clubs' schedules, so games are deduped by
+    id before a single bulk upsert.
+
+    A club whose request fails does not hold up the others: the games fetched are
+    upserted (most of the failed club's games come with its opponents' schedules),
+    then a RuntimeError names the failed clubs. A 404 (a current club that did not
+    exist in `season`) is not a failure.
+    """
+    client = client or get_client()
+    teams = get_active_teams()
+    if not teams:
+        raise ValueError("no active teams in `teams`; run sync-teams-records first")
+
+    started = time.monotonic()
+    by_id: Dict[int, Dict[str, Any]] = {}
+    failed: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+        futures = {pool.submit(client.fetch_club_schedule_season, tri, season): tri for _, tri in teams}
+        for fut in as_completed(futures):
+            tri = futures[fut]
+            try:
+                club_games = fut.result()
+            except Exception as e:
+                if isinstance(e, requests.exceptions.HTTPError) and e.response is not None and e.response.status_code == 404:
+                    logger.warning(f"No {season} club schedule for {tri}; skipping")
+                    continue
+                logger.error(f"Error syncing club schedule for {tri} season={season}: {e}", exc_info=True)
+                failed.append(tri)
+                continue
+            for g in club_games:
+                try:
+                    by_id.setdefault(int(g.get("id")), g)
+                except Exception:
+                    continue
+    logger.info(f"Fetched {len(teams) - len(failed)}/{len(teams)} club schedules ({len(by_id)} unique games) in {time.monotonic() - started:.1f}s")
+
+    rows = to_game_rows_from_schedule([by_id[k] for k in sorted(by_id)])
+    # Preseason schedules can include non-NHL opponents, which the games FKs would reject;
+    # inactive franchises (e.g. ARI before 2024-25) still exist in `teams` and are kept
+    team_ids = get_team_ids()
+    skipped = [r for r in rows if r[5] not in team_ids or r[6] not in team_ids]
+    if skipped:
+        logger.warning(f"Skipping {len(skipped)} games against teams not in `teams`: {', '.join(str(r[0]) for r in skipped[:10])}")
+        rows = [r for r in rows if r[5] in team_ids and r[6] in team_ids]
+    _write_games(rows)
+    logger.info(f"{season}: upserted {len(rows)} games")
+    if failed:
+        raise RuntimeError(f"{season}: club schedules failed for {', '.join(sorted(failed))}; upserted the {len(rows)} games fetched from the others")
+    return len(rows)
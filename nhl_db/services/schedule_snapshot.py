@@ -0,0 +1,131 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+
+from ..clients.nhl_client import NhlClient, get_client
+from ..db import get_db_connection
+from ..mappers.games import to_game_rows_from_schedule
+from ..repositories.games_repo import upsert_games_with_conn
+from .standings_service import apply_final_games_in_txn, final_game_ids_from_rows
+from .write_spool import get_spool
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATES = {"LIVE", "CRIT"}
+FINAL_STATES = {"FINAL", "OFF"}
+PREGAME_STATES = {"FUT", "PRE"}
+
+# A game that started longer ago than this and still isn't final is not worth polling
+MAX_GAME_DURATION = timedelta(hours=8)
+
+
+def _parse_start_utc(game: Dict[str, Any]) -> Optional[datetime]:
+    raw = game.get("startTimeUTC")
+    if not isinstance(raw, str) or not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def schedule_query_date(now_local: Optional[datetime] = None, now_utc: Optional[datetime] = None) -> str:
+    """
+    Date to request from `/schedule/{date}` so that no game in progress is missed.
+
+    The endpoint returns the game week starting at the requested date. Asking for
+    the day before the earlier of the local and UTC dates keeps last night's late
+    games (still LIVE after local midnight, or already on the next UTC day) in view.
+    """
+    now_local = now_local or datetime.now()
+    now_utc = now_utc or datetime.now(timezone.utc)
+    earliest = min(now_local.date(), now_utc.date())
+    return (earliest - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+class ScheduleSnapshot:
+    """
+    In-memory copy of the current schedule window for the live watcher.
+
+    Refreshed from the schedule endpoint every `refresh_seconds` (not every poll);
+    between refreshes, game states are advanced from the gamecenter payloads the
+    watcher already fetches. Only rows that changed since the last refresh are
+    upserted into `games`.
+    """
+
+    def __init__(self, client: Optional[NhlClient] = None, refresh_seconds: int = 300, start_lead_seconds: int = 300) -> None:
+        self.client = client or get_client()
+        self.refresh_seconds = max(1, int(refresh_seconds))
+        self.start_lead = timedelta(seconds=max(0, int(start_lead_seconds)))
+        self.games: Dict[int, Dict[str, Any]] = {}
+        self._rows: Dict[int, Tuple[Any, ...]] = {}
+        self._refreshed_at: Optional[float] = None
+
+    def refresh_due(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+
+    def refresh(self) -> int:
+        """Fetch the schedule window and upsert (or spool) changed games. Returns the number of changed rows."""
+        games = self.client.fetch_schedule_for_date(schedule_query_date())
+        self._refreshed_at = time.monotonic()
+
+        by_id: Dict[int, Dict[str, Any]] = {}
+        for g in games:
+            try:
+                by_id[int(g.get("id"))] = g
+            except Exception:
+                continue
+
+        changed: List[Tuple[Any, ...]] = []
+        for row in to_game_rows_from_schedule(list(by_id.values())):
+            game_id = int(row[0])
+            if self._rows.get(game_id) != row:
+                changed.append(row)
+                self._rows[game_id] = row
+        self.games = by_id
+
+        if changed:
+            get_spool().run("games", None, {"rows": changed}, lambda: self._write(changed))
+        return len(changed)
+
+    @staticmethod
+    def _write(rows: List[Tuple[Any, ...]]) -> None:
+        conn = get_db_connection()
+        try:
+            upsert_games_with_conn(conn, rows)
+            apply_final_games_in_txn(conn, final_game_ids_from_rows(rows))
+        finally:
+            conn.close()
+
+    def state_of(self, game_id: int) -> str:
+        return str((self.games.get(game_id) or {}).get("gameState") or "").upper()
+
+    def set_state(self, game_id: int, game_state: Optional[str]) -> None:
+        """Record a state observed via gamecenter so transitions don't wait for the next refresh."""
+        if game_state and game_id in self.games:
+            self.games[game_id]["gameState"] = game_state
+
+    def ids_to_poll(self, now_utc: Optional[datetime] = None) -> List[int]:
+        """
+        LIVE games plus pre-game games whose scheduled start is (nearly) reached.
+
+        The latter are polled via gamecenter landing, which reports the
+        transition to LIVE well before the next schedule refresh would.
+        """
+        now_utc = now_utc or datetime.now(timezone.utc)
+        ids: List[int] = []
+        for game_id, g in self.games.items():
+            state = str(g.get("gameState") or "").upper()
+            if state in LIVE_STATES:
+                ids.append(game_id)
+                continue
+            if state not in PREGAME_STATES:
+                continue
+            start = _parse_start_utc(g)
+            if start is None:
+                continue
+            if start - self.start_lead <= now_utc <= start + MAX_GAME_DURATION:
+                ids.append(game_id)
+        return sorted(ids)
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import logging
+import threading
+
+from ..mappers.snapshots import build_game_snapshot, decode_snapshot, encode_snapshot
+from ..repositories.snapshots_repo import get_snapshot, upsert_snapshot_with_conn
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_LAST_PLAYS = 20
+
+
+class SnapshotWriter:
+    """
+    Rewrites `game_snapshots` rows only when the document changed.
+
+    Remembers the last written hash per game, so an unchanged poll costs no
+    DB round trip; the upsert itself also skips unchanged and final rows.
+    """
+
+    def __init__(self, last_plays: int = SNAPSHOT_LAST_PLAYS) -> None:
+        self.last_plays = last_plays
+        self._hashes: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+
+    def write_with_conn(  # type: ignore[no-untyped-def]
+        self,
+        conn,
+        game_id: int,
+        landing: Dict[str, Any],
+        box: Dict[str, Any],
+        pbp: Dict[str, Any],
+        rows: Sequence[Tuple[Any, ...]],
+    ) -> bool:
+        document = build_game_snapshot(game_id, landing, box, pbp, rows, self.last_plays)
+        blob, digest = encode_snapshot(document)
+        with self._lock:
+            if self._hashes.get(game_id) == digest:
+                return False
+        changed = upsert_snapshot_with_conn(conn, game_id, blob, digest, document["final"])
+        with self._lock:
+            if document["final"]:
+                self._hashes.pop(game_id, None)
+            else:
+                self._hashes[game_id] = digest
+        return changed
+
+
+_FINAL_CACHE: Dict[int, Dict[str, Any]] = {}
+_FINAL_CACHE_MAX = 2048
+
+
+def get_game_snapshot(game_id: int) -> Optional[Dict[str, Any]]:
+    """
+    A game's snapshot document from one primary-key read, or None.
+
+    Final snapshots never change, so they are kept in a process-wide cache.
+    """
+    cached = _FINAL_CACHE.get(game_id)
+    if cached is not None:
+        return cached
+    row = get_snapshot(game_id)
+    if row is None:
+        return None
+    blob, version, is_final = row
+    document = decode_snapshot(blob)
+    document["snapshotVersion"] = version
+    if is_final:
+        if len(_FINAL_CACHE) >= _FINAL_CACHE_MAX:
+            _FINAL_CACHE.pop(next(iter(_FINAL_CACHE)))
+        _FINAL_CACHE[game_id] = document
+    return document
@@ -0,0 +1,63 @@
+from typing import Any, Iterable, List, Sequence, Tuple
+import logging
+
+from ..db import get_db_connection
+from ..repositories.standings_repo import (
+    FINAL_GAME_STATES,
+    apply_final_games_with_conn,
+    clear_season_standings_with_conn,
+    fetch_final_game_ids_for_season_with_conn,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def final_game_ids_from_rows(rows: Sequence[Tuple[Any, ...]]) -> List[int]:
+    """Ids of final games among schedule rows (see mappers.games.to_game_rows_from_schedule)."""
+    return [int(r[0]) for r in rows if str(r[7] or "").upper() in FINAL_GAME_STATES]
+
+
+def apply_final_games_in_txn(conn, game_ids: Iterable[int]) -> int:  # type: ignore[no-untyped-def]
+    """Apply final games to standings in their own transaction on `conn`."""
+    ids = list(game_ids)
+    if not ids:
+        return 0
+    conn.start_transaction()
+    try:
+        applied = apply_final_games_with_conn(conn, ids)
+        conn.commit()
+        return applied
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def apply_final_games(game_ids: Iterable[int]) -> int:
+    ids = list(game_ids)
+    if not ids:
+        return 0
+    conn = get_db_connection()
+    try:
+        return apply_final_games_in_txn(conn, ids)
+    finally:
+        conn.close()
+
+
+def rebuild_standings(season: str) -> int:
+    """Recompute one season's standings from scratch from final games in `games`."""
+    season_id = int(season)
+    conn = get_db_connection()
+    try:
+        conn.start_transaction()
+        try:
+            clear_season_standings_with_conn(conn, season_id)
+            ids = fetch_final_game_ids_for_season_with_conn(conn, season_id)
+            applied = apply_final_games_with_conn(conn, ids)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error rebuilding standings for season {season}: {e}", exc_info=True)
+            raise
+        return applied
+    finally:
+        conn.close()
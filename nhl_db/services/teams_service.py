@@ -1,18 +1,21 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import logging
 
-from ..clients.records_client import fetch_franchises
+from ..clients.nhl_client import NhlClient, get_client
 from ..mappers.teams import to_team_rows
 from ..repositories.teams_repo import upsert_teams
+from .write_spool import get_spool
 
 logger = logging.getLogger(__name__)
 
 
-def sync_teams_records() -> int:
+def sync_teams_records(client: Optional[NhlClient] = None, refresh: bool = False) -> int:
+    client = client or get_client()
     try:
-        franchises: List[Dict[str, Any]] = fetch_franchises()
+        with client.refreshing_cache(refresh):
+            franchises: List[Dict[str, Any]] = client.fetch_franchises()
         rows = to_team_rows(franchises)
-        upsert_teams(rows)
+        get_spool().run("teams", None, {"rows": rows}, lambda: upsert_teams(rows))
         return len(rows)
     except Exception as e:
         logger.error(f"Error syncing teams from Records API: {e}", exc_info=True)
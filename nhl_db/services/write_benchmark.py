@@ -0,0 +1,338 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import logging
+import os
+import platform
+import random
+import time
+
+from ..config import SQLITE_PATH, get_env
+from ..db import get_db_connection
+from ..mappers.plays import play_types_in_plays
+from ..repositories.games_repo import update_game_fields_with_conn, upsert_games_with_conn
+from ..repositories.players_repo import upsert_players_with_conn
+from ..repositories.plays_repo import get_play_type_ids, upsert_plays_with_conn
+from ..repositories.teams_repo import upsert_teams
+from ..storage import StorageBackend, create_backend, get_backend, set_backend
+from .freshness import RollingPercentiles
+from .migrations_service import migrate
+
+logger = logging.getLogger(__name__)
+
+# Roughly one regular season: 1312 games, ~320 recorded plays each, 32 teams
+SEASON_GAMES = 1312
+PLAYS_PER_GAME = 320
+TEAMS = 32
+PLAYERS_PER_TEAM = 26
+
+# Share of rows changed by the "mixed" workload; the rest are resent unchanged
+MIXED_UPDATE_FRACTION = 0.2
+
+WORKLOADS = ("cold", "duplicate", "mixed")
+COMMIT_MODES = ("autocommit", "txn-per-batch", "txn-grouped")
+
+# typeDescKey frequencies of a typical game
+PLAY_TYPE_WEIGHTS = (
+    ("faceoff", 60), ("shot-on-goal", 58), ("hit", 45), ("stoppage", 50), ("blocked-shot", 28),
+    ("missed-shot", 25), ("giveaway", 16), ("takeaway", 13), ("penalty", 8), ("goal", 6),
+    ("delayed-penalty", 3), ("period-start", 3), ("period-end", 3), ("game-end", 1),
+)
+_NO_LOCATION = {"stoppage", "period-start", "period-end", "game-end", "delayed-penalty"}
+
+DEFAULT_OUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "benchmarks")
+
+
+def _clock(seconds: int) -> str:
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def synthetic_season(season_start_year: int, games: int = SEASON_GAMES, plays_per_game: int = PLAYS_PER_GAME, seed: int = 1) -> Dict[str, List[Tuple[Any, ...]]]:
+    """
+    Deterministic season-scale rows in the shapes the mappers produce: `teams`
+    (mappers.teams), `players` (mappers.players), `games` (to_game_rows_from_schedule),
+    `plays` (map_play) and `fields` (update_game_fields arguments per game).
+    """
+    rng = random.Random(seed)
+    team_ids = list(range(1, TEAMS + 1))
+    teams = [
+        (t, f"Team {t}", f"City {t}", f"T{t:02d}", 1, None, "Eastern" if t <= TEAMS // 2 else "Western", f"Division {(t - 1) // 8 + 1}")
+        for t in team_ids
+    ]
+    rosters: Dict[int, List[int]] = {}
+    players: List[Tuple[Any, ...]] = []
+    for t in team_ids:
+        rosters[t] = []
+        for n in range(PLAYERS_PER_TEAM):
+            pid = 8470000 + t * 100 + n
+            rosters[t].append(pid)
+            position = "G" if n < 2 else ("D" if n < 10 else rng.choice("CLR"))
+            players.append((pid, t, f"First{n}", f"Last{pid}", n + 1, position, f"https://assets.nhle.com/mugs/{pid}.png", None, None))
+
+    start = datetime(season_start_year, 10, 8, 23, 0, 0)
+    types, weights = zip(*PLAY_TYPE_WEIGHTS)
+    game_rows: List[Tuple[Any, ...]] = []
+    plays: List[Tuple[Any, ...]] = []
+    fields: List[Tuple[Any, ...]] = []
+    for n in range(1, games + 1):
+        game_id = int(f"{season_start_year}02{n:04d}")
+        home, away = rng.sample(team_ids, 2)
+        when = (start + timedelta(hours=n * 3)).strftime("%Y-%m-%d %H:%M:%S")
+        game_rows.append((game_id, int(f"{season_start_year}{season_start_year + 1}"), 2, when, f"Arena {home}", home, away, "FUT", 0, 0, None))
+        fields.append((game_id, "OFF", 3, "00:00", rng.randint(0, 6), rng.randint(0, 6), rng.randint(15, 45), rng.randint(15, 45)))
+        for k in range(plays_per_game):
+            period = min(3, 1 + k * 3 // plays_per_game)
+            elapsed = min(1199, (k * 3 * 1200 // plays_per_game) % 1200)
+            ptype = rng.choices(types, weights)[0]
+            team = rng.choice((home, away))
+            other = away if team == home else home
+            located = ptype not in _NO_LOCATION
+            plays.append((
+                int(f"{game_id}{100 + k * 3}"),
+                game_id,
+                k + 1,
+                team if located else None,
+                rng.choice(rosters[team]) if located else None,
+                rng.choice(rosters[other]) if ptype in ("faceoff", "hit", "blocked-shot") else None,
+                rng.choice(rosters[team]) if ptype == "goal" else None,
+                None,
+                period,
+                _clock(elapsed),
+                _clock(1200 - elapsed),
+                ptype,
+                rng.choice("ODN") if located else None,
+                rng.randint(-99, 99) if located else None,
+                rng.randint(-42, 42) if located else None,
+            ))
+    return {"teams": teams, "players": players, "games": game_rows, "plays": plays, "fields": fields}
+
+
+def _mixed(rows: List[Tuple[Any, ...]], change: Callable[[Tuple[Any, ...]], Tuple[Any, ...]], seed: int) -> List[Tuple[Any, ...]]:
+    rng = random.Random(seed)
+    return [change(r) if rng.random() < MIXED_UPDATE_FRACTION else r for r in rows]
+
+
+def _update_game_fields(conn, rows: Sequence[Tuple[Any, ...]]) -> None:  # type: ignore[no-untyped-def]
+    for r in rows:
+        update_game_fields_with_conn(conn, *r)
+
+
+class Target:
+    """One repository write function with the rows of its three workloads."""
+
+    def __init__(self, name: str, table: str, write: Callable[[Any, Sequence[Tuple[Any, ...]]], Any], rows: Dict[str, List[Tuple[Any, ...]]], reset: bool = True) -> None:
+        self.name = name
+        self.table = table
+        self.write = write
+        self.rows = rows
+        # update_game_fields works on existing games rows, which must not be emptied between runs
+        self.reset = reset
+
+
+def build_targets(data: Dict[str, List[Tuple[Any, ...]]], seed: int = 1) -> Dict[str, Target]:
+    games, plays, players, fields = data["games"], data["plays"], data["players"], data["fields"]
+    # "cold" for update_game_fields: every game moves to a new state; "duplicate" resends it
+    changed_fields = _mixed(fields, lambda r: (r[0], "OFF", 4, "00:00", r[4] + 1, r[5], r[6] + 1, r[7]), seed)
+    return {
+        "upsert_plays_with_conn": Target("upsert_plays_with_conn", "plays_encoded", upsert_plays_with_conn, {
+            "cold": plays, "duplicate": plays,
+            "mixed": _mixed(plays, lambda r: r[:13] + ((r[13] or 0) + 1, r[14]), seed),
+        }),
+        "upsert_games_with_conn": Target("upsert_games_with_conn", "games", upsert_games_with_conn, {
+            "cold": games, "duplicate": games,
+            "mixed": _mixed(games, lambda r: r[:7] + ("OFF", r[8] + 3, r[9] + 2, "REG"), seed),
+        }),
+        "upsert_players_with_conn": Target("upsert_players_with_conn", "players", upsert_players_with_conn, {
+            "cold": players, "duplicate": players,
+            "mixed": _mixed(players, lambda r: r[:4] + (r[4] + 50,) + r[5:], seed),
+        }),
+        "update_game_fields_with_conn": Target("update_game_fields_with_conn", "games", _update_game_fields, {
+            "cold": fields, "duplicate": fields, "mixed": changed_fields,
+        }, reset=False),
+    }
+
+
+def run_case(target: Target, rows: Sequence[Tuple[Any, ...]], batch_size: int, commit_mode: str, group: int = 10) -> Dict[str, Any]:
+    """
+    Write `rows` through `target` in `batch_size` chunks on one connection.
+
+    - autocommit: every statement commits on its own
+    - txn-per-batch: one transaction per chunk
+    - txn-grouped: one transaction per `group` chunks
+    Latency is measured per chunk and includes the commit that closes it.
+    """
+    latencies = RollingPercentiles(maxlen=max(1, len(rows) // max(1, batch_size) + 1))
+    conn = get_db_connection()
+    in_txn = False
+    started = time.perf_counter()
+    try:
+        for n, offset in enumerate(range(0, len(rows), batch_size)):
+            t0 = time.perf_counter()
+            if commit_mode != "autocommit" and not in_txn:
+                conn.start_transaction()
+                in_txn = True
+            target.write(conn, rows[offset:offset + batch_size])
+            if in_txn and (commit_mode == "txn-per-batch" or (n + 1) % group == 0 or offset + batch_size >= len(rows)):
+                conn.commit()
+                in_txn = False
+            latencies.add((time.perf_counter() - t0) * 1000)
+    except Exception:
+        if in_txn:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+    seconds = time.perf_counter() - started
+    summary = latencies.summary()
+    return {
+        "target": target.name,
+        "rows": len(rows),
+        "batch_size": batch_size,
+        "commit_mode": commit_mode,
+        "batches": summary.pop("count"),
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(len(rows) / seconds, 1) if seconds > 0 else None,
+        "latency_ms": summary,
+    }
+
+
+def _reset(table: str) -> None:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(get_backend().truncate_sql(table))
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def bench_backend(backend_name: str, database: Optional[str] = None, sqlite_path: Optional[str] = None) -> StorageBackend:
+    """
+    A backend on a scratch database, never the configured one: MySQL `database`
+    (default BENCH_DB_NAME or "nhl_bench", created if missing) or a fresh SQLite file.
+    """
+    if backend_name == "mysql":
+        import mysql.connector
+        from ..storage.mysql_backend import MySqlBackend, connection_config
+
+        database = database or get_env("BENCH_DB_NAME", "nhl_bench")
+        if database == os.getenv("DB_NAME"):
+            raise ValueError(f"Refusing to benchmark against DB_NAME ({database}); the benchmark empties its tables")
+        config = connection_config(database)
+        config.pop("database")
+        conn = mysql.connector.connect(**config)
+        try:
+            cur = conn.cursor()
+            cur.execute(f"CREATE DATABASE IF NOT EXISTS `{database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cur.close()
+        finally:
+            conn.close()
+        return MySqlBackend(database=database)
+    path = sqlite_path or os.path.join(os.path.dirname(SQLITE_PATH), "bench.sqlite3")
+    if os.path.abspath(path) == os.path.abspath(SQLITE_PATH):
+        raise ValueError(f"Refusing to benchmark against SQLITE_PATH ({path}); the benchmark empties its tables")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return create_backend("sqlite", path)
+
+
+def run_write_benchmark(
+    backend: StorageBackend,
+    games: int = SEASON_GAMES,
+    plays_per_game: int = PLAYS_PER_GAME,
+    batch_sizes: Sequence[int] = (500, 5000),
+    commit_modes: Sequence[str] = COMMIT_MODES,
+    targets: Optional[Sequence[str]] = None,
+    group: int = 10,
+    seed: int = 1,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run every (target, batch size, commit mode) against `backend` with synthetic rows.
+
+    Each combination starts from an empty table and runs the workloads in order:
+    cold (all rows new), duplicate (the same rows again, nothing changes) and
+    mixed (`MIXED_UPDATE_FRACTION` of the rows changed, the rest unchanged).
+    Returns a JSON-ready document with the run's parameters and one result per case.
+    """
+    previous = set_backend(backend)
+    try:
+        migrate()
+        season_start_year = datetime.now().year if datetime.now().month >= 9 else datetime.now().year - 1
+        started = time.monotonic()
+        data = synthetic_season(season_start_year, games, plays_per_game, seed)
+        logger.info(f"Generated {len(data['games'])} games, {len(data['plays'])} plays, {len(data['players'])} players in {time.monotonic() - started:.1f}s")
+        upsert_teams(data["teams"])
+        # Resolve play type ids up front, outside the timed transactions
+        get_play_type_ids(play_types_in_plays(data["plays"]))
+
+        all_targets = build_targets(data, seed)
+        selected = [all_targets[name] for name in (targets or list(all_targets))]
+        results: List[Dict[str, Any]] = []
+        for target in selected:
+            for batch_size in batch_sizes:
+                for commit_mode in commit_modes:
+                    if target.reset:
+                        _reset(target.table)
+                    else:
+                        _reset("games")
+                        conn = get_db_connection()
+                        try:
+                            upsert_games_with_conn(conn, data["games"])
+                        finally:
+                            conn.close()
+                    for workload in WORKLOADS:
+                        result = run_case(target, target.rows[workload], int(batch_size), commit_mode, group)
+                        result["workload"] = workload
+                        results.append(result)
+                        if progress is not None:
+                            progress(result)
+        return {
+            "meta": {
+                "backend": backend.name,
+                "database": getattr(backend, "database", None) or getattr(backend, "path", None),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "games": games,
+                "plays_per_game": plays_per_game,
+                "rows": {name: len(rows) for name, rows in data.items()},
+                "mixed_update_fraction": MIXED_UPDATE_FRACTION,
+                "group": group,
+                "seed": seed,
+            },
+            "results": results,
+        }
+    finally:
+        set_backend(previous)
+
+
+def case_key(result: Dict[str, Any]) -> Tuple[str, str, int, str]:
+    return (result["target"], result["workload"], int(result["batch_size"]), result["commit_mode"])
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Tuple[Tuple[str, str, int, str], Optional[float], Optional[float]]]:
+    """(case, baseline rows/sec, change in percent) for every case of `report`; None where the baseline lacks it."""
+    before = {case_key(r): r.get("rows_per_sec") for r in baseline.get("results") or []}
+    out = []
+    for r in report["results"]:
+        old = before.get(case_key(r))
+        new = r.get("rows_per_sec")
+        out.append((case_key(r), old, round((new - old) / old * 100, 1) if old and new else None))
+    return out
+
+
+def save_report(report: Dict[str, Any], out: Optional[str] = None) -> str:
+    """Write `report` as JSON; by default to benchmarks/writes_<backend>_<timestamp>.json."""
+    if out is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        out = os.path.join(DEFAULT_OUT_DIR, f"writes_{report['meta']['backend']}_{stamp}.json")
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return out
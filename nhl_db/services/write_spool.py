@@ -0,0 +1,440 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+from ..config import SPOOL_ENABLED, SPOOL_FSYNC_SECONDS, SPOOL_PATH, SPOOL_PROBE_SECONDS
+from ..db import get_db_connection
+from ..repositories.games_repo import upsert_games_with_conn
+from ..repositories.players_repo import upsert_players_with_conn
+from ..repositories.teams_repo import upsert_teams_with_conn
+from ..storage import get_backend
+from .standings_service import apply_final_games_in_txn, final_game_ids_from_rows
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so the spool must not be shared between processes
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Frame header: payload length, CRC-32 of the payload. The payload is zlib-compressed
+# "<header JSON>\n<data JSON>", where the header is {"kind", "key", "at"}.
+_FRAME = struct.Struct(">II")
+
+
+class SpoolRecord:
+    __slots__ = ("kind", "key", "at", "data")
+
+    def __init__(self, kind: str, key: Any, at: float, data: Dict[str, Any]) -> None:
+        self.kind = kind
+        self.key = key
+        self.at = at
+        self.data = data
+
+
+class _FileLock:
+    """Exclusive `flock` on a sidecar file, held across every process using the same spool."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "_FileLock":
+        if fcntl is not None:
+            if self._fd is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+def encode_record(kind: str, key: Any, data_json: str, at: Optional[float] = None) -> bytes:
+    header = json.dumps({"kind": kind, "key": key, "at": time.time() if at is None else at}, separators=(",", ":"))
+    payload = zlib.compress(f"{header}\n{data_json}".encode("utf-8"), 6)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path: str) -> Iterator[SpoolRecord]:
+    """Records of one spool file in write order. A torn or corrupt tail (crash mid-append) ends the file."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        offset = 0
+        while True:
+            head = f.read(_FRAME.size)
+            if not head:
+                return
+            length, crc = _FRAME.unpack(head) if len(head) == _FRAME.size else (0, None)
+            payload = f.read(length)
+            if crc is None or len(payload) < length or zlib.crc32(payload) != crc:
+                logger.warning(f"Spool {path}: ignoring torn or corrupt record at byte {offset}")
+                return
+            header, _, data = zlib.decompress(payload).decode("utf-8").partition("\n")
+            meta = json.loads(header)
+            yield SpoolRecord(meta["kind"], meta.get("key"), float(meta.get("at") or 0), json.loads(data))
+            offset += _FRAME.size + length
+
+
+def _latest_rows(payloads: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    """Rows of all payloads, the last one per primary key (first column) winning."""
+    by_id: Dict[Any, Tuple[Any, ...]] = {}
+    for data in payloads:
+        for row in data.get("rows") or []:
+            by_id[row[0]] = tuple(row)
+    return list(by_id.values())
+
+
+def _replay_games(conn, payloads: List[Dict[str, Any]]) -> int:  # type: ignore[no-untyped-def]
+    rows = _latest_rows(payloads)
+    upsert_games_with_conn(conn, rows)
+    apply_final_games_in_txn(conn, final_game_ids_from_rows(rows))
+    return len(rows)
+
+
+def _replay_teams(conn, payloads: List[Dict[str, Any]]) -> int:  # type: ignore[no-untyped-def]
+    rows = _latest_rows(payloads)
+    upsert_teams_with_conn(conn, rows)
+    return len(rows)
+
+
+def _replay_players(conn, payloads: List[Dict[str, Any]]) -> int:  # type: ignore[no-untyped-def]
+    from .player_search import refresh_player_index
+
+    rows = _latest_rows(payloads)
+    upsert_players_with_conn(conn, rows)
+    refresh_player_index(int(r[0]) for r in rows)
+    return len(rows)
+
+
+def _replay_gamecenter(conn, payloads: List[Dict[str, Any]]) -> int:  # type: ignore[no-untyped-def]
+    # Imported here: live_service spools through this module
+    from .live_service import write_spooled_games_with_conn
+
+    return write_spooled_games_with_conn(conn, payloads)
+
+
+# kind -> handler(conn, payloads) applying a run of consecutive records of that kind
+REPLAY_HANDLERS: Dict[str, Callable[[Any, List[Dict[str, Any]]], int]] = {
+    "games": _replay_games,
+    "teams": _replay_teams,
+    "players": _replay_players,
+    "gamecenter": _replay_gamecenter,
+}
+
+
+class WriteSpool:
+    """
+    Append-only local file for writes made while the database is unreachable.
+
+    `run()` performs a write directly while the database is up. When the write
+    fails because the database cannot be reached (see
+    `StorageBackend.is_unavailable`), the write's input is appended to the spool
+    instead and every later write is spooled too, so callers never wait on a
+    dead database and recorded state keeps its order. A background replayer
+    probes the database every `probe_seconds`; once it answers, the spool is
+    replayed in order in one pass (superseded records skipped, rows batched per
+    run of one kind) and direct writes resume.
+
+    Records are compressed, CRC-checked frames; appends are fsynced at most every
+    `fsync_seconds` and on `sync()`. Every replay handler is an idempotent
+    upsert, so a replay interrupted by another outage is simply run again.
+
+    One spool file is shared by every process using the same `path`: appends
+    and the rotation to `<path>.replaying` hold `<path>.lock`, writers reopen
+    the file once another process has rotated it away, and a whole replay
+    holds `<path>.replay.lock`, so only one process replays at a time.
+    """
+
+    def __init__(
+        self,
+        path: str = SPOOL_PATH,
+        fsync_seconds: float = SPOOL_FSYNC_SECONDS,
+        probe_seconds: float = SPOOL_PROBE_SECONDS,
+        enabled: bool = SPOOL_ENABLED,
+    ) -> None:
+        self.path = path
+        self.replaying_path = path + ".replaying"
+        self.rejected_path = path + ".rejected"
+        self._append_flock = _FileLock(path + ".lock")
+        self._replay_flock = _FileLock(path + ".replay.lock")
+        self.fsync_seconds = fsync_seconds
+        self.probe_seconds = probe_seconds
+        self.enabled = enabled
+        self.last_error: Optional[str] = None
+        self.counters: Dict[str, int] = {"spooled": 0, "skipped_unchanged": 0, "replayed": 0, "rejected": 0}
+        self._spooling = self.pending()
+        self._digests: Dict[Tuple[str, Any], bytes] = {}
+        self._file: Optional[Any] = None
+        self._synced_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._replayer: Optional[threading.Thread] = None
+
+    def pending(self) -> bool:
+        """True if spooled records are waiting for replay."""
+        return any(os.path.exists(p) and os.path.getsize(p) > 0 for p in (self.replaying_path, self.path))
+
+    @property
+    def spooling(self) -> bool:
+        return self._spooling
+
+    def run(self, kind: str, key: Any, data: Dict[str, Any], write: Callable[[], T]) -> Optional[T]:
+        """
+        `write()`, or spool `data` for replay by `REPLAY_HANDLERS[kind]` if the database is
+        unreachable (or earlier writes are still spooled). Returns None when spooled.
+        """
+        if not self.enabled:
+            return self._write(write)
+        if not self._spooling:
+            try:
+                return self._write(write)
+            except Exception as e:
+                if not get_backend().is_unavailable(e):
+                    raise
+                self._go_down(e)
+        self.append(kind, key, data)
+        self.start_replayer()
+        return None
+
+    @staticmethod
+    def _write(write: Callable[[], T]) -> T:
+        try:
+            return write()
+        except Exception as e:
+            if not get_backend().is_lock_conflict(e):
+                raise
+            # The transaction was rolled back; every write is an idempotent upsert, so run it again
+            logger.warning(f"Write hit a lock conflict ({e}); retrying once")
+            return write()
+
+    def _go_down(self, error: BaseException) -> None:
+        with self._lock:
+            was_spooling, self._spooling = self._spooling, True
+            self.last_error = str(error)
+        if not was_spooling:
+            logger.error(f"Database unreachable ({error}); spooling writes to {self.path}", extra={"stage": "spool"})
+
+    def append(self, kind: str, key: Any, data: Dict[str, Any]) -> bool:
+        """Append one record; a record identical to the last one spooled for the same (kind, key) is skipped."""
+        data_json = json.dumps(data, separators=(",", ":"), default=str)
+        digest = hashlib.sha1(f"{kind}\n{data_json}".encode("utf-8")).digest()
+        frame = encode_record(kind, key, data_json)
+        with self._lock:
+            if key is not None and self._digests.get((kind, key)) == digest:
+                self.counters["skipped_unchanged"] += 1
+                return False
+            with self._append_flock:
+                self._open_locked()
+                self._file.write(frame)
+                # Out of the buffer before the lock is released, so a rotation never splits a frame
+                self._file.flush()
+            if key is not None:
+                self._digests[(kind, key)] = digest
+            self.counters["spooled"] += 1
+            # A replay may have drained the spool since the caller decided to spool; keep this record ordered
+            self._spooling = True
+            if time.monotonic() - self._synced_at >= self.fsync_seconds:
+                self._sync_locked()
+        return True
+
+    def _open_locked(self) -> None:
+        """Open the active spool for appending, reopening it if another process rotated it away."""
+        if self._file is not None:
+            try:
+                current = os.stat(self.path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(self._file.fileno()).st_ino:
+                self._file.close()
+                self._file = None
+        if self._file is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+
+    def _sync_locked(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._synced_at = time.monotonic()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def _rotate_locked(self) -> bool:
+        """Move the active spool aside for replay. Returns False if there is nothing left to replay."""
+        with self._append_flock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.replaying_path):
+                return True
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                os.replace(self.path, self.replaying_path)
+                return True
+            return False
+
+    def replay(self) -> int:
+        """
+        Replay every spooled record in order; returns the number of rows/games written.
+
+        Raises if the database is (still) unreachable; the spool is left in place.
+        Records rejected by the database for other reasons are moved to
+        `<path>.rejected` and logged, so one bad record cannot block the rest.
+        Waits while another process is replaying the same spool.
+        """
+        with self._replay_lock, self._replay_flock:
+            total = 0
+            while True:
+                with self._lock:
+                    if not self._rotate_locked():
+                        # Drained: writes go straight to the database again
+                        if self._spooling:
+                            logger.info("Spool drained; resuming direct database writes", extra={"stage": "spool"})
+                        self._spooling = False
+                        self._digests.clear()
+                        self.last_error = None
+                        return total
+                total += self._replay_file(self.replaying_path)
+                os.remove(self.replaying_path)
+
+    def _replay_file(self, path: str) -> int:
+        # Connect first: while the database is still down, a probe costs no file read
+        conn = get_db_connection()
+        try:
+            return self._replay_records(conn, list(read_records(path)))
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _replay_records(self, conn, records: List[SpoolRecord]) -> int:  # type: ignore[no-untyped-def]
+        # Each gamecenter record is a full poll of its game, so only the last one per game is needed
+        last = {(r.kind, r.key): i for i, r in enumerate(records) if r.key is not None}
+        records = [r for i, r in enumerate(records) if r.key is None or last[(r.kind, r.key)] == i]
+        if not records:
+            return 0
+
+        started = time.monotonic()
+        total = 0
+        i = 0
+        while i < len(records):
+            j = i
+            while j < len(records) and records[j].kind == records[i].kind:
+                j += 1
+            total += self._apply_batch(conn, records[i:j])
+            i = j
+        with self._lock:
+            self.counters["replayed"] += len(records)
+        logger.info(f"Replayed {len(records)} spooled records ({total} rows/games) in {time.monotonic() - started:.1f}s", extra={"stage": "spool"})
+        return total
+
+    def _apply_batch(self, conn, batch: List[SpoolRecord]) -> int:  # type: ignore[no-untyped-def]
+        handler = REPLAY_HANDLERS.get(batch[0].kind)
+        if handler is None:
+            self._reject(batch, f"no replay handler for kind '{batch[0].kind}'")
+            return 0
+        try:
+            return handler(conn, [r.data for r in batch])
+        except Exception as e:
+            backend = get_backend()
+            if backend.is_unavailable(e) or backend.is_lock_conflict(e):
+                # Not the records' fault: leave them spooled for the next attempt
+                raise
+            if len(batch) == 1:
+                self._reject(batch, str(e))
+                return 0
+        # Retry one record at a time so only the bad ones are set aside
+        return sum(self._apply_batch(conn, [r]) for r in batch)
+
+    def _reject(self, batch: List[SpoolRecord], reason: str) -> None:
+        with open(self.rejected_path, "ab") as f:
+            for r in batch:
+                f.write(encode_record(r.kind, r.key, json.dumps(r.data, separators=(",", ":"), default=str), r.at))
+        with self._lock:
+            self.counters["rejected"] += len(batch)
+        logger.error(f"Set aside {len(batch)} spooled {batch[0].kind} record(s) in {self.rejected_path}: {reason}", extra={"stage": "spool"})
+
+    def start_replayer(self) -> None:
+        """Start the background replayer if records are spooled and it isn't running yet."""
+        with self._lock:
+            if self._replayer is not None and self._replayer.is_alive():
+                return
+            self._replayer = threading.Thread(target=self._replay_until_drained, name="spool-replayer", daemon=True)
+            self._replayer.start()
+
+    def _replay_until_drained(self) -> None:
+        while True:
+            time.sleep(self.probe_seconds)
+            try:
+                self.replay()
+                return
+            except Exception as e:
+                with self._lock:
+                    self.last_error = str(e)
+                if get_backend().is_unavailable(e):
+                    logger.debug(f"Database still unreachable: {e}")
+                elif get_backend().is_lock_conflict(e):
+                    logger.warning(f"Spool replay hit a lock conflict ({e}); retrying in {self.probe_seconds:g}s", extra={"stage": "spool"})
+                else:
+                    logger.error(f"Spool replay failed: {e}", exc_info=True, extra={"stage": "spool"})
+
+    def resume(self) -> None:
+        """
+        Replay records left by an earlier run (e.g. one stopped during an outage). If the
+        database is still unreachable, keep spooling and replay in the background.
+        """
+        if not self.enabled or not self.pending():
+            return
+        logger.info(f"Found spooled writes in {self.path}; replaying", extra={"stage": "spool"})
+        try:
+            self.replay()
+        except Exception as e:
+            backend = get_backend()
+            if backend.is_lock_conflict(e):
+                self.start_replayer()
+                return
+            if not backend.is_unavailable(e):
+                raise
+            self._go_down(e)
+            self.start_replayer()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self.counters)
+            out["spooling"] = self._spooling
+            out["last_error"] = self.last_error
+        out["pending_bytes"] = sum(os.path.getsize(p) for p in (self.replaying_path, self.path) if os.path.exists(p))
+        out["rejected_bytes"] = os.path.getsize(self.rejected_path) if os.path.exists(self.rejected_path) else 0
+        return out
+
+
+_SPOOL: Optional[WriteSpool] = None
+_SPOOL_LOCK = threading.Lock()
+
+
+def get_spool() -> WriteSpool:
+    """Process-wide spool at SPOOL_PATH."""
+    global _SPOOL
+    with _SPOOL_LOCK:
+        if _SPOOL is None:
+            _SPOOL = WriteSpool()
+        return _SPOOL
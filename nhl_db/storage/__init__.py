@@ -0,0 +1,42 @@
+from typing import Optional
+
+import threading
+
+from .base import StorageBackend
+from ..config import DB_BACKEND, SQLITE_PATH
+
+BACKENDS = ("mysql", "sqlite")
+
+_BACKEND: Optional[StorageBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def create_backend(name: str, sqlite_path: str = SQLITE_PATH) -> StorageBackend:
+    name = (name or "mysql").lower()
+    if name == "mysql":
+        from .mysql_backend import MySqlBackend
+        return MySqlBackend()
+    if name == "sqlite":
+        from .sqlite_backend import SqliteBackend
+        return SqliteBackend(sqlite_path)
+    raise ValueError(f"Unknown DB_BACKEND '{name}'; expected one of {', '.join(BACKENDS)}")
+
+
+def get_backend() -> StorageBackend:
+    """Process-wide backend selected by DB_BACKEND (default mysql), created on first use."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = create_backend(DB_BACKEND)
+        return _BACKEND
+
+
+def set_backend(backend: StorageBackend) -> StorageBackend:
+    """Switch the process to `backend` (e.g. a benchmark comparing engines); returns the previous one."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        previous, _BACKEND = _BACKEND, backend
+    return previous  # type: ignore[return-value]
+
+
+__all__ = ["BACKENDS", "StorageBackend", "create_backend", "get_backend", "set_backend"]
@@ -0,0 +1,95 @@
+from typing import Optional, Sequence, Tuple, Union
+
+from abc import ABC, abstractmethod
+
+# An update is a column set to its incoming value, or (column, template). Templates
+# refer to values as {new[col]} (incoming row) and {old[col]} (stored row).
+Update = Union[str, Tuple[str, str]]
+
+
+class _ColumnRefs:
+    """Renders {new[col]} / {old[col]} in update templates for one dialect."""
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+
+    def __getitem__(self, column: str) -> str:
+        return self.pattern.format(col=column)
+
+
+class StorageBackend(ABC):
+    """
+    One storage engine: how to connect and how to spell the statements whose
+    syntax differs between engines (upserts, insert-if-absent, row locks).
+
+    Repositories write plain SQL with `%s` placeholders for everything else and
+    ask the backend for the dialect-specific parts, so the same repository code
+    runs against every engine. Connections follow the mysql.connector API the
+    repositories use: cursor(), start_transaction(), commit(), rollback(), close().
+    """
+
+    name = ""
+    # How update templates refer to the incoming and the stored value
+    new_ref = ""
+    old_ref = ""
+
+    @abstractmethod
+    def connect(self):  # type: ignore[no-untyped-def]
+        """A new connection (or one from the pool, see `enable_pool`)."""
+
+    def enable_pool(self, size: int) -> None:
+        """Serve connections from a pool, where the engine benefits from one."""
+
+    def ensure_schema(self) -> None:
+        """Create the tables this engine needs, where they are not managed by migrations."""
+
+    def render_update(self, table: str, update: Update) -> Tuple[str, str]:
+        column, template = (update, "{new[%s]}" % update) if isinstance(update, str) else update
+        refs = dict(new=_ColumnRefs(self.new_ref), old=_ColumnRefs(self.old_ref.replace("{table}", table)))
+        return column, template.format(**refs)
+
+    @abstractmethod
+    def upsert_sql(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        keys: Tuple[str, ...],
+        updates: Tuple[Update, ...],
+        where: Optional[str] = None,
+    ) -> str:
+        """
+        INSERT of `columns` that updates the row with the same `keys` instead.
+
+        `where` (a template) restricts which conflicting rows are touched on engines
+        that support it, so unchanged rows report no change. Engines without it
+        apply every update, so update templates must keep the stored value
+        themselves when `where` is false.
+        """
+
+    @abstractmethod
+    def insert_ignore_sql(self, table: str, columns: Tuple[str, ...]) -> str:
+        """INSERT of `columns` that silently skips rows whose key already exists."""
+
+    def is_unavailable(self, error: BaseException) -> bool:
+        """True if `error` means the engine cannot be reached right now (as opposed to a bad statement or row)."""
+        return False
+
+    def is_lock_conflict(self, error: BaseException) -> bool:
+        """True if `error` is a lock wait timeout or deadlock: the transaction was rolled back and can be run again."""
+        return False
+
+    def for_update(self, sql: str) -> str:
+        """`sql` with row locks held until the transaction ends, where the engine has them."""
+        return sql
+
+    def truncate_sql(self, table: str) -> str:
+        """Statement that empties `table`."""
+        return f"DELETE FROM {table}"
+
+
+def placeholders(count: int) -> str:
+    return ", ".join(["%s"] * count)
+
+
+def column_list(columns: Sequence[str]) -> str:
+    return ", ".join(columns)
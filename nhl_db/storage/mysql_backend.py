@@ -0,0 +1,92 @@
+from typing import Any, Dict, Optional, Tuple
+
+import functools
+import logging
+import threading
+
+import mysql.connector
+from mysql.connector import errors, pooling
+from mysql.connector.errors import PoolError
+
+from .base import StorageBackend, Update, column_list, placeholders
+from ..config import get_env
+
+logger = logging.getLogger(__name__)
+
+
+def connection_config(database: Optional[str] = None) -> Dict[str, Any]:
+    return dict(
+        host=get_env("DB_HOST", "127.0.0.1"),
+        port=int(get_env("DB_PORT", "3306")),
+        user=get_env("DB_USER", "root"),
+        password=get_env("DB_PASSWORD", ""),
+        database=database or get_env("DB_NAME"),
+        autocommit=True,
+    )
+
+
+class MySqlBackend(StorageBackend):
+    """
+    The production engine; schema is owned by the versioned migrations (`python app.py migrate`).
+
+    `database` overrides DB_NAME, e.g. for the scratch schema of the write benchmark.
+    """
+
+    name = "mysql"
+    new_ref = "VALUES({col})"
+    old_ref = "{col}"
+
+    def __init__(self, database: Optional[str] = None) -> None:
+        self.database = database
+        self._pool: Optional[pooling.MySQLConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
+    def enable_pool(self, size: int) -> None:
+        """
+        Serve `connect()` from a process-wide pool (for long-running processes).
+
+        `conn.close()` then returns the connection to the pool instead of closing
+        the socket. When the pool is exhausted, a direct connection is opened.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(pool_name="nhl_companion", pool_size=max(1, min(32, int(size))), **connection_config(self.database))
+
+    def connect(self):  # type: ignore[no-untyped-def]
+        if self._pool is not None:
+            try:
+                return self._pool.get_connection()
+            except PoolError:
+                logger.warning("DB connection pool exhausted; opening a direct connection")
+        return mysql.connector.connect(**connection_config(self.database))
+
+    @functools.lru_cache(maxsize=None)
+    def upsert_sql(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        keys: Tuple[str, ...],
+        updates: Tuple[Update, ...],
+        where: Optional[str] = None,
+    ) -> str:
+        # MySQL runs the assignments left to right, each seeing the ones before it
+        sets = ", ".join(f"{c}={expr}" for c, expr in (self.render_update(table, u) for u in updates))
+        return f"INSERT INTO {table} ({column_list(columns)}) VALUES ({placeholders(len(columns))}) ON DUPLICATE KEY UPDATE {sets}"
+
+    @functools.lru_cache(maxsize=None)
+    def insert_ignore_sql(self, table: str, columns: Tuple[str, ...]) -> str:
+        return f"INSERT IGNORE INTO {table} ({column_list(columns)}) VALUES ({placeholders(len(columns))})"
+
+    def is_unavailable(self, error: BaseException) -> bool:
+        # Connection refused or lost, server gone away, pool exhausted
+        return isinstance(error, (errors.InterfaceError, errors.OperationalError, PoolError)) and not self.is_lock_conflict(error)
+
+    def is_lock_conflict(self, error: BaseException) -> bool:
+        # Lock wait timeout, deadlock (e.g. update-live and watch-live both taking FOR UPDATE on one game)
+        return getattr(error, "errno", None) in (1205, 1213)
+
+    def for_update(self, sql: str) -> str:
+        return sql + " FOR UPDATE"
+
+    def truncate_sql(self, table: str) -> str:
+        return f"TRUNCATE TABLE {table}"
@@ -0,0 +1,160 @@
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from pathlib import Path
+import functools
+import logging
+import sqlite3
+import threading
+
+from .base import StorageBackend, Update, column_list, placeholders
+from .sqlite_schema import SCHEMA
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteCursor:
+    """sqlite3 cursor speaking the subset of the mysql.connector cursor API the repositories use."""
+
+    def __init__(self, cur: sqlite3.Cursor, dictionary: bool = False) -> None:
+        self._cur = cur
+        self._dictionary = dictionary
+
+    @staticmethod
+    def _sql(sql: str) -> str:
+        return sql.replace("%s", "?")
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        self._cur.execute(self._sql(sql), tuple(params or ()))
+
+    def executemany(self, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+        self._cur.executemany(self._sql(sql), [tuple(r) for r in rows])
+
+    def _row(self, row: Optional[Tuple[Any, ...]]) -> Any:
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cur.description, row)}
+
+    def fetchone(self) -> Any:
+        return self._row(self._cur.fetchone())
+
+    def fetchall(self) -> List[Any]:
+        return [self._row(r) for r in self._cur.fetchall()]
+
+    def fetchmany(self, size: int) -> List[Any]:
+        return [self._row(r) for r in self._cur.fetchmany(size)]
+
+    @property
+    def rowcount(self) -> int:
+        return self._cur.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cur.lastrowid
+
+    def close(self) -> None:
+        self._cur.close()
+
+
+class SqliteConnection:
+    """Autocommit sqlite3 connection with the mysql.connector transaction calls the services use."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def cursor(self, dictionary: bool = False, buffered: Optional[bool] = None) -> SqliteCursor:
+        return SqliteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def start_transaction(self) -> None:
+        # IMMEDIATE takes the write lock up front, which serializes writers the way
+        # SELECT ... FOR UPDATE does on MySQL
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def close(self) -> None:
+        self.rollback()
+        self._conn.close()
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Embedded engine in one local file, for development, tests and benchmarks
+    without a MySQL server.
+
+    Covers the teams, players, games and plays repositories plus the tables the
+    sync and live pipelines maintain next to them (event aggregates, standings,
+    snapshots). Tables are created on first connect from `sqlite_schema`;
+    MySQL-only features (partitions, heatmaps, EXPLAIN checks) are not available.
+    """
+
+    name = "sqlite"
+    new_ref = "excluded.{col}"
+    old_ref = "{table}.{col}"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._schema_ready: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def ensure_schema(self) -> None:
+        with self._lock:
+            if self.path in self._schema_ready:
+                return
+            conn = self._open()
+            try:
+                conn.executescript(SCHEMA)
+            finally:
+                conn.close()
+            self._schema_ready.add(self.path)
+            logger.debug(f"SQLite schema ready at {self.path}")
+
+    def connect(self) -> SqliteConnection:
+        self.ensure_schema()
+        return SqliteConnection(self._open())
+
+    def is_unavailable(self, error: BaseException) -> bool:
+        message = str(error).lower()
+        return isinstance(error, sqlite3.OperationalError) and any(m in message for m in ("unable to open", "disk i/o"))
+
+    def is_lock_conflict(self, error: BaseException) -> bool:
+        # Another writer held the database past the busy timeout
+        message = str(error).lower()
+        return isinstance(error, sqlite3.OperationalError) and any(m in message for m in ("locked", "busy"))
+
+    @functools.lru_cache(maxsize=None)
+    def upsert_sql(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        keys: Tuple[str, ...],
+        updates: Tuple[Update, ...],
+        where: Optional[str] = None,
+    ) -> str:
+        # Every SET expression sees the stored row, independent of order
+        sets = ", ".join(f"{c}={expr}" for c, expr in (self.render_update(table, u) for u in updates))
+        sql = (
+            f"INSERT INTO {table} ({column_list(columns)}) VALUES ({placeholders(len(columns))}) "
+            f"ON CONFLICT ({column_list(keys)}) DO UPDATE SET {sets}"
+        )
+        if where:
+            _, condition = self.render_update(table, ("", where))
+            sql += f" WHERE {condition}"
+        return sql
+
+    @functools.lru_cache(maxsize=None)
+    def insert_ignore_sql(self, table: str, columns: Tuple[str, ...]) -> str:
+        return f"INSERT OR IGNORE INTO {table} ({column_list(columns)}) VALUES ({placeholders(len(columns))})"
+
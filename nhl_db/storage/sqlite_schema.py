@@ -0,0 +1,151 @@
+"""
+Schema of the embedded SQLite backend.
+
+Mirrors the MySQL tables after all migrations, minus what SQLite has no use
+for: partitions, foreign keys, engine/charset options and the heatmap tables.
+Plays use the encoded layout with the `plays` compatibility view, as on MySQL.
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    teamId INTEGER NOT NULL PRIMARY KEY,
+    teamName TEXT NULL,
+    teamCity TEXT NULL,
+    teamAbbrev TEXT NULL,
+    teamIsActive INTEGER NOT NULL DEFAULT 0,
+    teamLogoUrl TEXT NULL,
+    teamConference TEXT NULL,
+    teamDivision TEXT NULL
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    playerId INTEGER NOT NULL PRIMARY KEY,
+    playerTeamId INTEGER NULL,
+    playerFirstName TEXT NOT NULL,
+    playerLastName TEXT NOT NULL,
+    playerNumber INTEGER NULL,
+    playerPosition TEXT NULL,
+    playerHeadshotUrl TEXT NULL,
+    playerHomeCity TEXT NULL,
+    playerHomeCountry TEXT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_team ON players (playerTeamId);
+
+CREATE TABLE IF NOT EXISTS games (
+    gameId INTEGER NOT NULL PRIMARY KEY,
+    gameSeason INTEGER NOT NULL,
+    gameType INTEGER NOT NULL,
+    gameDateTimeUtc TEXT NULL,
+    gameVenue TEXT NULL,
+    gameHomeTeamId INTEGER NOT NULL,
+    gameAwayTeamId INTEGER NOT NULL,
+    gameState TEXT NULL,
+    gamePeriod INTEGER NULL,
+    gameClock TEXT NULL,
+    gameHomeScore INTEGER NOT NULL DEFAULT 0,
+    gameAwayScore INTEGER NOT NULL DEFAULT 0,
+    gameHomeSOG INTEGER NOT NULL DEFAULT 0,
+    gameAwaySOG INTEGER NOT NULL DEFAULT 0,
+    gameLastPeriodType TEXT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_date_state ON games (gameDateTimeUtc, gameState);
+CREATE INDEX IF NOT EXISTS idx_games_state_date ON games (gameState, gameDateTimeUtc);
+CREATE INDEX IF NOT EXISTS idx_games_season_type ON games (gameSeason, gameType, gameState);
+
+CREATE TABLE IF NOT EXISTS play_types (
+    playTypeId INTEGER PRIMARY KEY AUTOINCREMENT,
+    playTypeName TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS play_zones (
+    playZoneId INTEGER NOT NULL PRIMARY KEY,
+    playZoneCode TEXT NOT NULL UNIQUE
+);
+INSERT OR IGNORE INTO play_zones (playZoneCode, playZoneId) VALUES ('O', 1), ('D', 2), ('N', 3);
+
+CREATE TABLE IF NOT EXISTS plays_encoded (
+    playId INTEGER NOT NULL,
+    playGameId INTEGER NOT NULL,
+    playIndex INTEGER NOT NULL,
+    playTeamId INTEGER NULL,
+    playPrimaryPlayerId INTEGER NULL,
+    playLosingPlayerId INTEGER NULL,
+    playSecondaryPlayerId INTEGER NULL,
+    playTertiaryPlayerId INTEGER NULL,
+    playPeriod INTEGER NOT NULL,
+    playTimeSeconds INTEGER NOT NULL,
+    playTimeRemainingSeconds INTEGER NOT NULL,
+    playGameSecond INTEGER NOT NULL,
+    playTypeId INTEGER NULL,
+    playZoneId INTEGER NULL,
+    playXCoord INTEGER NULL,
+    playYCoord INTEGER NULL,
+    PRIMARY KEY (playGameId, playId)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_plays_game_sort ON plays_encoded (playGameId, playIndex);
+CREATE INDEX IF NOT EXISTS idx_plays_player_type ON plays_encoded (playPrimaryPlayerId, playTypeId, playGameId);
+CREATE INDEX IF NOT EXISTS idx_plays_game_second ON plays_encoded (playGameId, playGameSecond);
+
+CREATE VIEW IF NOT EXISTS plays AS
+SELECT p.playId, p.playGameId, p.playIndex, p.playTeamId, p.playPrimaryPlayerId, p.playLosingPlayerId,
+    p.playSecondaryPlayerId, p.playTertiaryPlayerId, p.playPeriod,
+    printf('%02d:%02d', p.playTimeSeconds / 60, p.playTimeSeconds % 60) AS playTime,
+    printf('%02d:%02d', p.playTimeRemainingSeconds / 60, p.playTimeRemainingSeconds % 60) AS playTimeReamaining,
+    t.playTypeName AS playType, z.playZoneCode AS playZone, p.playXCoord, p.playYCoord,
+    p.playTimeSeconds, p.playTimeRemainingSeconds, p.playGameSecond
+FROM plays_encoded p
+LEFT JOIN play_types t ON t.playTypeId = p.playTypeId
+LEFT JOIN play_zones z ON z.playZoneId = p.playZoneId;
+
+CREATE TABLE IF NOT EXISTS game_team_event_counts (
+    gameId INTEGER NOT NULL,
+    teamId INTEGER NOT NULL,
+    playType TEXT NOT NULL,
+    eventCount INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (gameId, teamId, playType)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS game_player_event_counts (
+    gameId INTEGER NOT NULL,
+    playerId INTEGER NOT NULL,
+    playerRole TEXT NOT NULL,
+    playType TEXT NOT NULL,
+    eventCount INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (gameId, playerId, playerRole, playType)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_player_event_counts_player ON game_player_event_counts (playerId, playType, playerRole, gameId);
+
+CREATE TABLE IF NOT EXISTS standings (
+    standingsSeason INTEGER NOT NULL,
+    teamId INTEGER NOT NULL,
+    conferenceName TEXT NULL,
+    divisionName TEXT NULL,
+    gamesPlayed INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    otLosses INTEGER NOT NULL DEFAULT 0,
+    regulationWins INTEGER NOT NULL DEFAULT 0,
+    points INTEGER NOT NULL DEFAULT 0,
+    goalsFor INTEGER NOT NULL DEFAULT 0,
+    goalsAgainst INTEGER NOT NULL DEFAULT 0,
+    goalDifferential INTEGER GENERATED ALWAYS AS (goalsFor - goalsAgainst) STORED,
+    PRIMARY KEY (standingsSeason, teamId)
+);
+CREATE INDEX IF NOT EXISTS idx_standings_division ON standings (standingsSeason, conferenceName, divisionName, points);
+
+CREATE TABLE IF NOT EXISTS standings_applied_games (
+    gameId INTEGER NOT NULL PRIMARY KEY,
+    standingsSeason INTEGER NOT NULL,
+    appliedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_standings_applied_season ON standings_applied_games (standingsSeason);
+
+CREATE TABLE IF NOT EXISTS game_snapshots (
+    gameId INTEGER NOT NULL PRIMARY KEY,
+    snapshotVersion INTEGER NOT NULL DEFAULT 1,
+    snapshotHash BLOB NOT NULL,
+    isFinal INTEGER NOT NULL DEFAULT 0,
+    document BLOB NOT NULL,
+    updatedAt TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""